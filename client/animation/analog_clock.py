@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 """! Analog clock animation."""
+from threading import Lock
 import cv2 as cv
 import numpy as np
 from src.localtime import Localtime
@@ -17,83 +18,75 @@ class AnalogClock(Animate):
     very discrete and visible, defeating the purpose of the anti-aliasing. Setting the end
     coordinates way outside the display allow to have more subtle pixel changes, resulting in a
     smoother animation.
+
+    The angles of the hands are rounded to a number of steps per turn, given by the @c steps
+    keyword argument, 3600 by default. The anti-aliased mask of a hand is drawn and allocated once
+    per step, on first use, and shared by all the clocks of the same size, so drawing a frame only
+    combines three cached masks.
     """
 
+    ## Default number of hand angles per turn.
+    STEPS = 3600
+
+    # Color channel of the hour, minute and second hands.
+    __CHANNELS = (0, 1, 2)
+    # Hand masks shared by all the instances, by screen shape and number of steps, then by step.
+    __masks = {}
+    __lock = Lock()
+
     def __init__(self, shape: tuple, *args: list, **kwargs: dict):
         super().__init__(shape)
         self.__localtime = Localtime(timezone=kwargs["timezone"], update_rate=30.0)
+        self.__steps = kwargs.get("steps") or self.STEPS
+        with self.__lock:
+            self.__hands = self.__masks.setdefault((*shape[0:2], self.__steps), {})
 
-    def __get_angles(self):
+    def __get_fractions(self) -> tuple:
         # Configure the second hand.
         fraction_millisecond = self.__localtime.millisecond / 1000.0
         fraction_second = (self.__localtime.second + fraction_millisecond) / 60.0
-        angle_second = fraction_second * 2 * np.pi - np.pi / 2
 
         # Configure the minute hand.
         fraction_minute = (self.__localtime.minute + fraction_second) / 60.0
-        angle_minute = fraction_minute * 2 * np.pi - np.pi / 2
 
         # Configure the hour hand.
         fraction_hour = (self.__localtime.hour + fraction_minute) / 12.0
-        angle_hour = fraction_hour * 2 * np.pi - np.pi / 2
-
-        return angle_second, angle_minute, angle_hour
-
-    def draw(self):
-        self._screen[:] = 0
-        center = (self._screen.shape[0] // 2, self._screen.shape[1] // 2)
-        # Hand size must be large for the line end position to change even for
-        # small angles, which is then rounded to integers.
-        hand_size = max(self._screen.shape[1], self._screen.shape[0]) * 100
-
-        angle_second, angle_minute, angle_hour = self.__get_angles()
-
-        # Draw the second hand.
-        end_x = int(hand_size * np.cos(angle_second) + center[0])
-        end_y = int(hand_size * np.sin(angle_second) + center[1])
-        screen_second = self._screen.copy()
-        screen_second = cv.line(
-            screen_second,
-            center,
-            (end_x, end_y),
-            color=(0xFF, 0xFF, 0xFF),
-            thickness=1,
-            lineType=cv.LINE_AA,
-        )
 
-        # Draw the minute hand.
-        end_x = int(hand_size * np.cos(angle_minute) + center[0])
-        end_y = int(hand_size * np.sin(angle_minute) + center[1])
-        screen_minute = self._screen.copy()
-        screen_minute = cv.line(
-            screen_minute,
-            center,
-            (end_x, end_y),
-            color=(0xFF, 0xFF, 0xFF),
-            thickness=1,
-            lineType=cv.LINE_AA,
-        )
+        return fraction_hour, fraction_minute, fraction_second
 
-        # Draw the hour hand.
-        end_x = int(hand_size * np.cos(angle_hour) + center[0])
-        end_y = int(hand_size * np.sin(angle_hour) + center[1])
-        screen_hour = self._screen.copy()
-        screen_hour = cv.line(
-            screen_hour,
-            center,
-            (end_x, end_y),
-            color=(0xFF, 0xFF, 0xFF),
-            thickness=1,
-            lineType=cv.LINE_AA,
-        )
+    def __mask(self, step: int) -> np.ndarray:
+        mask = self.__hands.get(step)
+        if mask is None:
+            mask = np.zeros(self._screen.shape[0:2], dtype=np.uint8)
+            center = (mask.shape[1] // 2, mask.shape[0] // 2)
+            # Hand size must be large for the line end position to change even for
+            # small angles, which is then rounded to integers.
+            hand_size = max(mask.shape) * 100
+            angle = step / self.__steps * 2 * np.pi - np.pi / 2
+            end_x = int(hand_size * np.cos(angle) + center[0])
+            end_y = int(hand_size * np.sin(angle) + center[1])
+            cv.line(
+                mask, center, (end_x, end_y), 0xFF, thickness=1, lineType=cv.LINE_AA
+            )
+            # Prevent burn-in with the center by setting it to black.
+            cv.line(mask, center, center, 0, thickness=3)
+            mask.flags.writeable = False
+            # Another clock may have drawn the same step in the meantime, keep the first mask.
+            with self.__lock:
+                mask = self.__hands.setdefault(step, mask)
+        return mask
 
-        self._screen[:, :, 0] = screen_hour[:, :, 0]
-        self._screen[:, :, 1] = screen_minute[:, :, 1]
-        self._screen[:, :, 2] = screen_second[:, :, 2]
-
-        # Prevent burn-in with the center by setting it to black.
-        self._screen = cv.line(
-            self._screen, center, center, color=(0, 0, 0), thickness=3
-        )
+    def render(self, fractions: tuple) -> np.ndarray:
+        """! Draw the hands on the screen.
+        @param fractions Positions of the hour, minute and second hands, as fractions of a turn.
+        @return The screen.
+        """
+        self._screen[:] = 0
+        for channel, fraction in zip(self.__CHANNELS, fractions):
+            step = int(round(fraction * self.__steps)) % self.__steps
+            screen = self._screen[:, :, channel]
+            np.maximum(screen, self.__mask(step), out=screen)
+        return self._screen
 
-        yield self._screen
+    def draw(self):
+        yield self.render(self.__get_fractions())
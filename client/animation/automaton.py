@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""! Cellular automata animations."""
+import cv2 as cv
+import numpy as np
+from src.animate import Animate
+from src.cellular_automaton import CellularAutomaton
+from src.state_history import StateHistory
+
+
+class Automaton(Animate):
+    """! Cellular automaton animation class.
+    @image html automaton.Automaton.gif width=256px
+    Animation of the cellular automaton rule passed with the @c --rule argument, for example
+    @c B36/S23 for HighLife or @c B2/S/C3 for Brian's Brain. The first frame is generated randomly
+    and the animation progresses from there.
+
+    The generations are computed and colored in batches, the frames are then yielded one by one.
+    The hashes of the last generations are kept, across the batches, to detect when the board
+    stalls in a still state or an oscillator, its period being shorter than the history, for
+    example when all the cells are dead. The board is then seeded again.
+
+    @sa #client::src::cellular_automaton::CellularAutomaton
+    """
+
+    ## Number of generations computed at once.
+    BATCH = 32
+    ## Number of generations remembered, longer cycles are not detected.
+    HISTORY = 64
+
+    def __init__(self, shape: tuple, *args: list, **kwargs: dict):
+        super().__init__(shape)
+        self._automaton = CellularAutomaton(
+            kwargs.get("rule") or CellularAutomaton.LIFE, shape
+        )
+        self.__density = kwargs.get("density", 0.5)
+        self.__history = StateHistory(kwargs.get("history") or self.HISTORY)
+        self.__frames = np.empty((0, *shape), dtype=np.uint8)
+        self.__frame = 0
+        self.seed()
+
+    def seed(self):
+        """! Seed the board randomly, override for other initial states."""
+        self._automaton.seed(density=self.__density)
+
+    def draw(self):
+        """! Draw one frame of the animation."""
+        # A batch starting with a stalled board has no frames, a new seed is needed.
+        while self.__frame >= len(self.__frames):
+            states = self._automaton.step(self.BATCH)
+            # Stop the batch before the first generation already seen, and seed again.
+            for generation, state in enumerate(states):
+                if self.__history.remember(state.tobytes()):
+                    states = states[:generation]
+                    self.__history.clear()
+                    self.seed()
+                    break
+            self.__frames = self._automaton.color(states)
+            self.__frame = 0
+        self.__frame += 1
+        yield self.__frames[self.__frame - 1]
+
+
+class BriansBrain(Automaton):
+    """! Brian's Brain cellular automaton animation class.
+    @image html automaton.BriansBrain.gif width=256px
+    Cells are either ready, firing or refractory: a ready cell fires when exactly two of its
+    neighbours are firing, a firing cell is refractory on the next generation, then ready again. It
+    results in streams of gliders moving through the board.
+
+    @sa https://en.wikipedia.org/wiki/Brian%27s_Brain
+    """
+
+    def __init__(self, shape: tuple, *args: list, **kwargs: dict):
+        super().__init__(
+            shape,
+            rule=CellularAutomaton.BRIANS_BRAIN,
+            density=kwargs.get("density", 0.2),
+        )
+
+
+class Wireworld(Automaton):
+    """! Wireworld cellular automaton animation class.
+    @image html automaton.Wireworld.gif width=256px
+    Electrons run along random rectangular wire loops, splitting and merging where the loops
+    cross. The electrons running along the loops are periodic, so only a still board, once all the
+    electrons are gone, is seeded again.
+
+    @sa https://en.wikipedia.org/wiki/Wireworld
+    """
+
+    __LOOPS = 6
+
+    def __init__(self, shape: tuple, *args: list, **kwargs: dict):
+        super().__init__(shape, rule=CellularAutomaton.WIREWORLD, history=1)
+
+    def seed(self):
+        """! Seed the board with random wire loops, each with one electron."""
+        height, width = self._automaton.states.shape
+        states = np.zeros((height, width), dtype=np.uint8)
+        electrons = []
+        for _ in range(self.__LOOPS):
+            left, right = sorted(np.random.choice(width, 2, replace=False))
+            top, bottom = sorted(np.random.choice(height, 2, replace=False))
+            cv.rectangle(
+                states,
+                (int(left), int(top)),
+                (int(right), int(bottom)),
+                CellularAutomaton.CONDUCTOR,
+            )
+            electrons.append((top, left))
+        # One electron per loop, going clockwise from its top left corner.
+        for top, left in electrons:
+            states[top, left] = CellularAutomaton.TAIL
+            states[top, left + 1] = CellularAutomaton.HEAD
+        self._automaton.seed(states)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""! Layered animations compositor script."""
+from importlib import import_module
+import numpy as np
+from src.animate import Animate
+
+
+class Compositor(Animate):
+    """! Animation combining several animations as layers.
+    @image html compositor.Compositor.gif width=256px
+    The layers are passed with the @c --layers argument, from the bottom to the top, separated by
+    semicolons, each as an animation class followed by comma-separated options, for example
+    <tt>--layers "fire.Fire;analog_clock.AnalogClock,mode=max"</tt>:
+    @arg @c mode Blend mode, one of @ref MODES, @c alpha by default.
+    @arg @c opacity Opacity of the layer, from 0 to 1, 1 by default.
+    @arg @c x, @c y Position of the top left corner of the layer, in pixels, 0 by default.
+    @arg @c width, @c height Size of the layer, in pixels, the screen size by default.
+
+    The other arguments are passed to all the layer animations.
+
+    The blend modes combine the layer with the layers below it:
+    @li @c alpha mixes the layer with the layers below by its opacity.
+    @li @c add adds the layer, saturating at the maximum intensity.
+    @li @c max keeps the brightest of the layer and the layers below, per channel.
+    @li @c mask draws the pixels of the layer which are not black, mixed by its opacity, the black
+    pixels are transparent.
+
+    The layers are blended into one preallocated buffer. A layer is only drawn again when its
+    animation reports a change, and the screen is only blended again when one of the layers has
+    changed.
+    """
+
+    ## Blend modes.
+    MODES = ["alpha", "add", "max", "mask"]
+    ## Options of the layers passed as text.
+    OPTIONS = ["mode", "opacity", "x", "y", "width", "height"]
+
+    # pylint: disable=too-many-instance-attributes,too-few-public-methods
+    class Layer:
+        """! Animation layer, with its blending options."""
+
+        # pylint: disable=too-many-arguments
+        def __init__(
+            self,
+            animation: Animate,
+            mode: str = "alpha",
+            opacity: float = 1.0,
+            position: tuple = (0, 0),
+        ):
+            """! Constructor.
+            @param animation The animation drawn on the layer.
+            @param mode Blend mode, one of @ref MODES.
+            @param opacity Opacity of the layer, from 0 to 1.
+            @param position Position of the top left corner of the layer, (x, y) in pixels.
+            """
+            assert mode in Compositor.MODES, f"Unrecognised blend mode: {mode}."
+            assert 0 <= opacity <= 1, f"Opacity out of range: {opacity}."
+            self.animation = animation
+            self.mode = mode
+            self.opacity = opacity
+            self.position = position
+            # Region of the screen covered by the layer, and the matching region of the layer.
+            self.screen_region = None
+            self.layer_region = None
+            # Layer scaled by its opacity, and its opaque pixels for the mask mode.
+            self.scaled = None
+            self.opaque = None
+
+    def __init__(self, shape: tuple, *args: list, **kwargs: dict):
+        super().__init__(shape)
+        self.__layers = []
+        self.__blend = np.zeros(shape, dtype=np.float32)
+        self.__dirty = True
+        layers = kwargs.get("layers") or []
+        if isinstance(layers, str):
+            layers = [layer for layer in layers.split(";") if layer.strip()]
+        for layer in layers:
+            if not isinstance(layer, Compositor.Layer):
+                layer = self.__parse(shape, layer, kwargs)
+            self.add(layer)
+
+    @staticmethod
+    def __parse(shape: tuple, specification: str, kwargs: dict) -> Layer:
+        # Create a layer from its animation class and options.
+        animation, *options = specification.strip().split(",")
+        assert all(
+            "=" in option for option in options
+        ), f"Invalid layer: {specification}."
+        options = dict(option.split("=", 1) for option in options)
+        unknown = set(options) - set(Compositor.OPTIONS)
+        assert not unknown, f"Unrecognised layer options: {', '.join(sorted(unknown))}."
+        module, name = animation.split(".")
+        layer_kwargs = {key: value for key, value in kwargs.items() if key != "layers"}
+        layer_shape = (
+            int(options.get("height", shape[0])),
+            int(options.get("width", shape[1])),
+            *shape[2:],
+        )
+        return Compositor.Layer(
+            getattr(import_module(f"animation.{module}"), name)(
+                layer_shape, **layer_kwargs
+            ),
+            options.get("mode", "alpha"),
+            float(options.get("opacity", 1.0)),
+            (int(options.get("x", 0)), int(options.get("y", 0))),
+        )
+
+    def add(self, layer: Layer):
+        """! Add a layer on top of the others.
+        @param layer The layer.
+        """
+        frame = layer.animation.frame()
+        height, width = frame.shape[0:2]
+        pos_x, pos_y = layer.position
+        left, top = max(pos_x, 0), max(pos_y, 0)
+        right = min(pos_x + width, self._screen.shape[1])
+        bottom = min(pos_y + height, self._screen.shape[0])
+        layer.screen_region = (
+            slice(top, max(bottom, top)),
+            slice(left, max(right, left)),
+        )
+        layer.layer_region = (
+            slice(top - pos_y, max(bottom, top) - pos_y),
+            slice(left - pos_x, max(right, left) - pos_x),
+        )
+        layer.scaled = np.zeros(
+            (max(bottom - top, 0), max(right - left, 0), self._screen.shape[2]),
+            dtype=np.float32,
+        )
+        layer.opaque = np.zeros(layer.scaled.shape[0:2], dtype=bool)
+        self.__prepare(layer, frame)
+        self.__layers.append(layer)
+        self.__dirty = True
+
+    def __prepare(self, layer: Layer, frame: np.ndarray):
+        # Scale the visible part of a new frame of the layer by its opacity.
+        region = frame[layer.layer_region]
+        np.multiply(region, np.float32(layer.opacity), out=layer.scaled)
+        if layer.mode == "mask":
+            np.any(region, axis=-1, out=layer.opaque)
+
+    def changed(self) -> bool:
+        """! Tell whether one of the layers has changed since the last frame.
+        @return True if the next frame needs to be drawn, False if the last one can be reused.
+        """
+        return self.__dirty or any(layer.animation.changed() for layer in self.__layers)
+
+    def draw(self):
+        self.__dirty = False
+        for layer in self.__layers:
+            if layer.animation.changed():
+                self.__prepare(layer, layer.animation.frame())
+
+        self.__blend.fill(0)
+        for layer in self.__layers:
+            region = self.__blend[layer.screen_region]
+            if layer.mode == "alpha":
+                np.multiply(region, np.float32(1 - layer.opacity), out=region)
+                np.add(region, layer.scaled, out=region)
+            elif layer.mode == "add":
+                np.add(region, layer.scaled, out=region)
+            elif layer.mode == "max":
+                np.maximum(region, layer.scaled, out=region)
+            else:
+                opaque = layer.opaque[..., None]
+                np.multiply(
+                    region, np.float32(1 - layer.opacity), out=region, where=opaque
+                )
+                np.add(region, layer.scaled, out=region, where=opaque)
+        np.minimum(self.__blend, 0xFF, out=self.__blend)
+        np.copyto(self._screen, self.__blend, casting="unsafe")
+        yield self._screen
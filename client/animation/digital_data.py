@@ -3,7 +3,9 @@
 from src.animate import Animate
 from src.localtime import Localtime
 from src.weather import Weather
+from src.provider_hub import ProviderHub
 from src.text import Text
+from src.font_registry import FontRegistry
 
 
 class DigitalData(Animate):
@@ -26,18 +28,39 @@ class DigitalData(Animate):
     @arg @c key OpenWeatherMap API key.
     @arg @c city The city for which the temperature, humidy and AQI will be requested.
     @arg @c timezone Time timezone for which the time will be displayed.
+    @arg @c weather_cache File where the weather data is cached between runs.
+
+    The screen is only redrawn when the second changes or when new weather data is available. The
+    weather data is fetched in the background, the animation starts immediately with the cached
+    data. The panels showing the same city share the same weather data updates.
 
     @sa #client::src::localtime::Localtime
     @sa #client::src::weather::Weather
+    @sa #client::src::provider_hub::ProviderHub
     """
 
     def __init__(self, shape: tuple, *args: list, **kwargs: dict):
         super().__init__(shape)
-        self.__fontpath = "client/font/small_5x3.ttf"
-        self.__fontsize = 8
+        self.__subscription = None
+        self.__text = FontRegistry.get("small_5x3.ttf", 8)
 
         self.__localtime = Localtime(timezone=kwargs["timezone"], update_rate=1.0)
-        self.__weather = Weather(kwargs["key"], kwargs["city"])
+        self.__subscription = ProviderHub.subscribe(
+            Weather,
+            key=kwargs["key"],
+            location=kwargs["city"],
+            cache=kwargs.get("weather_cache") or None,
+        )
+        self.__weather = self.__subscription.provider
+
+        self.redraw_on(Animate.REDRAW_SECOND, self.__localtime)
+        self.redraw_on(Animate.REDRAW_WEATHER, self.__weather)
+
+    def __del__(self):
+        """! Destructor, release the used resources."""
+        if self.__subscription is not None:
+            self.__subscription.cancel()
+        super().__del__()
 
     def draw(self):
         self._screen[:] = 0
@@ -66,49 +89,47 @@ class DigitalData(Animate):
         ]:  # pragma: no cover
             date_suffix = date_suffixes[self.__localtime.day % 10]
 
-        text = Text(self.__fontpath, self.__fontsize)
-
-        text.write(
+        self.__text.write(
             self._screen,
             f"{self.__localtime.hour:02d}:{self.__localtime.minute:02d}:"
             f"{self.__localtime.second:02d}",
             color=(0xFF, 0xFF, 0xFF),
             offset=(3, -1),
         )
-        text.write(
+        self.__text.write(
             self._screen,
             f"{months[self.__localtime.month - 1]}",
             color=(0xFF, 0xFF, 0xFF),
             offset=(0, 5),
         )
-        text.write(
+        self.__text.write(
             self._screen,
             f"{self.__localtime.day}{date_suffix}",
             color=(0xFF, 0xFF, 0xFF),
             offset=(17, 5),
             wrap=Text.WRAP_NONE,
         )
-        text.write(
+        self.__text.write(
             self._screen,
             f"{self.__localtime.year}",
             color=(0xFF, 0xFF, 0xFF),
             offset=(0, 11),
         )
-        text.write(
+        self.__text.write(
             self._screen,
             weekdays[self.__localtime.weekday],
             color=(0xFF, 0xFF, 0xFF),
             offset=(19, 11),
             wrap=Text.WRAP_NONE,
         )
-        text.write(
+        self.__text.write(
             self._screen,
             f"{self.__weather.temperature:3.0f}C{self.__weather.humidity:3.0f}%",
             color=(0xFF, 0xFF, 0xFF),
             offset=(0, 17),
             wrap=Text.WRAP_NONE,
         )
-        text.write(
+        self.__text.write(
             self._screen,
             f"AQI {self.__weather.aqi_text}",
             color=(0xFF, 0xFF, 0xFF),
@@ -5,28 +5,76 @@ import numpy as np
 from src.animate import Animate
 
 
+# pylint: disable=too-many-instance-attributes
 class Fire(Animate):
     """! Live fire animation class.
     @image html fire.Fire.gif width=256px
     Animation showing a randomly generated live fire.
+
+    The bottom line is lit randomly on every frame, and every line rises by one pixel while
+    cooling down by a random amount. The heat is then mapped to colors with the palette passed with
+    the @c --palette argument, one of @ref PALETTES.
+
+    All the random numbers of a frame are drawn at once into a preallocated buffer, the cooling
+    saturates at 0 and the colors are looked up into the screen, so drawing a frame does not
+    allocate any memory.
     """
 
+    ## Palettes, as OpenCV color maps.
+    PALETTES = {
+        "hot": cv.COLORMAP_HOT,
+        "inferno": cv.COLORMAP_INFERNO,
+        "magma": cv.COLORMAP_MAGMA,
+        "plasma": cv.COLORMAP_PLASMA,
+        "winter": cv.COLORMAP_WINTER,
+    }
+
     __FIRE_HEIGHT_FACTOR = 1.2
 
     def __init__(self, shape: tuple, *args: list, **kwargs: dict):
         super().__init__(shape)
-        self.__fire = np.zeros(shape=shape[0:2], dtype=np.uint8)
-
-    def draw(self):
-        # Bottom fire starter line is randomly generated.
-        self.__fire[-1, :] = np.random.randint(
-            0xFF >> 1, 0xFF, size=self.__fire.shape[1]
+        self.__palette = self.palette(kwargs.get("palette") or "hot")
+        self.__generator = np.random.default_rng()
+        # The heat is stored as indices of the palette, so it is looked up without conversion.
+        self.__fire = np.zeros(shape=shape[0:2], dtype=np.intp)
+        self.__next = np.zeros_like(self.__fire)
+        self.__random = np.empty(shape[0:2], dtype=np.float32)
+        self.__heat = np.empty_like(self.__fire)
+        # The random numbers are scaled to the cooling of the lines, and to the heat of the bottom
+        # fire starter line.
+        self.__scale = np.full(
+            (shape[0], 1), int(shape[0] / self.__FIRE_HEIGHT_FACTOR), dtype=np.float32
         )
-        decay = np.random.randint(
-            self.__fire.shape[0] / self.__FIRE_HEIGHT_FACTOR, size=self.__fire.shape
+        self.__scale[-1] = (0xFF >> 1) + 1
+        self.__offset = np.zeros((shape[0], 1), dtype=np.float32)
+        self.__offset[-1] = 0xFF >> 1
+
+    @staticmethod
+    def palette(name: str) -> np.ndarray:
+        """! Returns a fire palette.
+        @param name Palette name, one of @ref PALETTES.
+        @return Colors of the heat values, in RGB, with the shape <tt>(256, 3)</tt>.
+        """
+        assert name in Fire.PALETTES, f"Unrecognised palette: {name}."
+        colors = cv.applyColorMap(
+            np.arange(0x100, dtype=np.uint8)[:, None], Fire.PALETTES[name]
         )
-        self.__fire[:-1] = np.clip(self.__fire[1:] - decay[1:], 0, 0xFF)
-        self._screen = cv.applyColorMap(self.__fire, cv.COLORMAP_HOT)
         # Transform BGR to RGB, because of OpenCV conventions.
-        self._screen = self._screen[:, :, ::-1]
+        return np.ascontiguousarray(colors[:, 0, ::-1])
+
+    def draw(self):
+        self.__generator.random(dtype=np.float32, out=self.__random)
+        np.multiply(self.__random, self.__scale, out=self.__random)
+        np.add(self.__random, self.__offset, out=self.__random)
+        np.copyto(self.__heat, self.__random, casting="unsafe")
+
+        # Bottom fire starter line is randomly generated.
+        self.__next[-1] = self.__heat[-1]
+        # The other lines rise and cool down, without going below 0.
+        cooling = self.__heat[:-1]
+        np.minimum(self.__fire[1:], cooling, out=cooling)
+        np.subtract(self.__fire[1:], cooling, out=self.__next[:-1])
+        self.__fire, self.__next = self.__next, self.__fire
+
+        np.take(self.__palette, self.__fire, axis=0, out=self._screen, mode="clip")
         yield self._screen
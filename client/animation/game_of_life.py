@@ -3,6 +3,7 @@
 import cv2 as cv
 import numpy as np
 from src.animate import Animate
+from src.bit_life import BitLife
 
 
 class GameOfLifeColor(Animate):
@@ -14,54 +15,85 @@ class GameOfLifeColor(Animate):
     the animation progresses from there. As the animation progresses it will
     eventually stall in either a static frame or a short loop. In this case
     it needs to be restarted.
+
+    Surviving cells keep their color, new cells take the average color of their three parents,
+    summed on 8 bits so bright parents wrap around to darker colors. When the parents are too
+    similar, with a standard deviation below 1 on every channel, the new cell mutates to a random
+    color.
+
+    The whole board is processed at once: 2D filters over the wrapped board count the neighbours
+    and sum their colors, taken modulo 256 before the division to give the average of the parents.
+    The parents are the only live cells around a new cell, so their highest and lowest colors are
+    the maximum of the neighbourhood and of its inverted live cells, computed by dilations. The
+    parents are too similar when their color range is at most 2 on every channel, which for 3
+    integer values is equivalent to the standard deviation being below 1.
     """
 
+    __KERNEL = np.array([[1, 1, 1], [1, 0, 1], [1, 1, 1]], dtype=np.float32)
+    ## Number of parents of a new cell.
+    __PARENTS = 3
+    ## Largest color range of the parents considered too similar, on every channel. For 3 integer
+    # values a standard deviation below 1 is equivalent to a range of at most 2.
+    __SIMILAR_RANGE = 2
+
     def __init__(self, shape: tuple, *args: list, **kwargs: dict):
         super().__init__(shape)
         self._screen = np.random.randint(0xFF, size=shape, dtype=np.uint8)
         mask = np.random.randint(2, size=shape[0:2], dtype=np.uint8)
         self._screen[mask == 0] = (0, 0, 0)
 
+    @staticmethod
+    def __neighbours_sum(image: np.ndarray, depth: int = -1) -> np.ndarray:
+        # Sum the 8 neighbours of every cell, with a wrapped border.
+        return cv.filter2D(
+            cv.copyMakeBorder(image, 1, 1, 1, 1, cv.BORDER_WRAP),
+            depth,
+            GameOfLifeColor.__KERNEL,
+            borderType=cv.BORDER_ISOLATED,
+        )[1:-1, 1:-1]
+
+    @staticmethod
+    def __neighbours_max(image: np.ndarray) -> np.ndarray:
+        # Maximum of the 3x3 neighbourhood of every cell, with a wrapped border.
+        return cv.dilate(
+            cv.copyMakeBorder(image, 1, 1, 1, 1, cv.BORDER_WRAP),
+            np.ones((3, 3), dtype=np.uint8),
+            borderType=cv.BORDER_ISOLATED,
+        )[1:-1, 1:-1]
+
     def draw(self):
         """! Draw one frame of the animation."""
-        new_status = np.zeros_like(self._screen)
-        for roll_y in range(0, self._screen.shape[0]):
-            rolled_y = np.roll(self._screen, -roll_y + 1, axis=0)
-            for roll_x in range(0, self._screen.shape[1]):
-                rolled_yx = np.roll(rolled_y, -roll_x + 1, axis=1)
-
-                neighbours = rolled_yx[0:3, 0:3]
-
-                # Mask the center cell.
-                neighbours[1, 1, :] = 0
-
-                # Count the number of neighbours.
-                neighbours_count = np.sum(np.any(neighbours, axis=-1))
-
-                # Status of the current cell.
-                cell_is_alive = np.any(self._screen[roll_y, roll_x])
-
-                # Apply the game of life rules.
-                new_cell_value = (0, 0, 0)
-                if cell_is_alive and 2 <= neighbours_count <= 3:
-                    # Color remains the same as cell does not die.
-                    new_cell_value = self._screen[roll_y, roll_x]
-                elif not cell_is_alive and neighbours_count == 3:
-                    # New cell is born: take the average color of the three "parents".
-                    # Saturate the colors to avoid fading out.
-                    parents = neighbours[np.any(neighbours > 0, axis=-1)].reshape(
-                        (-1, 3)
-                    )
-                    # Mutate if parents are too similar.
-                    new_cell_value = (
-                        np.random.randint(0xFF, size=3)
-                        if np.std(parents, axis=0).max() < 1
-                        else parents.mean(axis=0, dtype=np.uint8)
-                    )
-
-                new_status[roll_y, roll_x, :] = new_cell_value
-
-        self._screen = new_status
+        # Reducing the channels one by one is much faster than along the last axis.
+        alive = self._screen[..., 0] > 0
+        for channel in range(1, self._screen.shape[2]):
+            alive |= self._screen[..., channel] > 0
+        neighbours = self.__neighbours_sum(alive.view(np.uint8))
+
+        # Apply the Conway's Game of Life rules, surviving cells keep their color.
+        survive = alive & ((neighbours == 2) | (neighbours == 3))
+        born = np.nonzero(~alive & (neighbours == self.__PARENTS))
+        screen = self._screen * survive[..., np.newaxis]
+
+        # New cells take the average color of their parents, dead neighbours are black. The sum
+        # wraps on 8 bits like the original accumulator.
+        screen[born] = (
+            self.__neighbours_sum(self._screen, cv.CV_16S)[born] % 0x100
+        ) // self.__PARENTS
+
+        # The parents are the only live cells around a new cell: the lowest parent color is
+        # obtained from the highest inverted color of the live cells.
+        highest = self.__neighbours_max(self._screen)[born].astype(np.int16)
+        lowest = 0xFF - self.__neighbours_max(
+            (0xFF - self._screen) * alive[..., np.newaxis]
+        )[born].astype(np.int16)
+        similar = np.all(highest - lowest <= self.__SIMILAR_RANGE, axis=-1)
+
+        # Mutate when the parents are too similar.
+        screen[born[0][similar], born[1][similar]] = np.random.randint(
+            0xFF, size=(np.count_nonzero(similar), screen.shape[2]), dtype=np.uint8
+        )
+
+        self._screen = screen
         yield self._screen
 
 
@@ -81,7 +113,7 @@ class GameOfLifeFast(Animate):
     def __init__(self, shape: tuple, *args: list, **kwargs: dict):
         super().__init__(shape)
         # Create a random binary image.
-        self._screen = np.random.randint(2, size=shape[0:2], dtype=np.bool)
+        self._screen = np.random.randint(2, size=shape[0:2], dtype=bool)
 
     def draw(self):
         """! Draw one frame of the animation."""
@@ -101,3 +133,29 @@ class GameOfLifeFast(Animate):
         ) & (neighbours == 3)
         # Yield a 3-channel screen by transforming the gray image to RGB.
         yield cv.cvtColor(self._screen.astype(np.uint8) * 0xFF, cv.COLOR_GRAY2RGB)
+
+
+class GameOfLifePacked(Animate):
+    """! Conway's Game of Life animation class, bit-packed and restarting by itself.
+    @image html game_of_life.GameOfLifePacked.gif width=256px
+    Iterative animation, generated based on the previous frame and simplisic
+    rules, described in https://en.wikipedia.org/wiki/Conway%27s_Game_of_Life#Rules,
+    resulting in seemingly live beings. The first frame is generated randomly and
+    the animation progresses from there.
+
+    The board is stored with one bit per cell and computed 64 cells at a time, which scales to
+    large canvases. When the board stalls in a static frame or a short loop it is detected and
+    the board is reseeded randomly.
+
+    @sa #client::src::bit_life::BitLife
+    """
+
+    def __init__(self, shape: tuple, *args: list, **kwargs: dict):
+        super().__init__(shape)
+        self.__life = BitLife(shape)
+
+    def draw(self):
+        """! Draw one frame of the animation."""
+        self.__life.step()
+        # Yield a 3-channel screen by transforming the gray image to RGB.
+        yield cv.cvtColor(self.__life.cells().view(np.uint8) * 0xFF, cv.COLOR_GRAY2RGB)
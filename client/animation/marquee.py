@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""! Scrolling text animation script."""
+import numpy as np
+from src.animate import Animate
+from src.font_registry import FontRegistry
+from src.glyph_atlas import GlyphAtlas
+
+
+class Marquee(Animate):
+    """! Scrolling text animation class.
+    @image html marquee.Marquee.gif width=256px
+    Animation scrolling the text passed with the @c --text argument from right to left, with the
+    font passed with the @c --font argument. The speed, in pixels per frame, can be a fraction of a
+    pixel.
+
+    The text is rendered once into a strip as wide as the text, padded with a blank screen width on
+    both sides. Every frame is a view of the strip, without any copy. When the text is changed only
+    the part of the strip following the first changed character is rendered again.
+    """
+
+    __FONT_SIZE = 8
+    __COLOR = (0xFF, 0xFF, 0xFF)
+
+    def __init__(self, shape: tuple, *args: list, **kwargs: dict):
+        super().__init__(shape)
+        self.__atlas = FontRegistry.get(
+            kwargs.get("font") or "small_5x3.ttf", self.__FONT_SIZE
+        ).atlas
+        self.__speed = kwargs.get("speed", 0.5)
+        self.__position = 0.0
+        self.__text = ""
+        self.__text_width = 0
+        # Alpha mask of the text and the resulting colored strip, padded by one screen width.
+        self.__mask = np.zeros((shape[0], 2 * shape[1]), dtype=np.uint8)
+        self.__strip = np.zeros((shape[0], 2 * shape[1], shape[2]), dtype=np.uint8)
+
+        assert kwargs["text"] != "", "Text is empty."
+        self.set_text(kwargs["text"])
+
+    def set_text(self, text: str):
+        """! Change the scrolling text, keeping the scrolling position.
+        @param text New text, line breaks are replaced by spaces.
+        """
+        text = text.replace("\n", " ")
+        glyphs_old = self.__atlas.layout(self.__text)
+        glyphs_new = self.__atlas.layout(text)
+
+        # Glyphs before the first changed character keep their position.
+        changed = 0
+        while (
+            changed < min(len(text), len(self.__text))
+            and text[changed] == self.__text[changed]
+        ):
+            changed += 1
+
+        self.__text = text
+        self.__text_width = self.__atlas.textsize(text)[0]
+
+        # Left edge of the changed part of the strip, some glyphs may extend to the left of their
+        # pen position.
+        start = min(
+            [self.__text_width]
+            + [pen for pen, _ in glyphs_new[changed : changed + 1]]
+            + [
+                pen + glyph.offset[0]
+                for pen, glyph in glyphs_old[changed:] + glyphs_new[changed:]
+                if glyph.bitmap.size
+            ]
+        )
+        self.__reserve(2 * self._screen.shape[1] + self.__text_width)
+
+        padding = self._screen.shape[1]
+        self.__mask[:, padding + start :] = 0
+        for pen, glyph in glyphs_new:
+            if (
+                glyph.bitmap.size
+                and pen + glyph.offset[0] + glyph.bitmap.shape[1] > start
+            ):
+                self.__draw_glyph(glyph, padding + pen)
+
+        self.__strip[:, padding + start :] = 0
+        GlyphAtlas.blend(
+            self.__strip[:, padding + start :],
+            self.__mask[:, padding + start :],
+            self.__COLOR,
+            (0, 0),
+        )
+
+    def __reserve(self, width: int):
+        # Grow the strip, keeping its content, when the new text does not fit.
+        if width <= self.__mask.shape[1]:
+            return
+        width = max(width, 2 * self.__mask.shape[1])
+        mask = np.zeros((self.__mask.shape[0], width), dtype=np.uint8)
+        strip = np.zeros((*mask.shape, self.__strip.shape[2]), dtype=np.uint8)
+        mask[:, : self.__mask.shape[1]] = self.__mask
+        strip[:, : self.__strip.shape[1]] = self.__strip
+        self.__mask, self.__strip = mask, strip
+
+    def __draw_glyph(self, glyph: GlyphAtlas.Glyph, pen: int):
+        # Overlapping glyphs are merged by their maximum value, clipped vertically. The font is
+        # centered vertically.
+        pos_x = pen + glyph.offset[0]
+        pos_y = (self.__mask.shape[0] - self.__FONT_SIZE) // 2 + glyph.offset[1]
+        clip_y0 = max(pos_y, 0)
+        clip_y1 = min(pos_y + glyph.bitmap.shape[0], self.__mask.shape[0])
+        if clip_y0 >= clip_y1:
+            return
+        region = self.__mask[clip_y0:clip_y1, pos_x : pos_x + glyph.bitmap.shape[1]]
+        np.maximum(region, glyph.bitmap[clip_y0 - pos_y : clip_y1 - pos_y], out=region)
+
+    def draw(self):
+        # The text has completely scrolled out when the trailing padding fills the screen, which
+        # looks the same as the leading padding.
+        period = self._screen.shape[1] + self.__text_width
+        offset = int(self.__position) % period
+        self.__position += self.__speed
+        yield self.__strip[:, offset : offset + self._screen.shape[1]]
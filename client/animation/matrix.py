@@ -1,107 +1,148 @@
 #!/usr/bin/env python3
 """! Animation showing the Matrix rain animation."""
-import random
 import string
 import numpy as np
 from src.animate import Animate
-from src.text import Text
+from src.font_registry import FontRegistry
 
 
+# pylint: disable=too-many-instance-attributes
 class Matrix(Animate):
     """! Animation showing the Matrix rain.
     @image html matrix.Matrix.gif width=256px
     Animation showing ranomly generated ASCII characters falling like the Matrix rain.
-    """
 
-    __columns = []
+    The screen is divided in cells of one character, every column of cells having its own trail:
+    the head of the trail moves down at the speed of the column, leaving random characters behind
+    it, until the trail reaches its length and starts again from the top. The state of all the
+    trails is kept in arrays, updated at once on every frame.
 
-    class Column:
-        """! Matrix rain column.
-        One column instance of the Matrix rain animation.
-        """
+    The characters are rendered once for every color of the trail, from the white head to the dark
+    green end, so a frame is drawn by looking up the bitmap of every cell from its character and
+    its distance to the head. The bitmaps span 2x2 cells, for the characters overflowing their cell,
+    and are combined with the neighbouring cells by their maximum value.
 
-        __TRACE = (3, 32)
-        __SPEED_MIN = 0.2
-        __tick = 1
-        __string = ""
+    @sa #client::src::glyph_atlas::GlyphAtlas
+    """
 
-        def __init__(
-            self,
-            characters: str,
-            offset_column: int,
-            font: Text,
-            font_size: tuple,
-        ):
-            """! Constructor.
-            @param characters Allowable characters in the column.
-            @param offset_column Column offset in pixels from the left.
-            @param font Text font.
-            @param font_size Text font size.
-            """
-            self.__characters = characters
-            self.__font = font
-            self.__offsets = (offset_column * font_size[0], font_size[1])
-            self.__trace = self.__get_trace()
-            self.__speed = self.__get_speed()
+    __CELL = (6, 4)
+    __TRACE = (3, 32)
+    __SPEED_MIN = 0.2
+    __TICK = 0.1
+    # Colors of the trail from its head, the cells further away are not drawn.
+    __TRAIL = np.array(
+        [(0xFF, 0xFF, 0xFF)] + [(0x00, level << 5, 0x00) for level in range(6, -1, -1)],
+        dtype=np.uint16,
+    )
 
-        def __get_speed(self) -> float:
-            return random.random() * (1 - self.__SPEED_MIN) + self.__SPEED_MIN
+    def __init__(self, shape: tuple, *args: list, **kwargs: dict):
+        super().__init__(shape)
+        characters = kwargs.get("text") or string.printable
+        self.__characters = sorted(set(characters))
+        self.__sprites = self.__render(FontRegistry.get("small_5x3.ttf", 8).atlas)
 
-        def __get_trace(self) -> int:
-            return random.randint(self.__TRACE[0], self.__TRACE[1])
+        self.__rows = -(-shape[0] // self.__CELL[0])
+        self.__columns = -(-shape[1] // self.__CELL[1])
+        self.__row_index = np.arange(self.__rows)[:, None]
+        self.__cells = np.random.randint(
+            len(self.__characters), size=(self.__rows, self.__columns)
+        )
+        # Row of the head of the trails, -1 for empty columns.
+        self.__head = np.full(self.__columns, -1)
+        self.__trace = np.empty(self.__columns, dtype=int)
+        self.__speed = np.empty(self.__columns)
+        self.__tick = np.ones(self.__columns)
+        self.__reset(np.arange(self.__columns))
 
-        def animate(self):
-            """! Update the Matrix rain column data."""
-            self.__tick -= 0.1
-            if self.__tick <= self.__speed:
-                self.__tick = 1
-            else:
-                return
+        self.__index = np.empty((self.__rows, self.__columns), dtype=np.intp)
+        # Unsigned view of the distances, the cells above the head wrap to large values.
+        self.__distance = self.__index.view(np.uintp)
+        self.__bitmaps = np.empty(
+            (self.__rows, self.__columns, 2, self.__CELL[0], 2, self.__CELL[1], 3),
+            dtype=np.uint8,
+        )
+        self.__image = np.zeros(
+            (
+                (self.__rows + 1) * self.__CELL[0],
+                (self.__columns + 1) * self.__CELL[1],
+                3,
+            ),
+            dtype=np.uint8,
+        )
 
-            self.__string += random.choice(self.__characters)
-            if len(self.__string) > self.__trace:
-                self.__string = ""
-                self.__trace = self.__get_trace()
-                self.__speed = self.__get_speed()
+    def __render(self, atlas: object) -> np.ndarray:
+        # Render every character in every color of the trail, blended on black like PIL does.
+        alpha = np.zeros(
+            (len(self.__characters), 2 * self.__CELL[0], 2 * self.__CELL[1], 3),
+            dtype=np.uint8,
+        )
+        for index, character in enumerate(self.__characters):
+            atlas.render(alpha[index], character)
+        blend = (
+            alpha[:, None, ..., 1:2].astype(np.uint16)
+            * self.__TRAIL[None, :, None, None, :]
+            + 128
+        )
+        sprites = ((blend >> 8) + blend) >> 8
+        # Cells out of the trail are empty.
+        sprites = np.concatenate([sprites, np.zeros_like(sprites[:, :1])], axis=1)
+        return sprites.astype(np.uint8).reshape(
+            (-1, 2, self.__CELL[0], 2, self.__CELL[1], 3)
+        )
 
-        def draw(self, screen: np.ndarray):
-            """! Draw the Matrix rain column on a provided canvas.
-            @param screen Instance of the canvas to draw on.
-            """
-            for row, letter in enumerate(self.__string):
-                green = len(self.__string) - row - 1
-                if green == 0:
-                    color = (0xFF, 0xFF, 0xFF)
-                    letter = random.choice(self.__characters)
-                else:
-                    color = (0x00, (0b111 - green) << 5, 0x00)
+    def __reset(self, columns: np.ndarray):
+        self.__head[columns] = -1
+        self.__trace[columns] = np.random.randint(
+            self.__TRACE[0], self.__TRACE[1] + 1, size=len(columns)
+        )
+        self.__speed[columns] = (
+            np.random.random(len(columns)) * (1 - self.__SPEED_MIN) + self.__SPEED_MIN
+        )
 
-                self.__font.write(
-                    screen,
-                    letter,
-                    color=color,
-                    offset=(
-                        self.__offsets[0],
-                        row * self.__offsets[1],
-                    ),
-                )
+    def __step(self):
+        self.__tick -= self.__TICK
+        moving = np.flatnonzero(self.__tick <= self.__speed)
+        self.__tick[moving] = 1
+        self.__head[moving] += 1
+        visible = moving[self.__head[moving] < self.__rows]
+        self.__cells[self.__head[visible], visible] = np.random.randint(
+            len(self.__characters), size=len(visible)
+        )
+        self.__reset(moving[self.__head[moving] >= self.__trace[moving]])
 
-    def __init__(self, shape: tuple, *args: list, **kwargs: dict):
-        super().__init__(shape)
-        fontpath = "client/font/small_5x3.ttf"
-        fontsize = 8
-        self.__text = Text(fontpath, fontsize)
-        font_size = (4, 6)
-        characters = string.printable if kwargs["text"] == "" else kwargs["text"]
+    def draw(self):
+        self.__step()
+        # The characters under the heads change on every frame.
+        visible = np.flatnonzero((self.__head >= 0) & (self.__head < self.__rows))
+        self.__cells[self.__head[visible], visible] = np.random.randint(
+            len(self.__characters), size=len(visible)
+        )
 
-        for offset_column in range(shape[0] // font_size[0]):
-            self.__columns.append(
-                self.Column(characters, offset_column, self.__text, font_size)
-            )
+        # Distance of the cells to the head of their trail, the cells out of the trail, below it
+        # or above the head, use the last color.
+        trail = len(self.__TRAIL)
+        np.subtract(self.__head, self.__row_index, out=self.__index)
+        np.minimum(self.__distance, trail, out=self.__distance)
+        self.__index += self.__cells * (trail + 1)
+        np.take(self.__sprites, self.__index, axis=0, out=self.__bitmaps, mode="clip")
 
-    def draw(self):
-        self._screen[:] = 0
-        for column in self.__columns:
-            column.animate()
-            column.draw(self._screen)
+        self.__image.fill(0)
+        cells = self.__image.reshape(
+            (self.__rows + 1, self.__CELL[0], self.__columns + 1, self.__CELL[1], 3)
+        )
+        for offset_y in range(2):
+            for offset_x in range(2):
+                region = cells[
+                    offset_y : offset_y + self.__rows,
+                    :,
+                    offset_x : offset_x + self.__columns,
+                ]
+                np.maximum(
+                    region,
+                    self.__bitmaps[:, :, offset_y, :, offset_x].transpose(
+                        0, 2, 1, 3, 4
+                    ),
+                    out=region,
+                )
+        self._screen[:] = self.__image[: self._screen.shape[0], : self._screen.shape[1]]
         yield self._screen
@@ -1,45 +1,124 @@
 #!/usr/bin/env python3
 """! QR code generator animation script."""
+from weakref import WeakMethod
+import logging
 import numpy as np
 import qrcode
+from qrcode.exceptions import DataOverflowError
 from src.animate import Animate
+from src.provider_hub import Provider, ProviderHub
+from src.text_file import TextFile
 
 
 class QRCode(Animate):
     """! QR code generator animation class.
     @image html qr_code.QRCode.png width=256px
-    Animation displaying a static QR-code-encoded-text.
+    Animation displaying a QR-code-encoded-text.
+
+    To configure the animation pass the relevant keyword arguments:
+    @arg @c text The text to encode.
+    @arg @c text_file A text file whose content is encoded instead, for example a Wi-Fi guest
+    password rotated by another process. The file is checked every second and the code is updated
+    as soon as its content changes, without restarting.
+    @arg @c error_correction The error correction level, one of @ref ERROR_CORRECTIONS.
+
+    The modules of the code are encoded once per text, in the background when the text file
+    changes, and the screen is only redrawn when the code has changed. A text too long to fit on
+    the screen is ignored and the previous code is kept.
+
+    @sa #client::src::text_file::TextFile
     """
 
+    ## Error correction levels, recovering from 7%, 15%, 25% and 30% of damaged modules.
+    ERROR_CORRECTIONS = {
+        "L": qrcode.constants.ERROR_CORRECT_L,
+        "M": qrcode.constants.ERROR_CORRECT_M,
+        "Q": qrcode.constants.ERROR_CORRECT_Q,
+        "H": qrcode.constants.ERROR_CORRECT_H,
+    }
+
     __CODE_COLOR = (0xFF, 0xFF, 0xFF)
 
     def __init__(self, shape: tuple, *args: list, **kwargs: dict):
         super().__init__(shape)
-        self.__text = kwargs["text"]
-        assert self.__text != "", "Text is empty."
+        self.__subscription = None
+        self.__error_correction = kwargs.get("error_correction") or "M"
+        assert (
+            self.__error_correction in self.ERROR_CORRECTIONS
+        ), f"Unrecognised error correction level: {self.__error_correction}."
+        self.__modules = None
+        self.redraw_on(Animate.REDRAW_STATIC)
 
-    def draw(self):
+        if kwargs.get("text_file"):
+            update = WeakMethod(self.__update)
+
+            def notify(provider: Provider):
+                method = update()
+                if method is not None:
+                    method(provider.text)
+
+            self.__subscription = ProviderHub.subscribe(
+                TextFile, notify, path=kwargs["text_file"]
+            )
+            # The hub only notifies the changes, a running provider already has a text.
+            text = self.__subscription.provider.text
+            if text is not None:
+                self.__update(text)
+        else:
+            assert kwargs["text"] != "", "Text is empty."
+            self.__modules = self.encode(kwargs["text"], self.__error_correction)
+            assert self.__fits(
+                self.__modules
+            ), f"[{self.__class__.__name__}] QR code too large."
+
+    def __del__(self):
+        """! Destructor, release the used resources."""
+        if self.__subscription is not None:
+            self.__subscription.cancel()
+        super().__del__()
+
+    @staticmethod
+    def encode(text: str, error_correction: str = "M") -> np.ndarray:
+        """! Encode a text in a QR code, in the smallest version fitting the text.
+        @param text The text to encode.
+        @param error_correction The error correction level, one of @ref ERROR_CORRECTIONS.
+        @return Boolean image of the dark modules, without border.
+        """
         qr_code = qrcode.QRCode(
             version=1,
-            # error_correction=qrcode.constants.ERROR_CORRECT_L,
+            error_correction=QRCode.ERROR_CORRECTIONS[error_correction],
             box_size=1,
             border=0,
         )
-
-        qr_code.add_data(self.__text)
+        qr_code.add_data(text)
         qr_code.make(fit=True)
+        return np.array(qr_code.get_matrix(), dtype=bool)
 
-        qr_pil = qr_code.make_image(fill_color=self.__CODE_COLOR, back_color=(0, 0, 0))
-        qr_np = np.array(qr_pil)
+    def __fits(self, modules: np.ndarray) -> bool:
+        return modules.shape[0] <= min(self._screen.shape[0:2])
 
-        assert (
-            qr_np.shape <= self._screen.shape
-        ), f"[{self.__class__.__name__}] QR code too large."
-
-        # Center the code on the screen.
-        offset_y = (self._screen.shape[0] - qr_np.shape[0]) // 2
-        offset_x = (self._screen.shape[1] - qr_np.shape[1]) // 2
-        self._screen[
-            offset_y : qr_np.shape[1] + offset_y, offset_x : qr_np.shape[0] + offset_x
-        ] = qr_np
+    def __update(self, text: str):
+        # Encode the new text, called from the text file provider thread.
+        try:
+            modules = self.encode(text, self.__error_correction)
+        except (ValueError, DataOverflowError) as error:
+            logging.error("[%s] %s", self.__class__.__name__, error)
+            return
+        if not self.__fits(modules):
+            logging.error("[%s] QR code too large.", self.__class__.__name__)
+            return
+        self.__modules = modules
+        self.invalidate()
+
+    def draw(self):
+        modules = self.__modules
+        self._screen[:] = 0
+        if modules is not None:
+            # Center the code on the screen.
+            offset_y = (self._screen.shape[0] - modules.shape[0]) // 2
+            offset_x = (self._screen.shape[1] - modules.shape[1]) // 2
+            self._screen[
+                offset_y : modules.shape[0] + offset_y,
+                offset_x : modules.shape[1] + offset_x,
+            ][modules] = self.__CODE_COLOR
         yield self._screen
@@ -1,5 +1,11 @@
 #!/usr/bin/env python3
 """! RGB animation scripts."""
+from concurrent.futures import ProcessPoolExecutor
+import atexit
+import logging
+import multiprocessing
+import os
+import cv2 as cv
 import numpy as np
 from hilbert import decode as HilbertDecode
 from src.animate import Animate
@@ -8,18 +14,79 @@ from src.animate import Animate
 class HilbertCurveGenerator:
     """! Hilbert curve generator helper class.
     Will loop the value when overflow occurs.
+
+    The decoded curves are read-only and shared by all the generators of the process. They can
+    also be stored as @c .npy files in a cache directory, which are then memory mapped instead of
+    being decoded again on the next runs.
+
+    The points of a 2D curve can be clipped to a screen shape which is not a power of two, the
+    points outside of the screen being skipped. The axes are swapped for screens taller than wide,
+    so that the points kept on screens twice as wide as tall form a continuous curve.
     """
 
     __index = 0
+    __tables = {}
 
-    def __init__(self, dimension: int, bits: int):
+    def __init__(
+        self, dimension: int, bits: int, shape: tuple = None, cache: str = None
+    ):
         """! Constructor.
         @param dimension Hilbert curve dimension.
         @param bits Bits in the Hilbert curve.
+        @param shape Shape to which the points are clipped, all the points are kept if @c None.
+        @param cache Directory where the decoded curves are cached, disabled if @c None.
         """
-        self.__hilberts = HilbertDecode(
-            np.arange((2**dimension) ** bits), dimension, bits
-        )
+        self.__hilberts = self.table(dimension, bits, shape, cache)
+
+    @staticmethod
+    def table(
+        dimension: int, bits: int, shape: tuple = None, cache: str = None
+    ) -> np.ndarray:
+        """! Returns the shared points of a Hilbert curve, decoding them on the first call.
+        @param dimension Hilbert curve dimension.
+        @param bits Bits in the Hilbert curve.
+        @param shape Shape to which the points are clipped, all the points are kept if @c None.
+        @param cache Directory where the decoded curves are cached, disabled if @c None.
+        @return Read-only array of the points, with the shape <tt>(points, dimension)</tt>.
+        """
+        key = (dimension, bits, None if shape is None else tuple(shape))
+        table = HilbertCurveGenerator.__tables.get(key)
+        if table is None:
+            if shape is None:
+                table = HilbertCurveGenerator.__load(dimension, bits, cache)
+            else:
+                table = HilbertCurveGenerator.table(dimension, bits, cache=cache)
+                if shape[0] > shape[-1]:
+                    table = table[:, ::-1]
+                table = table[np.all(table < shape, axis=1)]
+                table.flags.writeable = False
+            HilbertCurveGenerator.__tables[key] = table
+        return table
+
+    @staticmethod
+    def __load(dimension: int, bits: int, cache: str) -> np.ndarray:
+        # Map the cached curve, or decode it and save it to the cache.
+        points = (2**dimension) ** bits
+        path = cache and os.path.join(cache, f"hilbert_{dimension}_{bits}.npy")
+        if path and os.path.exists(path):
+            try:
+                table = np.load(path, mmap_mode="r")
+                if table.shape == (points, dimension):
+                    return table
+            except (OSError, ValueError) as error:
+                logging.warning("[HilbertCurveGenerator] %s", error)
+
+        table = HilbertDecode(np.arange(points), dimension, bits)
+        table.flags.writeable = False
+        if path:
+            try:
+                os.makedirs(cache, exist_ok=True)
+                with open(f"{path}.tmp", "wb") as file:
+                    np.save(file, table)
+                os.replace(f"{path}.tmp", path)
+            except OSError as error:
+                logging.warning("[HilbertCurveGenerator] %s", error)
+        return table
 
     def __next__(self) -> int:
         """! Returns the next Hilbert curve value in the configured list.
@@ -36,61 +103,160 @@ class HilbertCurveGenerator:
         return self.__hilberts[index % len(self.__hilberts)]
 
 
+# pylint: disable=too-many-instance-attributes
 class GrowingTree(Animate):
     """! Animation filling the screen with 3-bit Hilbert curve colors using the growing tree
     traversal algorithm.
     @image html rgb.GrowingTree.gif width=256px
-    Recursive animation showing a maze being generated using the growing tree algorithm. The colors
-    are generated from a Hilbert curve cube.
+    Animation showing a maze being generated using the growing tree algorithm. The colors are
+    generated from a Hilbert curve cube.
+
+    The maze grows from a list of active cells: a cell is selected from the list, one of its
+    unvisited neighbours is carved and added to the list, and the cell is removed from the list
+    once all its neighbours have been visited. The selection policy is given by the @c --policy
+    argument:
+    @li @c newest selects the last added cell, giving long winding corridors, as the recursive
+    backtracker.
+    @li @c random selects any cell, giving short dead ends, as Prim's algorithm.
+    @li @c mixed selects the newest cell most of the time and a random one otherwise.
+
+    The visited cells are kept in a bitmap, so the maze is not limited by the recursion depth
+    whatever the size of the screen. The active cells are kept in an array, from which a random
+    cell is selected and removed by replacing it with the last one, and in a doubly linked list in
+    the order they were added, giving the newest cell. Selecting and removing a cell takes a
+    constant time whatever the policy. The number of cells carved per frame is given by the
+    @c --cells-per-frame argument, and the maze starts again once the screen is full.
 
     @sa https://weblog.jamisbuck.org/2011/1/27/maze-generation-growing-tree-algorithm.
-    @sa https://stackoverflow.com/questions/18395725/test-if-numpy-array-contains-only-zeros
     """
 
-    __DIRECTIONS = np.array([[-1, 0], [1, 0], [0, -1], [0, 1]])
+    ## Selection policies.
+    POLICIES = ["newest", "random", "mixed"]
+
+    __DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    # Probability of selecting a random cell with the mixed policy.
+    __MIXED_RANDOM = 0.25
 
     def __init__(self, shape: tuple, *args: list, **kwargs: dict):
         super().__init__(shape)
+        self.__policy = kwargs.get("policy") or "newest"
+        assert (
+            self.__policy in self.POLICIES
+        ), f"Unrecognised selection policy: {self.__policy}."
+        self.__cells_per_frame = max(kwargs.get("cells_per_frame") or 1, 1)
+        self.__height, self.__width = self._screen.shape[0:2]
         # 32*32=1024 positions do not perfectly map to a (2**3)**3=512 Hilbert
         # curve, so every color will be represented twice on a 32x32 matrix.
-        self.__colors = HilbertCurveGenerator(dimension=3, bits=3)
+        self.__colors = HilbertCurveGenerator(
+            dimension=3, bits=3, cache=kwargs.get("hilbert_cache") or None
+        )
+        self.__visited = np.zeros((self.__height, self.__width), dtype=bool)
+        # Active cells, as indices of the screen pixels, with their position in the array and
+        # their neighbours in the order they were added, -1 for none.
+        self.__active = []
+        self.__position = [0] * (self.__height * self.__width)
+        self.__older = [-1] * (self.__height * self.__width)
+        self.__newer = [-1] * (self.__height * self.__width)
+        self.__newest = -1
+        self.__carved = 0
+        self.__start()
 
-        position_init = np.random.randint(self._screen.shape[0:2])
-        self.__screen_generator = self.__explore(position_init)
+    def __start(self):
+        # Clear the screen and carve a random first cell.
+        self._screen[:] = 0
+        self.__visited[:] = False
+        self.__active.clear()
+        self.__newest = -1
+        self.__carved = 0
+        self.__carve(np.random.randint(self.__height), np.random.randint(self.__width))
 
-    def draw(self):
-        return self.__screen_generator
+    def __carve(self, pos_y: int, pos_x: int):
+        self.__visited[pos_y, pos_x] = True
+        self.__carved += 1
+        self._screen[pos_y, pos_x, :] = next(self.__colors, 0) << 5
+        cell = pos_y * self.__width + pos_x
+        self.__position[cell] = len(self.__active)
+        self.__active.append(cell)
+        self.__older[cell], self.__newer[cell] = self.__newest, -1
+        if self.__newest >= 0:
+            self.__newer[self.__newest] = cell
+        self.__newest = cell
 
-    def __explore(self, position: tuple):
-        self._screen[position[0], position[1], :] = next(self.__colors, 0) << 5
-        yield self._screen
+    def __select(self) -> int:
+        # Return the next active cell.
+        if self.__policy == "newest" or (
+            self.__policy == "mixed" and np.random.random() >= self.__MIXED_RANDOM
+        ):
+            return self.__newest
+        return self.__active[int(np.random.randint(len(self.__active)))]
+
+    def __remove(self, cell: int):
+        # Replace the cell by the last one in the array, and unlink it from the order.
+        last = self.__active.pop()
+        if last != cell:
+            self.__active[self.__position[cell]] = last
+            self.__position[last] = self.__position[cell]
+        older, newer = self.__older[cell], self.__newer[cell]
+        if older >= 0:
+            self.__newer[older] = newer
+        if newer >= 0:
+            self.__older[newer] = older
+        else:
+            self.__newest = older
+
+    def step(self) -> bool:
+        """! Carve one cell, removing the active cells without unvisited neighbours on the way.
+        @return False when the maze is complete, True otherwise.
+        """
+        while self.__active:
+            cell = self.__select()
+            pos_y, pos_x = divmod(cell, self.__width)
+            neighbours = [
+                (pos_y + d_y, pos_x + d_x)
+                for d_y, d_x in self.__DIRECTIONS
+                if 0 <= pos_y + d_y < self.__height
+                and 0 <= pos_x + d_x < self.__width
+                and not self.__visited[pos_y + d_y, pos_x + d_x]
+            ]
+            if neighbours:
+                self.__carve(*neighbours[np.random.randint(len(neighbours))])
+                return True
+            self.__remove(cell)
+        return False
 
-        adjacent_pixels = position + self.__DIRECTIONS
-        np.random.shuffle(adjacent_pixels)
-        for pos_y, pos_x in adjacent_pixels:
-            if (
-                0 <= pos_y < self._screen.shape[0]
-                and 0 <= pos_x < self._screen.shape[1]
-                and not np.any(self._screen[pos_y, pos_x])
-            ):
-                yield from self.__explore((pos_y, pos_x))
+    def draw(self):
+        if self.__carved == self.__height * self.__width:
+            self.__start()
+        else:
+            for _ in range(self.__cells_per_frame):
+                if not self.step():
+                    break
+        yield self._screen
 
 
 class HilbertCurve(Animate):
     """! Animation filling a 32x32 pixel screen with 3-bit, 3D Hilbert curve colors using a 5-bit,
     2D Hilbert curve traversal.
     @image html rgb.HilbertCurve.gif width=256px
+    Other screen sizes are traversed with the smallest 2D Hilbert curve covering them, clipped to
+    the screen.
 
     @sa https://possiblywrong.wordpress.com/allrgb-hilbert-curves-and-random-spanning-trees/
     """
 
     def __init__(self, shape: tuple, *args: list, **kwargs: dict):
         super().__init__(shape)
+        cache = kwargs.get("hilbert_cache") or None
         # 32*32 pixels=1024 positions perfectly map to a 2**2**5=1024 Hilbert curve.
-        self.__position_generator = HilbertCurveGenerator(dimension=2, bits=5)
+        self.__position_generator = HilbertCurveGenerator(
+            dimension=2,
+            bits=max(int(max(shape[0:2]) - 1).bit_length(), 1),
+            shape=shape[0:2],
+            cache=cache,
+        )
         # 32*32 pixels=1024 positions do not perfectly map to a (2**3)**3=512 Hilbert curve, so
         # every color will be represented twice on a 32x32 matrix.
-        self.__color_generator = HilbertCurveGenerator(dimension=3, bits=3)
+        self.__color_generator = HilbertCurveGenerator(dimension=3, bits=3, cache=cache)
 
     def draw(self):
         pos_x, pos_y = next(self.__position_generator, (0, 0))
@@ -99,11 +265,17 @@ class HilbertCurve(Animate):
         yield self._screen
 
 
+# pylint: disable=too-many-instance-attributes
 class Mandelbrot(Animate):
     """! Fractal animation based on the Mandelbrot set.
     The iteration is limited to 512 and the coloring is done using a 3-bit, 3D Hilbert curve, thus
     all the color values are displayed as 512 iterations is equal to (2**3)**3 = 512 colors.
     @image html rgb.Mandelbrot.gif width=256px
+
+    The iteration state is kept between frames, each frame only computes the next iterations of
+    the points which have not escaped yet. These points are compacted at the beginning of
+    preallocated buffers, so the work of an iteration decreases as points escape.
+
     @sa https://en.wikipedia.org/wiki/Mandelbrot_set
     @sa https://codereview.stackexchange.com/a/216241
     @sa http://www.paulbourke.net/fractals/mandelbrot/
@@ -115,7 +287,7 @@ class Mandelbrot(Animate):
     __HILBERT_DIMENSION = 3
     __ITERATION_MAX = (2**__HILBERT_DIMENSION) ** __HILBERT_BITS
     __ITERATION_STEP = 1
-    __iterations = 1
+    __ESCAPE_RADIUS_SQUARED = 4.0
 
     def __init__(self, shape: tuple, *args: list, **kwargs: dict):
         super().__init__(shape)
@@ -124,38 +296,270 @@ class Mandelbrot(Animate):
 
         # Pre-generate 512 colors based on the Hilbert curve.
         self.__colors = HilbertCurveGenerator(
-            self.__HILBERT_DIMENSION, self.__HILBERT_BITS
+            self.__HILBERT_DIMENSION,
+            self.__HILBERT_BITS,
+            cache=kwargs.get("hilbert_cache") or None,
+        )
+
+        # Colors are encoded on 512 values, therefore 8 bits are not enough.
+        self.__iteration_grid = np.zeros(shape[0:2], dtype=np.uint16)
+        self.__iterations = 0
+
+        # Points which have not escaped yet: the first @c __active elements of the buffers.
+        grid = np.empty(shape[0:2], dtype=np.complex128)
+        grid.real, grid.imag = np.meshgrid(
+            np.linspace(
+                self.__center[0] - self.__LIMITS,
+                self.__center[0] + self.__LIMITS,
+                num=shape[1],
+            ),
+            np.linspace(
+                self.__center[1] - self.__LIMITS,
+                self.__center[1] + self.__LIMITS,
+                num=shape[0],
+            ),
         )
+        self.__c = grid.ravel()
+        self.__z = np.zeros_like(self.__c)
+        self.__index = np.arange(self.__c.size)
+        self.__active = self.__c.size
+        self.__norm = np.empty(self.__c.size, dtype=np.float64)
+        self.__square = np.empty(self.__c.size, dtype=np.float64)
+        self.__escaped = np.empty(self.__c.size, dtype=bool)
+
+    def __iterate(self):
+        # Advance the points which have not escaped by one iteration.
+        active = self.__active
+        c, z = self.__c[:active], self.__z[:active]
+        norm, escaped = self.__norm[:active], self.__escaped[:active]
+        square = self.__square[:active]
+        np.multiply(z, z, out=z)
+        np.add(z, c, out=z)
+        np.multiply(z.real, z.real, out=norm)
+        np.multiply(z.imag, z.imag, out=square)
+        np.add(norm, square, out=norm)
+        np.greater(norm, self.__ESCAPE_RADIUS_SQUARED, out=escaped)
+
+        if escaped.any():
+            self.__iteration_grid.flat[
+                self.__index[:active][escaped]
+            ] = self.__iterations
+            # Compact the points left at the beginning of the buffers.
+            remaining = ~escaped
+            self.__active = np.count_nonzero(remaining)
+            for buffer in [self.__c, self.__z, self.__index]:
+                buffer[: self.__active] = buffer[:active][remaining]
+        self.__iterations += 1
 
     def draw(self):
-        xmin = -self.__LIMITS + self.__center[0]
-        xmax = self.__LIMITS + self.__center[0]
-        ymin = -self.__LIMITS + self.__center[1]
-        ymax = self.__LIMITS + self.__center[1]
-
-        complex_grid = np.zeros(self._screen.shape[0:2], dtype=np.complex)
-        complex_grid.real, complex_grid.imag = np.meshgrid(
-            np.linspace(xmin, xmax, num=self._screen.shape[1]),
-            np.linspace(ymin, ymax, num=self._screen.shape[0]),
+        for _ in range(self.__ITERATION_STEP):
+            if self.__iterations < self.__ITERATION_MAX:
+                self.__iterate()
+
+        # Map the iteration values to the colors, left shift to get 8-bit colors.
+        self._screen[:] = self.__colors.get(self.__iteration_grid) << (
+            8 - self.__HILBERT_BITS
         )
 
-        # Colors are encoded on 512 values, therefore 8 bits are not enough.
-        iteration_grid = np.zeros(self._screen.shape[0:2], dtype=np.uint16)
-        z_grid = np.zeros(self._screen.shape[0:2], dtype=np.complex)
-        elements_todo = np.ones(self._screen.shape[0:2], dtype=bool)
-        for iteration in range(min(self.__iterations, self.__ITERATION_MAX)):
-            z_grid[elements_todo] = (
-                z_grid[elements_todo] ** 2 + complex_grid[elements_todo]
+        yield self._screen
+
+
+# pylint: disable=too-many-instance-attributes
+class MandelbrotZoom(Animate):
+    """! Deep zoom animation into the Mandelbrot set.
+    @image html rgb.MandelbrotZoom.gif width=256px
+    The animation zooms smoothly into points of interest, one after the other, until the maximum
+    depth allowed by the 64-bit floating point precision is reached.
+
+    The set is rendered on keyframes, each zoomed by a factor 2 from the previous one, on a grid
+    supersampled twice. The frames in between are interpolated from the keyframe. The grid has an
+    odd number of samples, centered on the point of interest, so every other sample of a keyframe
+    is a sample of the previous keyframe: the escape counts of these samples are reused. The next
+    keyframe is rendered in the background while the current one is displayed, its samples being
+    split in tiles rendered in parallel on all cores. The worker processes are spawned on first use,
+    shared by all the instances, and shut down when the program exits.
+
+    The number of iterations increases quadratically with the zoom level. The points which have
+    not escaped are black, the others are colored with a 3-bit, 3D Hilbert curve.
+
+    @sa https://en.wikipedia.org/wiki/Mandelbrot_set
+    @sa https://en.wikipedia.org/wiki/Misiurewicz_point
+    """
+
+    ## Points of interest, zoomed into in turn, as (real, imaginary) tuples.
+    POINTS = [
+        (-0.743643887037151, 0.131825904205330),
+        (-0.77568377, 0.13646737),
+        (0.0, 1.0),
+        (-1.768778833, -0.001738996),
+    ]
+
+    __LIMITS = 1.5
+    __SUPERSAMPLE = 2
+    __FRAMES_PER_LEVEL = 24
+    __ITERATION_BASE = 64
+    __ITERATION_LEVEL = 4
+    __HILBERT_BITS = 3
+    __HILBERT_DIMENSION = 3
+    ## The grid spacing must stay above the precision of the coordinates by this factor.
+    __DEPTH_MARGIN = 16
+    __executor = None
+
+    def __init__(self, shape: tuple, *args: list, **kwargs: dict):
+        super().__init__(shape)
+        self.__points = kwargs.get("points") or self.POINTS
+        self.__point = -1
+        self.__colors = HilbertCurveGenerator(
+            self.__HILBERT_DIMENSION,
+            self.__HILBERT_BITS,
+            cache=kwargs.get("hilbert_cache") or None,
+        )
+        # Smallest grid sizes covering the supersampled screen, with the grid center and the
+        # center of its central half both on samples.
+        self.__grid = tuple(
+            -(-(self.__SUPERSAMPLE * size) // 4) * 4 + 1 for size in shape[0:2]
+        )
+        # Spacing of the samples on the first keyframe, covering the limits on both axes.
+        self.__spacing = 2 * self.__LIMITS / (self.__SUPERSAMPLE * max(shape[0:2]))
+        self.__level = 0
+        self.__frame = 0
+        self.__image = None
+        self.__next = None
+        self.__start()
+
+    @property
+    def depth(self) -> int:
+        """! Return the deepest zoom level of the current point of interest, limited by the 64-bit
+        floating point precision.
+        @return Zoom level, the image is zoomed by 2 at each level.
+        """
+        center = self.__points[self.__point]
+        precision = np.finfo(np.float64).eps * max(abs(center[0]), abs(center[1]), 1.0)
+        return int(np.log2(self.__spacing / (precision * self.__DEPTH_MARGIN)))
+
+    @staticmethod
+    def render_tile(points: np.ndarray, iterations: int) -> np.ndarray:
+        """! Compute the escape counts of points of the complex plane.
+        @param points Complex points.
+        @param iterations Maximum number of iterations.
+        @return Escape counts, @p iterations for the points which have not escaped.
+        """
+        counts = np.full(points.shape, iterations, dtype=np.int32)
+        index = np.arange(points.size)
+        z_points = np.zeros_like(points)
+        for iteration in range(iterations):
+            np.multiply(z_points, z_points, out=z_points)
+            np.add(z_points, points, out=z_points)
+            escaped = z_points.real**2 + z_points.imag**2 > 4
+            if escaped.any():
+                counts[index[escaped]] = iteration
+                remaining = ~escaped
+                index, points, z_points = (
+                    index[remaining],
+                    points[remaining],
+                    z_points[remaining],
+                )
+                if not index.size:
+                    break
+        return counts
+
+    def __iterations(self, level: int) -> int:
+        return self.__ITERATION_BASE + self.__ITERATION_LEVEL * level**2
+
+    def __submit(self, level: int, previous: np.ndarray = None) -> tuple:
+        # Start rendering a keyframe, reusing the escaped samples of the previous level.
+        counts = np.full(self.__grid, -1, dtype=np.int32)
+        if previous is not None:
+            quarter = [(size - 1) // 4 for size in self.__grid]
+            reused = previous[
+                quarter[0] : quarter[0] + (self.__grid[0] + 1) // 2,
+                quarter[1] : quarter[1] + (self.__grid[1] + 1) // 2,
+            ]
+            reused = np.where(reused < self.__iterations(level - 1), reused, -1)
+            counts[::2, ::2] = reused
+
+        todo = np.nonzero(counts < 0)
+        center = self.__points[self.__point]
+        spacing = self.__spacing / 2**level
+        points = (center[0] + (todo[1] - (self.__grid[1] - 1) // 2) * spacing) + 1j * (
+            center[1] + (todo[0] - (self.__grid[0] - 1) // 2) * spacing
+        )
+
+        if MandelbrotZoom.__executor is None:
+            # The clock and provider threads are already running: the workers are spawned rather
+            # than forked from a threaded process.
+            MandelbrotZoom.__executor = ProcessPoolExecutor(
+                mp_context=multiprocessing.get_context("spawn")
             )
-            mask = np.logical_and(
-                (z_grid.real**2 + z_grid.imag**2) > 4, elements_todo
+            atexit.register(
+                MandelbrotZoom.__executor.shutdown, wait=False, cancel_futures=True
             )
-            iteration_grid[mask] = iteration
-            elements_todo = np.logical_and(elements_todo, np.logical_not(mask))
+        tiles = np.array_split(points, os.cpu_count() or 1)
+        futures = [
+            MandelbrotZoom.__executor.submit(
+                MandelbrotZoom.render_tile, tile, self.__iterations(level)
+            )
+            for tile in tiles
+        ]
+        return counts, todo, futures
 
-        self.__iterations += self.__ITERATION_STEP
+    @staticmethod
+    def __collect(job: tuple) -> np.ndarray:
+        counts, todo, futures = job
+        counts[todo] = np.concatenate([future.result() for future in futures])
+        return counts
 
-        # Map the iteration values to the colors, left shift to get 8-bit colors.
-        self._screen[:] = self.__colors.get(iteration_grid) << (8 - self.__HILBERT_BITS)
+    def render(self, level: int, previous: np.ndarray = None) -> np.ndarray:
+        """! Render a keyframe of the current point of interest.
+        @param level Zoom level.
+        @param previous Keyframe of the previous level, whose samples are reused, or @c None.
+        @return Escape counts of the grid samples.
+        """
+        return self.__collect(self.__submit(level, previous))
+
+    def __start(self):
+        # Zoom into the next point of interest.
+        self.__point = (self.__point + 1) % len(self.__points)
+        self.__level = 0
+        self.__frame = 0
+        self.__show(self.render(0))
+
+    def __show(self, keyframe: np.ndarray):
+        # Color the keyframe and start rendering the next one.
+        self.__image = (
+            self.__colors.get(keyframe) << (8 - self.__HILBERT_BITS)
+        ).astype(np.uint8)
+        self.__image[keyframe == self.__iterations(self.__level)] = 0
+        self.__next = (
+            self.__submit(self.__level + 1, keyframe)
+            if self.__level < self.depth
+            else None
+        )
+
+    def draw(self):
+        if self.__frame == self.__FRAMES_PER_LEVEL:
+            self.__frame = 0
+            if self.__next is None:
+                self.__start()
+            else:
+                self.__level += 1
+                self.__show(self.__collect(self.__next))
+
+        # Interpolate the frame from the keyframe, zooming in from its center.
+        ratio = self.__SUPERSAMPLE * 2 ** (-self.__frame / self.__FRAMES_PER_LEVEL)
+        height, width = self._screen.shape[0:2]
+        transform = np.array(
+            [
+                [ratio, 0, (self.__grid[1] - 1) / 2 - ratio * (width - 1) / 2],
+                [0, ratio, (self.__grid[0] - 1) / 2 - ratio * (height - 1) / 2],
+            ]
+        )
+        self._screen[:] = cv.warpAffine(
+            self.__image,
+            transform,
+            (width, height),
+            flags=cv.INTER_LINEAR | cv.WARP_INVERSE_MAP,
+        )
+        self.__frame += 1
 
         yield self._screen
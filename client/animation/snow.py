@@ -1,23 +1,45 @@
 #!/usr/bin/env python3
 """! Animation showing falling snow script."""
-import cv2 as cv
 import numpy as np
 from src.animate import Animate
+from src.particles import Particles
 
 
 class Snow(Animate):
     """! Animation showing falling snow.
     @image html snow.Snow.gif width=256px
-    Animation showing a randomly generated falling snowflakes.
+    Animation showing a randomly generated falling snowflakes, in 3 layers: the far flakes are
+    slower and dimmer than the near ones. The flakes are pushed by gusts of wind around the speed
+    passed with the @c --wind argument, and pile up on the ground until the pile melts.
+
+    @sa #client::src::particles::Particles
     """
 
+    __LAYERS = 3
+    __SPEED = 1.0
+    __ACCUMULATION = 0.3
+    # Number of pixels per flake.
+    __PIXELS_PER_FLAKE = 20
+    __GUST_AMPLITUDE = 0.3
+    __GUST_PERIOD = 200
+
     def __init__(self, shape: tuple, *args: list, **kwargs: dict):
         super().__init__(shape)
-        self.__snow = np.zeros(shape[0:2], dtype=np.uint8)
+        self.__wind = kwargs.get("wind") or 0.0
+        self.__frame = 0
+        self.__particles = Particles(
+            shape,
+            max(shape[0] * shape[1] // self.__PIXELS_PER_FLAKE, 1),
+            layers=self.__LAYERS,
+            speed=self.__SPEED,
+            wind=self.__wind,
+            accumulation=kwargs.get("accumulation", self.__ACCUMULATION),
+        )
 
     def draw(self):
-        self.__snow[1:, :] = self.__snow[0:-1, :]
-        self.__snow[0, :] = (
-            np.random.random(size=self._screen.shape[1]) < np.random.random() * 0.1
+        self.__frame += 1
+        self.__particles.wind = self.__wind + self.__GUST_AMPLITUDE * np.sin(
+            2 * np.pi * self.__frame / self.__GUST_PERIOD
         )
-        yield cv.cvtColor((self.__snow) * 0xFF, cv.COLOR_GRAY2RGB)
+        self.__particles.step()
+        yield self.__particles.rasterize(out=self._screen)
@@ -1,45 +1,33 @@
 #!/usr/bin/env python3
 """! Animation showing water ripples script."""
-import numpy as np
 from src.animate import Animate
+from src.ripple import Ripple
 
 
 class Water(Animate):
     """! Animation showing water ripples.
     @image html water.Water.gif width=256px
-    Animation showing a randomly generated water drop ripples. The animation creates a new drop in a
-    random position every 10 frames.
+    Animation showing a randomly generated water drop ripples. The animation creates new drops in
+    random positions every 10 frames: one drop per 32x32 pixels of screen, or the number given by
+    the @c drops keyword argument.
 
-    @sa https://stackoverflow.com/a/60337269
+    @sa #client::src::ripple::Ripple
     """
 
     __DROP_EVERY_N_FRAMES = 10
     __DAMPING = 0.9
-    __drop_frame_count = 0
 
     def __init__(self, shape: tuple, *args: list, **kwargs: dict):
         super().__init__(shape)
-        self.__shape = (shape[0], shape[1], 2)
-        self.__water = np.zeros(self.__shape, dtype=np.float)
+        self.__ripple = Ripple(shape, self.__DAMPING)
+        self.__drops = kwargs.get("drops") or max(shape[0] * shape[1] // 1024, 1)
+        self.__drop_frame_count = 0
 
     def draw(self):
         if self.__drop_frame_count <= 0:
-            pos_y, pos_x = np.random.randint(self.__shape[0:2])
-            self.__water[pos_y, pos_x, 0] = 20.0
+            self.__ripple.drop(count=self.__drops)
             self.__drop_frame_count = self.__DROP_EVERY_N_FRAMES
         self.__drop_frame_count -= 1
 
-        self.__water[1 : self.__shape[1] - 1, 1 : self.__shape[0] - 1, 0] = (
-            (
-                self.__water[0 : self.__shape[1] - 2, 0 : self.__shape[0] - 2, 1]
-                + self.__water[2 : self.__shape[1], 0 : self.__shape[0] - 2, 1]
-                + self.__water[0 : self.__shape[1] - 2, 2 : self.__shape[0], 1]
-                + self.__water[2 : self.__shape[1], 2 : self.__shape[0], 1]
-            )
-            / 2
-            - self.__water[1 : self.__shape[1] - 1, 1 : self.__shape[0] - 1, 0]
-        ) * self.__DAMPING
-
-        self.__water[:, :, [0, 1]] = self.__water[:, :, [1, 0]]
-        self._screen[:, :, 2] = self.__water[:, :, 0].astype(np.uint8)
-        yield self._screen
+        self.__ripple.step()
+        yield self.__ripple.color(out=self._screen)
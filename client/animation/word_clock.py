@@ -1,20 +1,47 @@
 #!/usr/bin/env python3
 """! Word clock animations."""
 from abc import ABC, abstractmethod
+from threading import Thread
+from types import SimpleNamespace
+import numpy as np
 from src.animate import Animate
+from src.frame_cache import FrameCache
 from src.localtime import Localtime
 from src.text import Text
+from src.font_registry import FontRegistry
 
 
 class WordClock(Animate, ABC):
-    """! Word clock abstract animation class."""
+    """! Word clock abstract animation class.
+    The screen is only redrawn when the minute changes.
+
+    The rendered frames are kept in a frame cache shared by all the word clocks, by font, screen
+    shape and time text, so each text is only rendered once and then copied from the cache. With
+    the @c precompute keyword argument the frames of all the minutes of the day are rendered in a
+    background thread at start up, from the current minute on, until the memory budget of the
+    cache is reached.
+    """
+
+    ## Frame cache shared by all instances.
+    frames = FrameCache()
+
+    __MINUTES_PER_DAY = 24 * 60
 
     def __init__(self, shape: tuple, *args: list, **kwargs: dict):
         super().__init__(shape)
-        self.__font = kwargs["font"]
-        self.__size = kwargs["size"]
+        self.__text = FontRegistry.get(kwargs["font"], kwargs["size"])
         self.__wrap = kwargs["wrap"]
+        self.__key = (kwargs["font"], kwargs["size"], self.__wrap, tuple(shape))
         self.__localtime = Localtime(timezone=kwargs["timezone"], update_rate=1.0)
+        self.redraw_on(Animate.REDRAW_MINUTE, self.__localtime)
+        ## Thread precomputing the frames, @c None without precomputation.
+        self.precomputation = None
+        if kwargs.get("precompute"):
+            # The cache is captured once, the thread keeps filling it if it is replaced.
+            self.precomputation = Thread(
+                target=self.__precompute, args=(self.frames,), daemon=True
+            )
+            self.precomputation.start()
 
     @abstractmethod
     def get_time(self, localtime: object) -> str:  # pragma: no cover
@@ -22,11 +49,29 @@ class WordClock(Animate, ABC):
         @return Time in written characters.
         """
 
+    def __render(self, time_text: str) -> np.ndarray:
+        screen = np.zeros_like(self._screen)
+        self.__text.write(screen, time_text, wrap=self.__wrap)
+        return screen
+
+    def __precompute(self, frames: FrameCache):
+        start = self.__localtime.hour * 60 + self.__localtime.minute
+        for minutes in range(start, start + self.__MINUTES_PER_DAY):
+            localtime = SimpleNamespace(
+                hour=minutes // 60 % 24, minute=minutes % 60, second=0
+            )
+            key = (*self.__key, self.get_time(localtime))
+            if key in frames:
+                continue
+            if frames.nbytes + self._screen.nbytes > frames.budget:
+                break
+            frames.put(key, self.__render(key[-1]))
+
     def draw(self):
         time_text = self.get_time(self.__localtime)
-        self._screen[:] = 0
-        text = Text(self.__font, self.__size)
-        text.write(self._screen, time_text, wrap=self.__wrap)
+        self._screen[:] = self.frames.get(
+            (*self.__key, time_text), lambda: self.__render(time_text)
+        )
         yield self._screen
 
 
@@ -39,7 +84,7 @@ class English(WordClock):
     """
 
     def __init__(self, shape: tuple, *args: list, **kwargs: dict):
-        kwargs["font"] = "client/font/small_5x3.ttf"
+        kwargs["font"] = "small_5x3.ttf"
         kwargs["size"] = 8
         kwargs["wrap"] = Text.WRAP_NORMAL
         super().__init__(shape, *args, **kwargs)
@@ -111,7 +156,7 @@ class Japanese(WordClock):
     """
 
     def __init__(self, shape: tuple, *args: list, **kwargs: dict):
-        kwargs["font"] = "client/font/misaki_mincho.ttf"
+        kwargs["font"] = "misaki_mincho.ttf"
         kwargs["size"] = 8
         kwargs["wrap"] = Text.WRAP_FORCE
         super().__init__(shape, *args, **kwargs)
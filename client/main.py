@@ -13,6 +13,8 @@ import logging
 from importlib import import_module
 from src.save import Save
 from src.display import Display
+from src.post_process import PostProcess
+from animation.qr_code import QRCode
 
 parser = argparse.ArgumentParser(description="IoT RGB LED Matrix animation loader.")
 parser.add_argument("animation", type=str, help="animation class")
@@ -34,7 +36,95 @@ parser.add_argument("-k", "--key", type=str, default="", help="OpenWeatherMap AP
 parser.add_argument(
     "-c", "--city", type=str, default="", help="city name for weather data"
 )
+parser.add_argument(
+    "--weather-cache",
+    type=str,
+    default=os.path.join(
+        os.path.expanduser("~"), ".cache", "iot_rgb_led_matrix", "weather.json"
+    ),
+    help="weather data cache file, empty to disable",
+)
+parser.add_argument(
+    "--hilbert-cache",
+    type=str,
+    default=os.path.join(os.path.expanduser("~"), ".cache", "iot_rgb_led_matrix"),
+    help="Hilbert curve cache directory, empty to disable",
+)
 parser.add_argument("--text", type=str, default="", help="text data to display")
+parser.add_argument(
+    "--text-file",
+    type=str,
+    default="",
+    help="file whose text is displayed, updated when the file changes",
+)
+parser.add_argument(
+    "--error-correction",
+    type=str,
+    choices=list(QRCode.ERROR_CORRECTIONS),
+    default="M",
+    help="QR code error correction level",
+)
+parser.add_argument(
+    "--font", type=str, default="small_5x3.ttf", help="font file for text animations"
+)
+parser.add_argument(
+    "--speed", type=float, default=0.5, help="scrolling speed in pixels per frame"
+)
+parser.add_argument(
+    "--rule", type=str, default="B3/S23", help="cellular automaton rule"
+)
+parser.add_argument(
+    "--wind", type=float, default=0.0, help="wind speed in pixels per frame"
+)
+parser.add_argument(
+    "--palette", type=str, default="", help="color palette of the animation"
+)
+parser.add_argument(
+    "--policy",
+    type=str,
+    choices=["newest", "random", "mixed"],
+    default="newest",
+    help="growing tree cell selection policy",
+)
+parser.add_argument(
+    "--cells-per-frame", type=int, default=1, help="cells carved per frame by mazes"
+)
+parser.add_argument(
+    "--precompute",
+    action="store_true",
+    help="render the frames of the whole day in the background when possible",
+)
+parser.add_argument(
+    "--layers",
+    type=str,
+    default="",
+    help="layers of the compositor from the bottom, separated by semicolons: animation class "
+    "and options, for example "
+    '"fire.Fire;analog_clock.AnalogClock,mode=max,opacity=0.8,x=0,y=0,width=32,height=32"',
+)
+parser.add_argument(
+    "--gamma", type=float, default=1.0, help="gamma correction of the panel"
+)
+parser.add_argument(
+    "--brightness", type=float, default=1.0, help="brightness of the panel, from 0 to 1"
+)
+parser.add_argument(
+    "--rotation",
+    type=int,
+    choices=PostProcess.ROTATIONS,
+    default=0,
+    help="clockwise rotation of the frames in degrees",
+)
+parser.add_argument(
+    "--flip",
+    type=str,
+    choices=PostProcess.FLIPS,
+    default="",
+    help="mirroring of the frames, after the rotation",
+)
+parser.add_argument(
+    "--dither", action="store_true", help="dither the frames to the panel colors"
+)
 parser.add_argument("-v", dest="verbose", action="count", help="increase verbosity")
 
 subparsers = parser.add_subparsers(help="mode")
@@ -66,31 +156,54 @@ parser_display.add_argument(
     help="maximum current in Amperes",
 )
 
-args = parser.parse_args()
+# The animation modules may start worker processes importing this script, without running it.
+if __name__ == "__main__":
+    args = parser.parse_args()
 
-logging_level = [logging.ERROR, logging.WARNING, logging.INFO, logging.DEBUG][
-    args.verbose or 0
-]
-logging.basicConfig(format="%(levelname)s:%(message)s", level=logging_level)
+    logging_level = [logging.ERROR, logging.WARNING, logging.INFO, logging.DEBUG][
+        args.verbose or 0
+    ]
+    logging.basicConfig(format="%(levelname)s:%(message)s", level=logging_level)
 
-if hasattr(args, "frames"):  # pragma: no cover
-    args.server = "0.0.0.0"
-    args.port = 7777
-    args.current = 0.2
-    filename = os.path.join(args.dir, args.animation)
-    Save(filename, frames=args.frames, port=args.port)
+    if hasattr(args, "frames"):  # pragma: no cover
+        args.server = "0.0.0.0"
+        args.port = 7777
+        args.current = 0.2
+        filename = os.path.join(args.dir, args.animation)
+        Save(filename, frames=args.frames, port=args.port)
 
-client = Display(args.server, port=args.port, current_max=args.current)
+    shape = (args.height, args.width, 3)
 
-shape = (args.height, args.width, 3)
+    post_process = None
+    if (
+        args.gamma != 1.0
+        or args.brightness != 1.0
+        or args.rotation
+        or args.flip
+        or args.dither
+    ):
+        post_process = PostProcess(
+            shape,
+            gamma=args.gamma,
+            brightness=args.brightness,
+            rotation=args.rotation,
+            flip=args.flip,
+            dither=args.dither,
+        )
+        # The animation draws the frames before their rotation.
+        shape = post_process.shape
 
-try:
-    animation_module, animation_method = args.animation.split(".")
-    animation_instance = getattr(
-        import_module(f"animation.{animation_module}"), animation_method
+    client = Display(
+        args.server, port=args.port, current_max=args.current, post_process=post_process
     )
-    animation_instance(shape, **vars(args)).animate(
-        client=client, update_rate=args.rate
-    )
-except KeyboardInterrupt:  # pragma: no cover
-    sys.exit(0)
+
+    try:
+        animation_module, animation_method = args.animation.split(".")
+        animation_instance = getattr(
+            import_module(f"animation.{animation_module}"), animation_method
+        )
+        animation_instance(shape, **vars(args)).animate(
+            client=client, update_rate=args.rate
+        )
+    except KeyboardInterrupt:  # pragma: no cover
+        sys.exit(0)
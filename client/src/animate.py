@@ -3,11 +3,33 @@
 from abc import ABC, abstractmethod
 from typing import Generator
 from time import sleep
+from threading import Event
+from weakref import WeakMethod
 import numpy as np
+from src.localtime import Localtime
 
 
 class Animate(ABC):
-    """! Main animation class."""
+    """! Main animation class.
+
+    By default a new frame is drawn on every update. Animations whose content changes less often
+    declare what it depends on with @ref redraw_on, the frame is then only redrawn when one of the
+    dependencies changes, and the previous frame is reused in between. Such animations do not poll
+    at the update rate: they sleep until a time boundary is reached or @ref invalidate is called,
+    waking up at least every second to keep the client alive.
+    """
+
+    ## Longest sleep of an animation waiting for its content to change, in seconds.
+    __IDLE_DELAY = 1.0
+
+    ## Redraw when the second of a Localtime instance changes.
+    REDRAW_SECOND = "second"
+    ## Redraw when the minute of a Localtime instance changes.
+    REDRAW_MINUTE = "minute"
+    ## Redraw when a Weather instance has been updated.
+    REDRAW_WEATHER = "weather"
+    ## Draw once, the content never changes.
+    REDRAW_STATIC = "static"
 
     def __init__(self, shape: tuple, *args: list, **kwargs: dict):
         """! Constructor.
@@ -17,6 +39,11 @@ class Animate(ABC):
         @param kwargs Keyword Arguments.
         """
         self._screen = np.zeros(shape=shape, dtype=np.uint8)
+        self.__dependencies = []
+        self.__frame = None
+        self.__token = None
+        self.__invalidated = False
+        self.__wake = Event()
 
     def __del__(self):
         """! Destructor, release the used resources."""
@@ -28,11 +55,90 @@ class Animate(ABC):
         @return Screen generator.
         """
 
+    def redraw_on(self, dependency: str, source: object = None):
+        """! Declare a dependency of the animation content.
+        @param dependency One of @c REDRAW_SECOND, @c REDRAW_MINUTE, @c REDRAW_WEATHER or
+        @c REDRAW_STATIC.
+        @param source The Localtime or Weather instance the dependency refers to.
+        """
+        assert dependency in [
+            Animate.REDRAW_SECOND,
+            Animate.REDRAW_MINUTE,
+            Animate.REDRAW_WEATHER,
+            Animate.REDRAW_STATIC,
+        ], f"Unrecognised redraw dependency: {dependency}."
+        self.__dependencies.append((dependency, source))
+
+        if dependency in [Animate.REDRAW_SECOND, Animate.REDRAW_MINUTE]:
+            # Wake up exactly at the boundary, without keeping the animation alive.
+            wake = WeakMethod(self.__wake.set)
+            subscriptions = []
+
+            def notify(*args: list):
+                wake_set = wake()
+                if wake_set is None:
+                    for subscription in subscriptions:
+                        subscription.cancel()
+                else:
+                    wake_set()
+
+            subscriptions.append(
+                source.subscribe(
+                    Localtime.SECOND
+                    if dependency is Animate.REDRAW_SECOND
+                    else Localtime.MINUTE,
+                    notify,
+                )
+            )
+
+    def invalidate(self):
+        """! Mark the content as changed, the next frame will be drawn again."""
+        self.__invalidated = True
+        self.__wake.set()
+
+    def __get_token(self) -> tuple:
+        token = []
+        for dependency, source in self.__dependencies:
+            if dependency is Animate.REDRAW_SECOND:
+                token.append(int(source.timestamp))
+            elif dependency is Animate.REDRAW_MINUTE:
+                token.append(int(source.timestamp // 60))
+            elif dependency is Animate.REDRAW_WEATHER:
+                token.append(source.revision)
+        return tuple(token)
+
+    def changed(self) -> bool:
+        """! Tell whether the content has changed since the last frame.
+        @return True if the next frame needs to be drawn, False if the last one can be reused.
+        """
+        return (
+            not self.__dependencies
+            or self.__invalidated
+            or self.__frame is None
+            or self.__get_token() != self.__token
+        )
+
+    def frame(self) -> np.ndarray:
+        """! Return the current frame, drawing a new one only when the content has changed.
+        @return The screen.
+        """
+        if self.changed():
+            self.__invalidated = False
+            self.__token = self.__get_token()
+            self.__frame = next(self.draw())
+        return self.__frame
+
     def animate(self, client: object, update_rate: float = 30.0):
         """! Execute the animation.
+        The client is updated at every step, even when the frame is reused, so the connection is
+        kept alive.
         @param client The instance which will be updated with the animation.
         @param update_rate The update rate of the animation, in Hz.
         """
         while True:
-            client.update(next(self.draw()))
-            sleep(1.0 / update_rate)
+            self.__wake.clear()
+            client.update(self.frame())
+            if self.__dependencies:
+                self.__wake.wait(self.__IDLE_DELAY)
+            else:
+                sleep(1.0 / update_rate)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""! Bit-packed Conway's Game of Life engine script."""
+import numpy as np
+from src.state_history import StateHistory
+
+
+# pylint: disable=too-many-instance-attributes
+class BitLife:
+    """! Conway's Game of Life engine, storing the board with one bit per cell.
+    Each row of the board is packed into 64-bit words, bit @c i of word @c j holding the cell
+    <tt>64 * j + i</tt>. A generation is computed for 64 cells at once with bitwise operations: the
+    board is shifted horizontally once in each direction, the neighbours are then counted with
+    bit-sliced adders over the rows above and below. The board wraps around on both axes, whatever
+    its width, so large canvases made of several panels are supported.
+
+    The hashes of the last states are kept to detect when the board stalls in a still life or an
+    oscillator, its period being shorter than the history. The board is then reseeded randomly.
+
+    @sa https://en.wikipedia.org/wiki/Conway%27s_Game_of_Life#Rules
+    """
+
+    ## Number of bits per word.
+    WORD = 64
+
+    def __init__(self, shape: tuple, history: int = 256, density: float = 0.5):
+        """! Constructor.
+        @param shape Board shape: height and width, in cells.
+        @param history Number of states remembered, longer cycles are not detected. A glider
+        alone on the board comes back after 4 times the least common multiple of the height and
+        width.
+        @param density Ratio of live cells on a seeded board.
+        """
+        self.__height, self.__width = shape[0:2]
+        self.__words = -(-self.__width // self.WORD)
+        # Number of cells in the last word of each row, the other bits are always 0.
+        self.__last_bits = self.__width - (self.__words - 1) * self.WORD
+        self.__last_mask = np.uint64((1 << self.__last_bits) - 1)
+        self.__density = density
+        self.__history = StateHistory(history)
+        ## Number of generations since the last seeding.
+        self.generation = 0
+        ## Number of times the board was reseeded after stalling.
+        self.reseeds = 0
+        self.board = np.zeros((self.__height, self.__words), dtype=np.uint64)
+        self.seed()
+
+    def seed(self, cells: np.ndarray = None):
+        """! Seed the board, and forget its history.
+        @param cells Boolean image of the live cells, random if @c None.
+        """
+        if cells is None:
+            cells = np.random.random((self.__height, self.__width)) < self.__density
+        self.board = self.pack(cells)
+        self.generation = 0
+        self.__history.clear()
+        self.__history.remember(self.board.tobytes())
+
+    def pack(self, cells: np.ndarray) -> np.ndarray:
+        """! Pack a boolean image into a board.
+        @param cells Boolean image of the live cells.
+        @return Board of 64-bit words.
+        """
+        padded = np.zeros((self.__height, self.__words * self.WORD), dtype=bool)
+        padded[:, : self.__width] = cells
+        return (
+            np.packbits(padded, axis=1, bitorder="little").view("<u8").astype(np.uint64)
+        )
+
+    def cells(self) -> np.ndarray:
+        """! Unpack the board.
+        @return Boolean image of the live cells.
+        """
+        return np.unpackbits(
+            self.board.astype("<u8").view(np.uint8), axis=1, bitorder="little"
+        )[:, : self.__width].astype(bool)
+
+    def __shift_east(self, board: np.ndarray) -> np.ndarray:
+        # Board of the western neighbours: cell x receives cell x - 1.
+        shifted = board << np.uint64(1)
+        shifted[:, 1:] |= board[:, :-1] >> np.uint64(self.WORD - 1)
+        shifted[:, 0] |= (board[:, -1] >> np.uint64(self.__last_bits - 1)) & np.uint64(
+            1
+        )
+        shifted[:, -1] &= self.__last_mask
+        return shifted
+
+    def __shift_west(self, board: np.ndarray) -> np.ndarray:
+        # Board of the eastern neighbours: cell x receives cell x + 1.
+        shifted = board >> np.uint64(1)
+        shifted[:, :-1] |= board[:, 1:] << np.uint64(self.WORD - 1)
+        shifted[:, -1] |= (board[:, 0] & np.uint64(1)) << np.uint64(
+            self.__last_bits - 1
+        )
+        return shifted
+
+    # pylint: disable=too-many-locals
+    def step(self) -> bool:
+        """! Advance the board by one generation, reseeding it when it stalls.
+        @return True if the board was reseeded.
+        """
+        board = self.board
+        east = self.__shift_east(board)
+        west = self.__shift_west(board)
+        # Bits of the sums of the 2 horizontal neighbours and of the 3 horizontal cells.
+        pair0 = east ^ west
+        pair1 = east & west
+        triple0 = pair0 ^ board
+        triple1 = pair1 | (pair0 & board)
+        above0, below0 = np.roll(triple0, 1, axis=0), np.roll(triple0, -1, axis=0)
+        above1, below1 = np.roll(triple1, 1, axis=0), np.roll(triple1, -1, axis=0)
+
+        # Add the rows above and below to the horizontal neighbours, the fours bit saturates as
+        # more than 3 neighbours always kill the cell.
+        ones = above0 ^ below0 ^ pair0
+        carry = (above0 & below0) | (pair0 & (above0 ^ below0))
+        twos = above1 ^ below1 ^ pair1 ^ carry
+        fours = (
+            (above1 & below1) | (pair1 & carry) | ((above1 ^ below1) & (pair1 ^ carry))
+        )
+
+        # Survival with 2 or 3 neighbours, birth with 3 neighbours.
+        self.board = twos & ~fours & (ones | board)
+        self.generation += 1
+
+        if self.__history.remember(self.board.tobytes()):
+            self.seed()
+            self.reseeds += 1
+            return True
+        return False
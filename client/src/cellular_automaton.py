@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""! Generic cellular automaton engine script."""
+import re
+import cv2 as cv
+import numpy as np
+
+
+class CellularAutomaton:
+    """! Cellular automaton engine, with multiple states and rules given as strings.
+    Supported rules:
+    @li Life-like rules in the B/S notation, for example @c B3/S23 for Conway's Game of Life:
+    a dead cell is born with one of the @c B neighbour counts, a live cell survives with one of the
+    @c S neighbour counts.
+    @li Generations rules, with the number of states added as @c /C, for example @c B2/S/C3 for
+    Brian's Brain: a live cell which does not survive goes through the dying states before it is
+    dead, dying cells are not counted as neighbours.
+    @li @c Wireworld: empty cells, electron heads, electron tails and conductors, an electron head
+    is created on a conductor with 1 or 2 electron head neighbours.
+
+    State 0 is the dead or empty state, state 1 the live state or electron head, which is the only
+    state counted as a neighbour. The neighbours are counted with a 2D filter over the board,
+    wrapped on both axes, and the next state of every cell is looked up in a table indexed by its
+    state and neighbour count.
+
+    The colors of the states are given by a palette, which can be replaced, and @ref color can be
+    overriden for other color mappings.
+
+    @sa https://conwaylife.com/wiki/Rulestring
+    @sa https://conwaylife.com/wiki/Generations
+    @sa https://en.wikipedia.org/wiki/Wireworld
+    """
+
+    ## Conway's Game of Life rule.
+    LIFE = "B3/S23"
+    ## Brian's Brain rule.
+    BRIANS_BRAIN = "B2/S/C3"
+    ## Wireworld rule.
+    WIREWORLD = "Wireworld"
+
+    ## Wireworld empty state.
+    EMPTY = 0
+    ## Wireworld electron head state.
+    HEAD = 1
+    ## Wireworld electron tail state.
+    TAIL = 2
+    ## Wireworld conductor state.
+    CONDUCTOR = 3
+
+    __KERNEL = np.array([[1, 1, 1], [1, 0, 1], [1, 1, 1]], dtype=np.uint8)
+    __NEIGHBOURS = 9
+    __RULE = re.compile(r"^B([0-8]*)/S([0-8]*)(?:/C([0-9]+))?$", re.IGNORECASE)
+
+    def __init__(self, rule: str, shape: tuple):
+        """! Constructor.
+        @param rule Rule string.
+        @param shape Board shape: height and width, in cells.
+        """
+        self.__table = self.__parse(rule)
+        self.states = np.zeros(shape[0:2], dtype=np.uint8)
+        ## Colors of the states, in RGB.
+        self.palette = self.__palette(self.__table.shape[0], rule)
+
+    @staticmethod
+    def __parse(rule: str) -> np.ndarray:
+        # Return the transition table, indexed by the state and the neighbour count.
+        if rule.lower() == CellularAutomaton.WIREWORLD.lower():
+            table = np.zeros((4, CellularAutomaton.__NEIGHBOURS), dtype=np.uint8)
+            table[CellularAutomaton.HEAD] = CellularAutomaton.TAIL
+            table[CellularAutomaton.TAIL] = CellularAutomaton.CONDUCTOR
+            table[CellularAutomaton.CONDUCTOR] = CellularAutomaton.CONDUCTOR
+            table[CellularAutomaton.CONDUCTOR, 1:3] = CellularAutomaton.HEAD
+            return table
+
+        match = CellularAutomaton.__RULE.match(rule.replace(" ", ""))
+        assert match is not None, f"Unrecognised rule: {rule}."
+        born = [int(count) for count in match.group(1)]
+        survive = [int(count) for count in match.group(2)]
+        states = int(match.group(3) or 2)
+        assert states >= 2, f"At least 2 states are needed: {rule}."
+
+        table = np.zeros((states, CellularAutomaton.__NEIGHBOURS), dtype=np.uint8)
+        table[0, born] = 1
+        # Live cells which do not survive start dying, dying cells progress to the dead state.
+        table[1] = 2 % states
+        table[1, survive] = 1
+        for state in range(2, states):
+            table[state] = (state + 1) % states
+        return table
+
+    @staticmethod
+    def __palette(states: int, rule: str) -> np.ndarray:
+        if rule.lower() == CellularAutomaton.WIREWORLD.lower():
+            return np.array(
+                [
+                    (0x00, 0x00, 0x00),
+                    (0x00, 0x80, 0xFF),
+                    (0xFF, 0x40, 0x00),
+                    (0xFF, 0xC0, 0x00),
+                ],
+                dtype=np.uint8,
+            )
+        # Live cells in white, dying cells fading out in blue.
+        palette = np.zeros((states, 3), dtype=np.uint8)
+        palette[1] = (0xFF, 0xFF, 0xFF)
+        for state in range(2, states):
+            palette[state] = (0, 0, 0xFF * (states - state) // (states - 1))
+        return palette
+
+    def seed(self, states: np.ndarray = None, density: float = 0.5):
+        """! Seed the board.
+        @param states Initial states of the cells, random live cells if @c None.
+        @param density Ratio of live cells on a random board.
+        """
+        if states is None:
+            states = np.random.random(self.states.shape) < density
+        self.states = np.asarray(states, dtype=np.uint8)
+
+    def neighbours(self) -> np.ndarray:
+        """! Count the live neighbours of every cell.
+        @return Neighbour count image.
+        """
+        return cv.filter2D(
+            cv.copyMakeBorder(
+                (self.states == 1).view(np.uint8), 1, 1, 1, 1, cv.BORDER_WRAP
+            ),
+            -1,
+            CellularAutomaton.__KERNEL,
+            borderType=cv.BORDER_ISOLATED,
+        )[1:-1, 1:-1]
+
+    def step(self, generations: int = 1) -> np.ndarray:
+        """! Advance the board by a number of generations.
+        @param generations Number of generations.
+        @return States of the board after each generation, with the shape
+        <tt>(generations, height, width)</tt>.
+        """
+        states = np.empty((generations, *self.states.shape), dtype=np.uint8)
+        table = self.__table.ravel()
+        for generation in range(generations):
+            index = self.states.astype(np.intp) * self.__NEIGHBOURS
+            index += self.neighbours()
+            np.take(table, index, out=states[generation])
+            self.states = states[generation]
+        return states
+
+    def color(self, states: np.ndarray) -> np.ndarray:
+        """! Map the states to colors, override for other color mappings.
+        @param states States of the cells, of any shape.
+        @return RGB image, with an additional last axis.
+        """
+        return np.take(self.palette, states, axis=0)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""! Process-wide clock service script."""
+import heapq
+import logging
+from itertools import count
+from threading import Condition, Lock, Thread
+from time import monotonic, time
+from typing import Callable
+import pendulum
+
+
+class Clock:
+    """! Process-wide clock service, computing the time on demand.
+
+    The current time is derived from the monotonic clock, anchored to the wall clock, which is read
+    again every minute to follow its adjustments. The time is only computed when it is read.
+
+    There is one instance per timezone, shared by all the animations and panels of the process. It
+    caches the UTC offset of the timezone until the next offset change, daylight saving time
+    transitions are looked up a week ahead.
+
+    Callbacks can subscribe to second, minute, hour or day boundaries of the timezone. All the
+    subscriptions of the process are scheduled by a single timer thread, started on the first
+    subscription, which sleeps until the next boundary.
+
+    @sa https://en.wikipedia.org/wiki/List_of_tz_database_time_zones#List
+    """
+
+    ## Second boundary, in seconds.
+    SECOND = 1
+    ## Minute boundary, in seconds.
+    MINUTE = 60
+    ## Hour boundary, in seconds.
+    HOUR = 60 * 60
+    ## Day boundary, in seconds.
+    DAY = 24 * 60 * 60
+
+    ## Delay after which the wall clock is read again, in seconds.
+    __ANCHOR_DELAY = 60.0
+    ## How far ahead UTC offset changes are looked up, in seconds.
+    __TRANSITION_HORIZON = 7 * 24 * 3600
+    ## Step of the UTC offset changes look up, shorter than the time between two changes.
+    __TRANSITION_STEP = 24 * 3600
+
+    __anchor = (time(), monotonic())
+    __clocks = {}
+    __lock = Lock()
+
+    __subscriptions = []
+    __sequence = count()
+    __timer = None
+    __timer_condition = Condition()
+
+    # pylint: disable=too-few-public-methods
+    class Subscription:
+        """! Subscription to time boundaries, returned by @ref subscribe."""
+
+        def __init__(self, clock: object, boundary: int, callback: Callable):
+            """! Constructor.
+            @param clock The clock of the timezone.
+            @param boundary Boundary duration, in seconds.
+            @param callback Function called with the POSIX timestamp of the boundary.
+            """
+            self.clock = clock
+            self.boundary = boundary
+            self.callback = callback
+            self.active = True
+
+        def cancel(self):
+            """! Stop calling the callback."""
+            self.active = False
+
+    def __init__(self, timezone: str):
+        """! Constructor, use @ref get to obtain the shared instance instead.
+        @param timezone Timezone string.
+        """
+        self.__timezone = pendulum.timezone(timezone)
+        self.__lock = Lock()
+        self.__offset = 0.0
+        self.__valid = (float("inf"), float("-inf"))
+
+    @staticmethod
+    def get(timezone: str) -> "Clock":
+        """! Return the shared clock of a timezone.
+        @param timezone Timezone string.
+        @return The clock instance.
+        """
+        with Clock.__lock:
+            if timezone not in Clock.__clocks:
+                Clock.__clocks[timezone] = Clock(timezone)
+            return Clock.__clocks[timezone]
+
+    @staticmethod
+    def now() -> float:
+        """! Return the current time.
+        @return POSIX timestamp, in seconds.
+        """
+        wall, mono = Clock.__anchor
+        elapsed = monotonic() - mono
+        if elapsed > Clock.__ANCHOR_DELAY:
+            Clock.__anchor = (time(), monotonic())
+            return Clock.__anchor[0]
+        return wall + elapsed
+
+    def __utcoffset(self, stamp: float) -> float:
+        return (
+            pendulum.from_timestamp(stamp, tz=self.__timezone)
+            .utcoffset()
+            .total_seconds()
+        )
+
+    def offset(self, stamp: float) -> float:
+        """! Return the UTC offset of the timezone at a given time.
+        @param stamp POSIX timestamp.
+        @return UTC offset, in seconds.
+        """
+        return self.__offset_until(stamp)[0]
+
+    def __offset_until(self, stamp: float) -> tuple:
+        with self.__lock:
+            if self.__valid[0] <= stamp < self.__valid[1]:
+                return self.__offset, self.__valid[1]
+
+            offset = self.__utcoffset(stamp)
+            # Find the next offset change: step forward, then bisect to the second.
+            start = int(stamp)
+            end = start
+            while end - start < self.__TRANSITION_HORIZON:
+                probe = end + self.__TRANSITION_STEP
+                if self.__utcoffset(probe) != offset:
+                    while probe - end > 1:
+                        middle = (end + probe) // 2
+                        if self.__utcoffset(middle) == offset:
+                            end = middle
+                        else:
+                            probe = middle
+                    end = probe
+                    break
+                end = probe
+
+            self.__offset = offset
+            self.__valid = (stamp, end)
+            return offset, end
+
+    def local(self, stamp: float) -> float:
+        """! Convert a POSIX timestamp to the local time of the timezone.
+        @param stamp POSIX timestamp.
+        @return Seconds since the epoch, in the local time.
+        """
+        return stamp + self.offset(stamp)
+
+    def next_boundary(self, stamp: float, boundary: int) -> float:
+        """! Return the time of the next boundary in the local time.
+        An offset change, such as a daylight saving time transition, is also considered a boundary.
+        @param stamp POSIX timestamp.
+        @param boundary Boundary duration: @c SECOND, @c MINUTE, @c HOUR or @c DAY.
+        @return POSIX timestamp of the next boundary, strictly after the given time.
+        """
+        offset, until = self.__offset_until(stamp)
+        local = stamp + offset
+        return min((local // boundary + 1) * boundary - offset, until)
+
+    def subscribe(self, boundary: int, callback: Callable) -> Subscription:
+        """! Call a function at every boundary of the local time.
+        @param boundary Boundary duration: @c SECOND, @c MINUTE, @c HOUR or @c DAY.
+        @param callback Function called from the timer thread with the POSIX timestamp of the
+        boundary.
+        @return The subscription, which can be cancelled.
+        """
+        subscription = self.Subscription(self, boundary, callback)
+        with Clock.__timer_condition:
+            Clock.__schedule(subscription, Clock.now())
+            if Clock.__timer is None:
+                Clock.__timer = Thread(target=Clock.__run, daemon=True)
+                Clock.__timer.start()
+            Clock.__timer_condition.notify()
+        return subscription
+
+    @staticmethod
+    def __schedule(subscription: Subscription, stamp: float):
+        deadline = subscription.clock.next_boundary(stamp, subscription.boundary)
+        heapq.heappush(
+            Clock.__subscriptions, (deadline, next(Clock.__sequence), subscription)
+        )
+
+    @staticmethod
+    def __run():
+        while True:
+            with Clock.__timer_condition:
+                while not Clock.__subscriptions:
+                    Clock.__timer_condition.wait()
+                deadline, _, subscription = Clock.__subscriptions[0]
+                delay = deadline - Clock.now()
+                if delay > 0:
+                    Clock.__timer_condition.wait(delay)
+                    continue
+                heapq.heappop(Clock.__subscriptions)
+                if not subscription.active:
+                    continue
+                Clock.__schedule(subscription, deadline)
+
+            try:
+                subscription.callback(deadline)
+            except Exception as error:  # pylint: disable=broad-except
+                logging.error("[%s] Subscription error: %s", Clock.__name__, error)
@@ -3,37 +3,57 @@
 import sys
 import socket
 import logging
+from time import monotonic
 import numpy as np
+from src.post_process import PostProcess
 
 
+# pylint: disable=too-many-instance-attributes
 class Display:
     """! RGB matrix panel socket client class.
     The display current consumption per pixel has been measured for each of the colors separately
     using a USB power meter.
+
+    An unchanged screen is not sent again, unless the keep-alive delay has elapsed: the display
+    restarts when it has not recieved any data for 2 minutes.
+
+    The frames can be post-processed before being packed, for example to correct the gamma or to
+    rotate them for a panel mounted in another orientation.
+
+    @sa #client::src::post_process::PostProcess
     """
 
     __socket = None
     __screen = None
     __connected = False
+    __sent = float("-inf")
     __current_base = 0.13
     __current_color = [0.000139, 0.0000605, 0.0000378]
 
+    # pylint: disable=too-many-arguments
     def __init__(
         self,
         server: str,
         port: int = 7777,
         timeout: int = 3.0,
         current_max: float = float("inf"),
+        keepalive: float = 60.0,
+        *,
+        post_process: PostProcess = None,
     ):
         """! Constructor.
         @param server The server IP address.
         @param port The server port number.
         @param timeout Communication timeout in seconds.
         @param current_max Maximum current limit the matrix is allowed to use, in Amperes.
+        @param keepalive Delay after which an unchanged screen is sent again, in seconds.
+        @param post_process Post-processing applied to the frames, @c None to send them as drawn.
         """
         self.__connection = (server, port)
         self.__timeout = timeout
         self.__current_max = current_max
+        self.__keepalive = keepalive
+        self.__post_process = post_process
 
     def connect(self) -> bool:
         """! Connect to the server.
@@ -64,10 +84,17 @@ class Display:
 
     def update(self, screen: np.ndarray) -> bool:
         """! Update the screen. The screen will not be updated if the display has not changed from
-        the previous update. If defined, dim screen if estimated current goes beyond limit.
+        the previous update, within the keep-alive delay. If defined, dim screen if estimated
+        current goes beyond limit.
         @return True if the screen was updated, false otherwise.
         """
-        if np.all(screen == self.__screen):  # pragma: no cover
+        if self.__post_process is not None:
+            screen = self.__post_process.apply(screen)
+
+        if (
+            np.all(screen == self.__screen)
+            and monotonic() - self.__sent < self.__keepalive
+        ):  # pragma: no cover
             logging.debug("[%s] No changes on display.", self.__class__.__name__)
             return False
 
@@ -106,6 +133,7 @@ class Display:
 
         try:
             self.__socket.sendall(packed)
+            self.__sent = monotonic()
         except (
             socket.timeout,
             BrokenPipeError,
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""! Process-wide font registry script."""
+import os
+from threading import Lock
+from src.text import Text
+
+
+# pylint: disable=too-few-public-methods
+class FontRegistry:
+    """! Process-wide registry of the loaded fonts.
+    Each font file is parsed once per size and the resulting text instance, with its glyph atlas,
+    is shared by all the animations and panels of the process. The registry is thread-safe.
+
+    Relative font paths are looked up in the font directory of the client package first, so the
+    animations do not depend on the current working directory.
+
+    @sa #client::src::text::Text
+    """
+
+    ## Directory of the fonts bundled with the client.
+    DIRECTORY = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "font"
+    )
+
+    __texts = {}
+    __lock = Lock()
+
+    @staticmethod
+    def path(fontpath: str) -> str:
+        """! Resolve a font path.
+        @param fontpath Font file name in the client font directory, or path to a font file.
+        @return Absolute path to the font file.
+        """
+        bundled = os.path.join(FontRegistry.DIRECTORY, fontpath)
+        return os.path.abspath(bundled if os.path.isfile(bundled) else fontpath)
+
+    @staticmethod
+    def get(fontpath: str, fontsize: int) -> Text:
+        """! Return the shared text instance of a font, loading the font on first use.
+        @param fontpath Font file name in the client font directory, or path to a font file.
+        @param fontsize Font size.
+        @return Text instance drawing with the requested font.
+        """
+        key = (FontRegistry.path(fontpath), fontsize)
+        with FontRegistry.__lock:
+            if key not in FontRegistry.__texts:
+                FontRegistry.__texts[key] = Text(*key)
+            return FontRegistry.__texts[key]
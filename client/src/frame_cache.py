@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""! Rendered frame cache script."""
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable
+import numpy as np
+
+
+class FrameCache:
+    """! Least recently used cache of rendered frames, within a memory budget.
+    Animations whose content only depends on a few values, such as the text of a clock, render each
+    frame once and copy it from the cache afterwards. The frames are stored read-only. When the
+    frames exceed the memory budget the least recently used ones are evicted first. The cache is
+    safe to share between threads.
+    """
+
+    def __init__(self, budget: int = 16 * 1024 * 1024):
+        """! Constructor.
+        @param budget Maximum size of the frames kept, in bytes.
+        """
+        self.__budget = budget
+        self.__frames = OrderedDict()
+        self.__nbytes = 0
+        self.__lock = Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, key: tuple, render: Callable[[], np.ndarray]) -> np.ndarray:
+        """! Return a cached frame, rendering and storing it when missing.
+        @param key Frame key, for example the animation class, screen shape and text.
+        @param render Function rendering the frame on a cache miss.
+        @return The read-only frame.
+        """
+        with self.__lock:
+            frame = self.__frames.get(key)
+            if frame is not None:
+                self.__frames.move_to_end(key)
+                self.__hits += 1
+                return frame
+            self.__misses += 1
+
+        frame = render()
+        frame.flags.writeable = False
+        self.put(key, frame)
+        return frame
+
+    def put(self, key: tuple, frame: np.ndarray):
+        """! Store a frame, evicting the least recently used frames beyond the budget.
+        @param key Frame key.
+        @param frame The frame, which must not be modified afterwards.
+        """
+        with self.__lock:
+            previous = self.__frames.pop(key, None)
+            if previous is not None:
+                self.__nbytes -= previous.nbytes
+            self.__frames[key] = frame
+            self.__nbytes += frame.nbytes
+            while self.__nbytes > self.__budget and self.__frames:
+                self.__nbytes -= self.__frames.popitem(last=False)[1].nbytes
+
+    def __contains__(self, key: tuple) -> bool:
+        """! Tell whether a frame is cached, without updating its use.
+        @param key Frame key.
+        @return True if the frame is cached.
+        """
+        with self.__lock:
+            return key in self.__frames
+
+    def clear(self):
+        """! Remove all the frames and reset the counters."""
+        with self.__lock:
+            self.__frames.clear()
+            self.__nbytes = 0
+            self.__hits = 0
+            self.__misses = 0
+
+    @property
+    def budget(self) -> int:
+        """! Return the memory budget.
+        @return Maximum size of the frames kept, in bytes.
+        """
+        return self.__budget
+
+    @property
+    def nbytes(self) -> int:
+        """! Return the size of the cached frames.
+        @return Size in bytes.
+        """
+        return self.__nbytes
+
+    @property
+    def hits(self) -> int:
+        """! Return the number of frames found in the cache.
+        @return Number of cache hits.
+        """
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """! Return the number of frames rendered because they were not in the cache.
+        @return Number of cache misses.
+        """
+        return self.__misses
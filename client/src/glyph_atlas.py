@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""! Pre-rasterized glyph atlas script."""
+import numpy as np
+from PIL import ImageFont, ImageDraw, Image
+
+
+class GlyphAtlas:
+    """! Pre-rasterized glyph bitmaps of a font, used to draw text directly on a Numpy screen.
+
+    Each glyph is rendered once with PIL, on first use, and stored as an 8-bit alpha bitmap together
+    with its offset and advance width. Text is then composed from the stored bitmaps and blended
+    into the screen with the same integer arithmetic as PIL, so the result is identical to
+    @c ImageDraw.text, without converting the whole screen to a PIL image and back.
+
+    @sa https://pillow.readthedocs.io/en/stable/reference/ImageDraw.html
+    """
+
+    ## Spacing between lines of multiline text, in pixels, as used by PIL.
+    __LINE_SPACING = 4
+
+    # pylint: disable=too-few-public-methods
+    class Glyph:
+        """! Rasterized glyph.
+        The offsets are relative to the pen position of the glyph.
+        """
+
+        def __init__(
+            self, bitmap: np.ndarray, offset: tuple, advance: float, extent: tuple
+        ):
+            """! Constructor.
+            @param bitmap Glyph alpha bitmap, cropped to the drawn pixels.
+            @param offset Position of the top left corner of the bitmap, (x, y) in pixels.
+            @param advance Horizontal advance width, in pixels.
+            @param extent Right and bottom edges of the glyph box, (x, y) in pixels.
+            """
+            self.bitmap = bitmap
+            self.offset = offset
+            self.advance = advance
+            self.extent = extent
+
+    def __init__(self, font: ImageFont.FreeTypeFont):
+        """! Constructor.
+        @param font The PIL font to rasterize.
+        """
+        self.__font = font
+        self.__glyphs = {}
+
+    def glyph(self, character: str) -> Glyph:
+        """! Return the rasterized glyph of a character, rendering it on first use.
+        @param character Single character.
+        @return The rasterized glyph.
+        """
+        glyph = self.__glyphs.get(character)
+        if glyph is None:
+            glyph = self.__rasterize(character)
+            self.__glyphs[character] = glyph
+        return glyph
+
+    def __rasterize(self, character: str) -> Glyph:
+        box = self.__font.getbbox(character)
+        # Leave a margin for glyphs extending to the left or above the pen position.
+        margin = self.__font.size
+        canvas = Image.new("L", (box[2] + 2 * margin, box[3] + 2 * margin))
+        ImageDraw.Draw(canvas).text(
+            (margin, margin), character, font=self.__font, fill=0xFF
+        )
+        bitmap = np.array(canvas)
+
+        rows = np.flatnonzero(bitmap.any(axis=1))
+        columns = np.flatnonzero(bitmap.any(axis=0))
+        if rows.size == 0:
+            bitmap, offset = np.zeros((0, 0), dtype=np.uint8), (0, 0)
+        else:
+            bitmap = bitmap[rows[0] : rows[-1] + 1, columns[0] : columns[-1] + 1]
+            offset = (columns[0] - margin, rows[0] - margin)
+
+        return self.Glyph(
+            bitmap, offset, self.__font.getlength(character), (box[2], box[3])
+        )
+
+    def layout(self, text: str) -> list:
+        """! Return the glyphs of a single line text with their pen positions.
+        Pen positions are rounded to the pixel, as FreeType does.
+        @param text Text to lay out.
+        @return List of @c (pen, glyph) pairs, the pen position in pixels from the text origin.
+        """
+        glyphs = []
+        pen = 0.0
+        for character in text:
+            glyph = self.glyph(character)
+            glyphs.append((int(pen + 0.5), glyph))
+            pen += glyph.advance
+        return glyphs
+
+    def __mask(self, text: str) -> tuple:
+        glyphs = [(pen, glyph) for pen, glyph in self.layout(text) if glyph.bitmap.size]
+        if not glyphs:
+            return None, (0, 0)
+
+        # Bounding box of the drawn pixels, relative to the text offset.
+        left = min(pen + glyph.offset[0] for pen, glyph in glyphs)
+        top = min(glyph.offset[1] for _, glyph in glyphs)
+        right = max(
+            pen + glyph.offset[0] + glyph.bitmap.shape[1] for pen, glyph in glyphs
+        )
+        bottom = max(glyph.offset[1] + glyph.bitmap.shape[0] for _, glyph in glyphs)
+
+        # Overlapping glyphs are merged by their maximum value, as done by PIL.
+        mask = np.zeros((bottom - top, right - left), dtype=np.uint8)
+        for pen, glyph in glyphs:
+            pos_x = pen + glyph.offset[0] - left
+            pos_y = glyph.offset[1] - top
+            region = mask[
+                pos_y : pos_y + glyph.bitmap.shape[0],
+                pos_x : pos_x + glyph.bitmap.shape[1],
+            ]
+            np.maximum(region, glyph.bitmap, out=region)
+
+        return mask, (left, top)
+
+    def __line_height(self) -> int:
+        return self.textsize("A")[1] + self.__LINE_SPACING
+
+    def textsize(self, text: str) -> tuple:
+        """! Return the size of a text, identical to @c ImageDraw.textsize.
+        @param text Text to measure.
+        @return Width and height of the text, in pixels.
+        """
+        if "\n" in text:
+            lines = text.split("\n")
+            width = max(self.textsize(line)[0] for line in lines)
+            return width, len(lines) * self.__line_height() - self.__LINE_SPACING
+
+        width, height = 0, 0
+        for pen, glyph in self.layout(text):
+            width = max(width, pen + glyph.extent[0])
+            height = max(height, glyph.extent[1])
+        return width, height
+
+    def render(
+        self,
+        screen: np.ndarray,
+        text: str,
+        color: tuple = (0xFF, 0xFF, 0xFF),
+        offset: tuple = (0, 0),
+    ):
+        """! Draw a single or multiline text on a screen, identical to @c ImageDraw.text.
+        @param screen The screen reference, drawn in place.
+        @param text Text to draw.
+        @param color Color of the text, in RGB, from 0x00 to 0xff.
+        @param offset Text offset from top left corner.
+        """
+        if "\n" in text:
+            for row, line in enumerate(text.split("\n")):
+                self.render(
+                    screen,
+                    line,
+                    color,
+                    (offset[0], offset[1] + row * self.__line_height()),
+                )
+            return
+
+        mask, (left, top) = self.__mask(text)
+        if mask is None:
+            return
+
+        self.blend(screen, mask, color, (int(offset[0]) + left, int(offset[1]) + top))
+
+    @staticmethod
+    def blend(screen: np.ndarray, mask: np.ndarray, color: tuple, position: tuple):
+        """! Blend a color through an alpha mask on a screen, identical to PIL.
+        The mask is clipped to the screen borders.
+        @param screen The screen reference, drawn in place.
+        @param mask Alpha mask, from 0x00 to 0xff.
+        @param color Color, in RGB, from 0x00 to 0xff.
+        @param position Position of the top left corner of the mask, (x, y) in pixels.
+        """
+        pos_x, pos_y = position
+        clip_x0, clip_y0 = max(pos_x, 0), max(pos_y, 0)
+        clip_x1 = min(pos_x + mask.shape[1], screen.shape[1])
+        clip_y1 = min(pos_y + mask.shape[0], screen.shape[0])
+        if clip_x0 >= clip_x1 or clip_y0 >= clip_y1:
+            return
+
+        alpha = mask[
+            clip_y0 - pos_y : clip_y1 - pos_y, clip_x0 - pos_x : clip_x1 - pos_x, None
+        ].astype(np.uint16)
+        region = screen[clip_y0:clip_y1, clip_x0:clip_x1]
+
+        # Rounded division by 255, bit-exact with the PIL blending.
+        blend = region * (0xFF - alpha) + np.array(color, dtype=np.uint16) * alpha + 128
+        region[:] = ((blend >> 8) + blend) >> 8
@@ -1,23 +1,39 @@
 #!/usr/bin/env python3
 """! Local time object."""
 import logging
-from time import sleep
-from threading import Thread
+from time import gmtime, monotonic
+from typing import Callable
 import pendulum
+from src.clock import Clock
 
 
-class Localtime(Thread):
+class Localtime:
     """! The local time class provides convenience functions for the various animations needing to
     keep time.
 
-    The instance updates itself asychronously from the animation at the requested update rate. If
-    the update rate is set to 0 the automatic update is disabled. This is useful when testing for a
-    particular time.
+    The instance reads the shared clock of its timezone on demand, when the time is accessed and is
+    older than the requested update rate, no thread is involved. If the update rate is set to 0 the
+    automatic update is disabled. This is useful when testing for a particular time.
 
-    @sa https://docs.python.org/3/library/datetime.html
+    Instead of polling the time, callbacks can subscribe to the second, minute, hour or day
+    boundaries of the timezone: they are called exactly when the boundary is reached, with the
+    time set to the boundary.
+
+    @sa #client::src::clock::Clock
+    @sa https://docs.python.org/3/library/time.html#time.struct_time
     """
 
-    __time = None
+    ## Second boundary.
+    SECOND = Clock.SECOND
+    ## Minute boundary.
+    MINUTE = Clock.MINUTE
+    ## Hour boundary.
+    HOUR = Clock.HOUR
+    ## Day boundary.
+    DAY = Clock.DAY
+
+    __local = None
+    __updated = float("-inf")
 
     def __init__(self, timezone: str = "GMT", update_rate: float = 30.0):
         """! Constructor.
@@ -25,12 +41,11 @@ class Localtime(Thread):
         @param update_rate Rate at which the time is updated, in Hz.
         @sa https://en.wikipedia.org/wiki/List_of_tz_database_time_zones#List
         """
-        super().__init__(target=self.__run, kwargs={"rate": update_rate}, daemon=True)
         self.__timezone = timezone
+        self.__clock = Clock.get(timezone)
+        self.__period = 1.0 / update_rate if update_rate > 0 else float("inf")
 
         self.update()
-        if update_rate > 0:
-            self.start()
 
         logging.debug("[%s] %s", self.__class__.__name__, self)
 
@@ -38,71 +53,95 @@ class Localtime(Thread):
         """! Return a string format of the time.
         @return Current time in ISO8601 format.
         """
-        return self.__time.to_iso8601_string()
+        return pendulum.from_timestamp(
+            self.timestamp, tz=self.__timezone
+        ).to_iso8601_string()
 
-    def __run(self, **kwargs):
-        while True:
-            sleep(1.0 / kwargs["rate"])
-            self.update()  # pragma: no cover
+    def __now(self) -> tuple:
+        if monotonic() - self.__updated >= self.__period:
+            self.update()
+        return self.__local
 
     def update(self):
         """! Update the current time."""
-        self.__time = pendulum.now(self.__timezone)
+        self.set_time(Clock.now())
 
     def set_time(self, stamp: float):
         """! Set the instance time.
         @param stamp POSIX timestamp.
         """
-        self.__time = pendulum.from_timestamp(stamp, tz=self.__timezone)
+        local = self.__clock.local(stamp)
+        self.__local = (gmtime(local), int(local % 1 * 1000), stamp)
+        self.__updated = monotonic()
+
+    def subscribe(self, boundary: int, callback: Callable) -> Clock.Subscription:
+        """! Call a function at every boundary of the local time.
+        @param boundary Boundary: @c SECOND, @c MINUTE, @c HOUR or @c DAY.
+        @param callback Function called with this instance, from the clock timer thread.
+        @return The subscription, which can be cancelled.
+        """
+
+        def notify(stamp: float):
+            self.set_time(stamp)
+            callback(self)
+
+        return self.__clock.subscribe(boundary, notify)
+
+    @property
+    def timestamp(self) -> float:
+        """! Return the current time as a POSIX timestamp.
+        @return Seconds since the epoch.
+        """
+        return self.__now()[2]
 
     @property
     def hour(self) -> int:
         """! Return the current hour.
         @return Current hour, in 24h format.
         """
-        return self.__time.hour
+        return self.__now()[0].tm_hour
 
     @property
     def minute(self) -> int:
         """! Return the current minute.
         @return Current minute, from  0 to 59.
         """
-        return self.__time.minute
+        return self.__now()[0].tm_min
 
     @property
     def second(self) -> int:
         """! Return the current second.
         @return Current second, from 0 to 59.
         """
-        return self.__time.second
+        return self.__now()[0].tm_sec
 
     @property
     def millisecond(self) -> int:
         """! Return the current millisecond.
         @return Current millisecond, from 0 to 999.
         """
-        return self.__time.microsecond // 1000
+        return self.__now()[1]
 
     @property
     def month(self) -> int:
         """! Return the current month.
         @return Current month, from 0 to 11.
         """
-        return self.__time.month
+        return self.__now()[0].tm_mon
 
     @property
     def day(self) -> int:
         """! Return the current day of the month.
         @return Current day of the month, from 0 to 31.
         """
-        return self.__time.day
+        return self.__now()[0].tm_mday
 
     @property
     def year(self) -> int:
         """! Return the current year.
         @return Current year, with 4 digits.
         """
-        return self.__time.year
+        return self.__now()[0].tm_year
 
     @property
     def weekday(self) -> int:
@@ -110,5 +149,4 @@ class Localtime(Thread):
         @return Current day of the week, from 0 to 6, 0 representing Monday.
         @sa https://en.wikipedia.org/wiki/ISO_8601
         """
-        # Transform the ISO8601 to a more convenient style.
-        return self.__time.day_of_week - 1
+        return self.__now()[0].tm_wday
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""! Particle system engine script."""
+import numpy as np
+
+
+# pylint: disable=too-many-instance-attributes
+class Particles:
+    """! Particle system engine, moving many particles falling through parallax layers.
+    The state of the particles is kept as a structure of arrays, preallocated once: position,
+    velocity, layer and brightness. The particles of the far layers are slower and dimmer than the
+    particles of the near layers, and less pushed by the wind. All the particles are updated at once
+    with vectorized operations, and a particle leaving the bottom of the screen comes back at the
+    top at a random position.
+
+    The particles reaching the bottom can accumulate into a pile on the ground, which settles
+    across the columns and melts once it reaches a quarter of the screen height.
+
+    The particles and the pile are rasterized into a reusable buffer, the brightness of particles
+    falling on the same pixel being added and saturated.
+    """
+
+    ## Brightness of the pile on the ground.
+    GROUND_BRIGHTNESS = 0xC0
+    ## Height of the pile melted on every frame, in pixels.
+    MELT_RATE = 0.05
+    ## Ratio of the height difference with the neighbour columns the pile settles by every frame.
+    SETTLE_RATE = 0.2
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        shape: tuple,
+        count: int,
+        *,
+        layers: int = 3,
+        speed: float = 1.0,
+        wind: float = 0.0,
+        accumulation: float = 0.0,
+    ):
+        """! Constructor.
+        @param shape Screen shape: height and width, in pixels.
+        @param count Number of particles.
+        @param layers Number of parallax layers.
+        @param speed Falling speed of the nearest layer, in pixels per frame.
+        @param wind Horizontal speed of the nearest layer, in pixels per frame.
+        @param accumulation Height added to the pile by a particle of the nearest layer reaching
+        it, in pixels, 0 disables the pile.
+        """
+        self.__height, self.__width = shape[0:2]
+        ## Horizontal speed of the nearest layer, in pixels per frame.
+        self.wind = wind
+        self.__accumulation = accumulation
+        self.__melting = False
+
+        ## Column of the particles.
+        self.x = np.empty(count, dtype=np.float32)
+        ## Row of the particles.
+        self.y = np.empty(count, dtype=np.float32)
+        ## Layer of the particles, from 0 for the farthest.
+        self.layer = np.random.randint(layers, size=count).astype(np.uint8)
+        # Depth of the particles, from 1 / layers for the farthest layer to 1 for the nearest.
+        self.__depth = (self.layer.astype(np.float32) + 1) / layers
+        ## Falling speed of the particles, in pixels per frame.
+        self.velocity = speed * self.__depth * np.random.uniform(0.75, 1.25, count)
+        self.velocity = self.velocity.astype(np.float32)
+        ## Brightness of the particles.
+        self.brightness = (0xFF * self.__depth).astype(np.float32)
+        ## Height of the pile on the ground of every column, in pixels.
+        self.ground = np.zeros(self.__width, dtype=np.float32)
+
+        self.__drift = np.empty(count, dtype=np.float32)
+        self.__limit = np.empty(count, dtype=np.float32)
+        self.__landed = np.empty(count, dtype=bool)
+        self.__visible = np.empty(count, dtype=bool)
+        self.__column = np.empty(count, dtype=np.intp)
+        self.__row = np.empty(count, dtype=np.intp)
+        self.__weight = np.empty(count, dtype=np.float32)
+        self.__image = np.empty((self.__height, self.__width), dtype=np.float32)
+        self.__rows = np.arange(self.__height, dtype=np.float32)[:, None]
+        self.__surface = np.empty(self.__width, dtype=np.float32)
+        self.__slide = np.empty(self.__width, dtype=np.float32)
+        self.__pile = np.empty((self.__height, self.__width), dtype=bool)
+
+        # The particles start above the screen, so they fall in progressively.
+        self.spawn(np.arange(count), self.__height)
+
+    def spawn(self, index: np.ndarray, spread: float = 1.0):
+        """! Place particles above the screen at random positions.
+        @param index Indices of the particles.
+        @param spread Height above the screen over which the particles are spread, in pixels.
+        """
+        self.x[index] = np.random.uniform(0, self.__width, len(index))
+        self.y[index] = -np.random.uniform(0, spread, len(index))
+
+    def step(self):
+        """! Move the particles by one frame, piling up or respawning the landed particles."""
+        np.add(self.y, self.velocity, out=self.y)
+        np.multiply(self.__depth, self.wind, out=self.__drift)
+        np.add(self.x, self.__drift, out=self.x)
+        np.mod(self.x, self.__width, out=self.x)
+        self.__update_columns()
+
+        np.take(self.ground, self.__column, out=self.__limit)
+        np.subtract(self.__height, self.__limit, out=self.__limit)
+        np.greater_equal(self.y, self.__limit, out=self.__landed)
+        landed = np.flatnonzero(self.__landed)
+        if landed.size:
+            if self.__accumulation and not self.__melting:
+                np.add.at(
+                    self.ground,
+                    self.__column[landed],
+                    self.__accumulation * self.__depth[landed],
+                )
+            self.spawn(landed)
+
+        # The pile settles: every column slides towards the average of its neighbours, wrapping
+        # around the screen.
+        slide = self.__slide
+        np.copyto(slide[1:], self.ground[:-1])
+        slide[0] = self.ground[-1]
+        np.add(slide[:-1], self.ground[1:], out=slide[:-1])
+        slide[-1] += self.ground[0]
+        np.subtract(slide, self.ground, out=slide)
+        np.subtract(slide, self.ground, out=slide)
+        np.multiply(slide, self.SETTLE_RATE, out=slide)
+        np.add(self.ground, slide, out=self.ground)
+        if self.__melting or self.ground.max() >= self.__height / 4:
+            np.subtract(self.ground, self.MELT_RATE, out=self.ground)
+            np.maximum(self.ground, 0, out=self.ground)
+            self.__melting = bool(self.ground.any())
+
+    def __update_columns(self):
+        np.copyto(self.__column, self.x, casting="unsafe")
+        # Guard against the rounding of np.mod giving the width itself.
+        np.minimum(self.__column, self.__width - 1, out=self.__column)
+
+    def rasterize(self, out: np.ndarray = None) -> np.ndarray:
+        """! Draw the particles and the pile.
+        @param out Image in which the particles are drawn, as RGB or grayscale, allocated as
+        grayscale if @c None.
+        @return Image.
+        """
+        self.__image.fill(0)
+        self.__update_columns()
+        # Particles above the screen are drawn on the first row with no brightness.
+        np.copyto(self.__row, self.y, casting="unsafe")
+        np.maximum(self.__row, 0, out=self.__row)
+        np.greater_equal(self.y, 0, out=self.__visible)
+        np.multiply(self.brightness, self.__visible, out=self.__weight)
+        np.multiply(self.__row, self.__width, out=self.__row)
+        np.add(self.__row, self.__column, out=self.__row)
+        np.add.at(self.__image.ravel(), self.__row, self.__weight)
+
+        np.subtract(self.__height, self.ground, out=self.__surface)
+        np.greater_equal(self.__rows, self.__surface, out=self.__pile)
+        np.add(
+            self.__image, self.GROUND_BRIGHTNESS, out=self.__image, where=self.__pile
+        )
+        np.minimum(self.__image, 0xFF, out=self.__image)
+
+        if out is None:
+            out = np.empty((self.__height, self.__width), dtype=np.uint8)
+        image = self.__image if out.ndim == 2 else self.__image[..., None]
+        np.copyto(out, image, casting="unsafe")
+        return out
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""! Frame post-processing script."""
+import numpy as np
+
+
+# pylint: disable=too-many-instance-attributes,too-few-public-methods
+class PostProcess:
+    """! Post-processing of the frames before they are packed for the display.
+    The post-processing adapts the frames to the panel: gamma correction, global brightness,
+    rotation and mirroring for panels mounted in another orientation, and ordered dithering to the
+    3 bits per channel the display shows.
+
+    All the steps are fused when the post-processing is created: the gamma, the brightness and the
+    dithering thresholds are precomputed into one lookup table, and the rotation and the mirroring
+    into one index remap. A frame is then processed by gathering its values through the remap and
+    looking them up in the table, into preallocated buffers, whatever the enabled steps.
+
+    The dithering uses a 4x4 Bayer matrix, aligned on the panel pixels: the value of every pixel is
+    quantized to 3 bits with a threshold depending on its position, so the intermediate levels are
+    rendered by patterns of the neighbouring levels.
+    """
+
+    ## Rotations of the frames, clockwise in degrees.
+    ROTATIONS = [0, 90, 180, 270]
+    ## Mirroring of the frames, applied after the rotation.
+    FLIPS = ["", "horizontal", "vertical"]
+    ## Bayer matrix of the ordered dithering.
+    BAYER = np.array(
+        [[0, 8, 2, 10], [12, 4, 14, 6], [3, 11, 1, 9], [15, 7, 13, 5]], dtype=np.intp
+    )
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        shape: tuple,
+        *,
+        gamma: float = 1.0,
+        brightness: float = 1.0,
+        rotation: int = 0,
+        flip: str = "",
+        dither: bool = False,
+    ):
+        """! Constructor.
+        @param shape Panel shape: height, width and color channels, for example:
+        <tt>(32, 32, 3)</tt>.
+        @param gamma Gamma of the correction, 1 disables it.
+        @param brightness Global brightness, from 0 to 1.
+        @param rotation Clockwise rotation of the frames, one of @ref ROTATIONS.
+        @param flip Mirroring of the frames, one of @ref FLIPS.
+        @param dither Enable the ordered dithering to 3 bits per channel.
+        """
+        assert rotation in self.ROTATIONS, f"Unrecognised rotation: {rotation}."
+        assert flip in self.FLIPS, f"Unrecognised flip: {flip}."
+        ## Shape of the frames before the rotation, which the animation draws.
+        self.shape = (
+            (shape[1], shape[0], *shape[2:]) if rotation % 180 else tuple(shape)
+        )
+
+        # Index in the frame of every pixel of the panel.
+        remap = np.arange(np.prod(self.shape), dtype=np.intp).reshape(self.shape)
+        remap = np.rot90(remap, -rotation // 90)
+        if flip:
+            remap = np.flip(remap, axis=self.FLIPS.index(flip) % 2)
+        self.__remap = remap.ravel()
+
+        levels = brightness * 0xFF * (np.arange(0x100) / 0xFF) ** gamma
+        if dither:
+            thresholds = (np.arange(self.BAYER.size) + 0.5) / self.BAYER.size
+            quantized = np.floor(levels * 7 / 0xFF + thresholds[:, None])
+            self.__table = (np.clip(quantized, 0, 7).astype(np.uint8) << 5).ravel()
+            # Offset of every pixel of the panel in the table, from its Bayer threshold.
+            tiles = np.tile(self.BAYER, (-(-shape[0] // 4), -(-shape[1] // 4)))
+            self.__offset = np.repeat(
+                tiles[: shape[0], : shape[1]].ravel() << 8, int(np.prod(shape[2:]))
+            )
+        else:
+            self.__table = np.clip(np.rint(levels), 0, 0xFF).astype(np.uint8)
+            self.__offset = np.zeros(self.__remap.size, dtype=np.intp)
+
+        self.__values = np.empty(self.__remap.size, dtype=np.uint8)
+        self.__index = np.empty(self.__remap.size, dtype=np.intp)
+        self.__screen = np.empty(shape, dtype=np.uint8)
+
+    def apply(self, screen: np.ndarray) -> np.ndarray:
+        """! Post-process a frame.
+        @param screen The frame drawn by the animation, of shape @ref shape.
+        @return The frame for the panel, overwritten by the next call.
+        """
+        np.take(screen.ravel(), self.__remap, out=self.__values, mode="clip")
+        # Widen the values before adding the offsets, avoiding the buffered mixed type addition.
+        np.copyto(self.__index, self.__values)
+        np.add(self.__index, self.__offset, out=self.__index)
+        np.take(self.__table, self.__index, out=self.__screen.ravel(), mode="clip")
+        return self.__screen
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""! Shared data provider hub script."""
+from abc import ABC, abstractmethod
+from threading import Event, Lock, Thread, current_thread
+from time import monotonic
+from typing import Callable
+import logging
+
+
+class Provider(ABC):
+    """! Abstract data provider, such as a web API, a local sensor or a file.
+    A provider is refreshed by the @ref ProviderHub, which calls @ref update after every
+    @ref delay. The constructor must not block, the data is only obtained by @ref update.
+    """
+
+    @property
+    @abstractmethod
+    def delay(self) -> float:  # pragma: no cover
+        """! @pure Return the time until the next update.
+        @return Delay in seconds, 0 to update immediately.
+        """
+
+    @property
+    @abstractmethod
+    def revision(self) -> int:  # pragma: no cover
+        """! @pure Return the number of updates of the data, used to detect changes.
+        @return Update counter.
+        """
+
+    @abstractmethod
+    def update(self) -> bool:  # pragma: no cover
+        """! @pure Update the data.
+        @return State of the update operation: @c True if successful, @c False otherwise.
+        """
+
+    def stop(self):
+        """! Release the resources of the provider, called when it is no longer used."""
+
+
+class ProviderHub:
+    """! Process-wide hub sharing the data providers.
+    Subscriptions are deduplicated by provider class and parameters: all the subscribers of the same
+    key share one provider instance, refreshed by a single thread. The subscribers are called back
+    with the provider after each update changing the data. The thread is stopped and the provider
+    released when its last subscription is cancelled.
+
+    Each feed exposes the latency of the last update, the age of the last successful update and the
+    number of errors, for monitoring.
+    """
+
+    __feeds = {}
+    __lock = Lock()
+
+    # pylint: disable=too-many-instance-attributes
+    class Feed:
+        """! Provider instance shared by the subscribers of the same key, with its statistics."""
+
+        def __init__(self, key: tuple, provider: Provider):
+            """! Constructor.
+            @param key Provider class and parameters.
+            @param provider The provider instance.
+            """
+            self.key = key
+            self.provider = provider
+            ## Duration of the last update, in seconds.
+            self.latency = float("nan")
+            ## Number of successful updates.
+            self.updates = 0
+            ## Number of failed updates.
+            self.errors = 0
+            self.subscriptions = []
+            self.__stopped = Event()
+            self.__success = float("-inf")
+            self.__thread = Thread(target=self.__run, daemon=True)
+            self.__thread.start()
+
+        @property
+        def age(self) -> float:
+            """! Return the time since the last successful update.
+            @return Age in seconds, infinite if the provider was never updated successfully.
+            """
+            return monotonic() - self.__success
+
+        def __run(self):
+            while not self.__stopped.wait(self.provider.delay):
+                revision = self.provider.revision
+                start = monotonic()
+                try:
+                    success = self.provider.update()
+                except Exception as error:  # pylint: disable=broad-except
+                    logging.error("[%s] %s", self.key[0].__name__, error)
+                    success = False
+                self.latency = monotonic() - start
+                if success:
+                    self.__success = monotonic()
+                    self.updates += 1
+                else:
+                    self.errors += 1
+                logging.debug(
+                    "[%s] Latency %.3fs, age %.0fs, %d updates, %d errors",
+                    self.key[0].__name__,
+                    self.latency,
+                    self.age,
+                    self.updates,
+                    self.errors,
+                )
+
+                if self.provider.revision == revision:
+                    continue
+                for subscription in list(self.subscriptions):
+                    if subscription.callback is None:
+                        continue
+                    try:
+                        subscription.callback(self.provider)
+                    except Exception as error:  # pylint: disable=broad-except
+                        logging.error("[%s] %s", self.key[0].__name__, error)
+
+        def stop(self):
+            """! Stop the refresh thread and release the provider, once a running update is
+            complete.
+            """
+            self.__stopped.set()
+            # A subscriber cancelling from its callback runs on the refresh thread itself.
+            if current_thread() is not self.__thread:
+                self.__thread.join()
+            self.provider.stop()
+
+    class Subscription:
+        """! Subscription to a shared provider, returned by @ref subscribe."""
+
+        def __init__(self, feed: "ProviderHub.Feed", callback: Callable):
+            """! Constructor.
+            @param feed The shared feed.
+            @param callback Function called with the provider after each data change, or @c None.
+            """
+            self.feed = feed
+            self.callback = callback
+
+        @property
+        def provider(self) -> Provider:
+            """! Return the shared provider.
+            @return The provider instance.
+            """
+            return self.feed.provider
+
+        def cancel(self):
+            """! Stop the callbacks, the provider is released after the last subscription."""
+            ProviderHub.cancel(self)
+
+    @staticmethod
+    def subscribe(
+        provider: type, callback: Callable = None, **params: dict
+    ) -> Subscription:
+        """! Subscribe to a shared provider, creating and starting it on first use.
+        @param provider Provider class.
+        @param callback Function called from the refresh thread with the provider after each data
+        change, or @c None.
+        @param params Keyword arguments of the provider constructor, which must be hashable.
+        @return The subscription.
+        """
+        key = (provider, tuple(sorted(params.items())))
+        with ProviderHub.__lock:
+            feed = ProviderHub.__feeds.get(key)
+            if feed is None:
+                feed = ProviderHub.Feed(key, provider(**params))
+                ProviderHub.__feeds[key] = feed
+            subscription = ProviderHub.Subscription(feed, callback)
+            feed.subscriptions.append(subscription)
+        return subscription
+
+    @staticmethod
+    def cancel(subscription: Subscription):
+        """! Cancel a subscription, stopping its provider if it was the last one.
+        @param subscription The subscription returned by @ref subscribe.
+        """
+        with ProviderHub.__lock:
+            feed = subscription.feed
+            if subscription not in feed.subscriptions:
+                return
+            feed.subscriptions.remove(subscription)
+            if feed.subscriptions:
+                return
+            del ProviderHub.__feeds[feed.key]
+        # Waiting for a running update does not block the other subscriptions.
+        feed.stop()
+
+    @staticmethod
+    def feeds() -> list:
+        """! Return the running feeds, for monitoring.
+        @return List of the feeds.
+        """
+        with ProviderHub.__lock:
+            return list(ProviderHub.__feeds.values())
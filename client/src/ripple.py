@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""! Water ripple engine script."""
+import numpy as np
+
+
+# pylint: disable=too-many-instance-attributes
+class Ripple:
+    """! Water ripple engine, propagating the height of the water surface from frame to frame.
+    The height of every point is computed from its diagonal neighbours in the last frame and from
+    its own height in the frame before, then damped. The borders of the surface stay flat.
+
+    The two last frames are kept in two 32-bit floating point buffers, whose roles are swapped on
+    every step instead of copying them. All the computations are done in place into preallocated
+    buffers, so a step does not allocate any memory whatever the size of the surface.
+
+    The heights are mapped to colors through a palette of 256 colors, the heights out of the range
+    of the palette are saturated. By default the flat surface is black and the waves are blue,
+    whether they go up or down.
+
+    @sa https://stackoverflow.com/a/60337269
+    """
+
+    ## Height of the surface mapped to the first and last colors of the palette, in absolute value.
+    HEIGHT_RANGE = 2.0
+
+    def __init__(self, shape: tuple, damping: float = 0.9):
+        """! Constructor.
+        @param shape Surface shape: height and width, in pixels, at least 3x3.
+        @param damping Ratio of the wave height kept from one frame to the next.
+        """
+        assert min(shape[0:2]) >= 3, f"The surface is too small: {shape}."
+        self.__shape = tuple(shape[0:2])
+        self.__damping = np.float32(damping)
+        self.__current = np.zeros(self.__shape, dtype=np.float32)
+        self.__previous = np.zeros(self.__shape, dtype=np.float32)
+        self.__sum = np.empty((self.__shape[0] - 2, self.__shape[1] - 2), np.float32)
+        self.__scaled = np.empty(self.__shape, dtype=np.float32)
+        self.__index = np.empty(self.__shape, dtype=np.intp)
+        self.__scale = np.float32(128 / self.HEIGHT_RANGE)
+        ## Colors of the heights, from the lowest to the highest, in RGB.
+        self.palette = np.zeros((256, 3), dtype=np.uint8)
+        self.palette[:, 2] = np.minimum(np.abs(np.arange(256) - 128) * 2, 0xFF)
+
+    @property
+    def surface(self) -> np.ndarray:
+        """! Height of the surface in the last frame, read only.
+        @return Height image.
+        """
+        surface = self.__current.view()
+        surface.flags.writeable = False
+        return surface
+
+    def drop(self, positions: np.ndarray = None, count: int = 1, height: float = 20.0):
+        """! Drop water on the surface.
+        @param positions Positions of the drops as an array of rows and columns, random if @c None.
+        @param count Number of drops at random positions.
+        @param height Height of the drops.
+        """
+        if positions is None:
+            positions = np.random.randint(
+                1, np.subtract(self.__shape, 1), size=(count, 2)
+            )
+        positions = np.asarray(positions).reshape(-1, 2)
+        self.__current[positions[:, 0], positions[:, 1]] = height
+
+    def step(self):
+        """! Advance the surface by one frame."""
+        current, previous = self.__current, self.__previous
+        np.add(current[:-2, :-2], current[2:, :-2], out=self.__sum)
+        np.add(self.__sum, current[:-2, 2:], out=self.__sum)
+        np.add(self.__sum, current[2:, 2:], out=self.__sum)
+        np.multiply(self.__sum, np.float32(0.5), out=self.__sum)
+        # The frame before is replaced by the new frame.
+        inner = previous[1:-1, 1:-1]
+        np.subtract(self.__sum, inner, out=inner)
+        np.multiply(inner, self.__damping, out=inner)
+        self.__current, self.__previous = previous, current
+
+    def color(self, out: np.ndarray = None) -> np.ndarray:
+        """! Map the heights of the last frame to colors.
+        @param out RGB image in which the colors are written, allocated if @c None.
+        @return RGB image.
+        """
+        if out is None:
+            out = np.empty((*self.__shape, 3), dtype=np.uint8)
+        np.multiply(self.__current, self.__scale, out=self.__scaled)
+        np.add(self.__scaled, np.float32(128), out=self.__scaled)
+        np.clip(self.__scaled, 0, 255, out=self.__scaled)
+        np.copyto(self.__index, self.__scaled, casting="unsafe")
+        return np.take(self.palette, self.__index, axis=0, out=out, mode="clip")
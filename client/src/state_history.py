@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""! Board state history script."""
+from collections import deque
+
+
+class StateHistory:
+    """! Hashes of the last states of a board, to detect when it stalls.
+    A board repeating one of the remembered states stalls in a still state or an oscillator whose
+    period is shorter than the history. The hashes are kept in a ring buffer for their order and in
+    a set for constant time lookups.
+    """
+
+    def __init__(self, length: int):
+        """! Constructor.
+        @param length Number of states remembered, longer cycles are not detected.
+        """
+        self.__history = deque(maxlen=length)
+        self.__hashes = set()
+
+    def remember(self, state: bytes) -> bool:
+        """! Remember a state.
+        @param state Raw data of the state, for example from @c numpy.ndarray.tobytes.
+        @return True if the state was already remembered, in which case it is not added again.
+        """
+        state = hash(state)
+        if state in self.__hashes:
+            return True
+        if len(self.__history) == self.__history.maxlen:
+            self.__hashes.discard(self.__history[0])
+        self.__history.append(state)
+        self.__hashes.add(state)
+        return False
+
+    def clear(self):
+        """! Forget all the states."""
+        self.__history.clear()
+        self.__hashes.clear()
@@ -1,12 +1,81 @@
 #!/usr/bin/env python3
 """! Write text on a provided screen."""
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable
 import numpy as np
-from PIL import ImageFont, ImageDraw, Image
+from PIL import ImageFont
+from src.glyph_atlas import GlyphAtlas
+
+
+class LayoutCache:
+    """! Least recently used cache of wrapped text layouts.
+    A layout is the list of lines the text is broken into, each with its height in pixels. The
+    cache is safe to share between threads.
+    """
+
+    def __init__(self, size: int = 256):
+        """! Constructor.
+        @param size Maximum number of layouts kept, the least recently used one is evicted first.
+        """
+        self.__size = size
+        self.__layouts = OrderedDict()
+        self.__lock = Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, key: tuple, layout: Callable[[], tuple]) -> tuple:
+        """! Return a cached layout, computing and storing it when missing.
+        @param key Layout key: font path, font size, text, width and wrapping style.
+        @param layout Function computing the layout on a cache miss.
+        @return Tuple of the @c (line, height) pairs.
+        """
+        with self.__lock:
+            lines = self.__layouts.get(key)
+            if lines is not None:
+                self.__layouts.move_to_end(key)
+                self.__hits += 1
+                return lines
+            self.__misses += 1
+
+        lines = layout()
+        with self.__lock:
+            self.__layouts[key] = lines
+            while len(self.__layouts) > self.__size:
+                self.__layouts.popitem(last=False)
+        return lines
+
+    def clear(self):
+        """! Remove all the layouts and reset the counters."""
+        with self.__lock:
+            self.__layouts.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    @property
+    def hits(self) -> int:
+        """! Return the number of layouts found in the cache.
+        @return Number of cache hits.
+        """
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """! Return the number of layouts computed because they were not in the cache.
+        @return Number of cache misses.
+        """
+        return self.__misses
 
 
 # pylint: disable=too-few-public-methods
 class Text:
-    """! Draw text on a referenced screen."""
+    """! Draw text on a referenced screen.
+    The glyphs are pre-rasterized in a glyph atlas and drawn directly on the screen. Wrapped text
+    layouts are memoized in a layout cache shared by all instances, as animations typically write
+    the same strings on every frame.
+
+    @sa #client::src::glyph_atlas::GlyphAtlas
+    """
 
     ## Normal wrapping, using whitespaces and line breaks.
     WRAP_NORMAL = 0
@@ -15,12 +84,23 @@ class Text:
     ## No wrapping, text will overflow screen.
     WRAP_NONE = -1
 
+    ## Layout cache shared by all instances.
+    layouts = LayoutCache()
+
     def __init__(self, fontpath: str, fontsize: int):
         """! Constructor.
         @param fontpath Path to the font file.
         @param fontsize Font size.
         """
-        self.__font = ImageFont.truetype(fontpath, fontsize)
+        self.__font = (fontpath, fontsize)
+        self.__atlas = GlyphAtlas(ImageFont.truetype(fontpath, fontsize))
+
+    @property
+    def atlas(self) -> GlyphAtlas:
+        """! Return the glyph atlas of the font.
+        @return The glyph atlas.
+        """
+        return self.__atlas
 
     # pylint: disable=too-many-arguments
     def write(
@@ -38,15 +118,28 @@ class Text:
         @param offset Text offset from top left corner.
         @param wrap Wrapping style.
         """
-        screen_pil = Image.fromarray(screen)
-        image_draw = ImageDraw.Draw(screen_pil)
-
         assert wrap in [
             Text.WRAP_NORMAL,
             Text.WRAP_FORCE,
             Text.WRAP_NONE,
         ], f"Unrecogised wrap method: {wrap}."
 
+        if wrap is Text.WRAP_NONE:
+            self.__atlas.render(screen, text, color, offset)
+            return
+
+        width = screen.shape[1]
+        lines = Text.layouts.get(
+            (*self.__font, text, width, wrap),
+            lambda: self.__layout(text, width, wrap),
+        )
+
+        offset_y = 0
+        for line, height in lines:
+            self.__atlas.render(screen, line, color, (offset[0], offset[1] + offset_y))
+            offset_y += height
+
+    def __layout(self, text: str, width: int, wrap: int) -> tuple:
         text_multiline = []
         line = ""
         if wrap is Text.WRAP_NORMAL:
@@ -55,32 +148,23 @@ class Text:
                 temp = f"{line} {word}".strip()
 
                 # When the line is longer than the canvas width: split.
-                if image_draw.textsize(temp, font=self.__font)[0] > screen.shape[1]:
+                if self.__atlas.textsize(temp)[0] > width:
                     text_multiline.append(line)
                     line = word
                 else:
                     line = temp
 
             text_multiline.append(line)
-        elif wrap is Text.WRAP_FORCE:
+        else:
             # Fit text into the screen.
             # New line character is not accurate for line splitting (gap too large).
             for letter in text:
                 line += letter
 
-                if image_draw.textsize(line, font=self.__font)[0] > screen.shape[1]:
+                if self.__atlas.textsize(line)[0] > width:
                     text_multiline.append(line[:-1])
                     line = letter
 
             text_multiline.append(line)
-        else:
-            image_draw.text(offset, text, font=self.__font, fill=color)
-
-        offset_y = 0
-        for line in text_multiline:
-            image_draw.text(
-                (offset[0], offset[1] + offset_y), line, font=self.__font, fill=color
-            )
-            offset_y += image_draw.textsize(line, font=self.__font)[1]
 
-        screen[:] = np.array(screen_pil)
+        return tuple((line, self.__atlas.textsize(line)[1]) for line in text_multiline)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""! Text file provider script."""
+from time import time
+import logging
+import os
+from src.provider_hub import Provider
+
+
+class TextFile(Provider):
+    """! Provides the content of a local text file, reloaded when the file changes.
+    The file is polled by the provider hub: its modification time and size are checked at every
+    update, and it is only read again when they have changed. The revision is incremented when the
+    text itself has changed, for example to display a new Wi-Fi guest password written to the file
+    by another process.
+
+    The leading and trailing white spaces are removed from the text.
+
+    @sa #client::src::provider_hub::ProviderHub
+    """
+
+    def __init__(self, path: str, update_delay: float = 1.0):
+        """! Constructor.
+        @param path Path to the text file.
+        @param update_delay Time between checks of the file, in seconds.
+        """
+        self.__path = path
+        self.__update_delay = update_delay
+        self.__stat = None
+        self.__next = float("-inf")
+        self.__revision = 0
+        ## Text of the file, @c None until it has been read.
+        self.text = None
+
+    @property
+    def delay(self) -> float:
+        """! Return the time until the next check of the file.
+        @return Delay in seconds.
+        """
+        return max(self.__next - time(), 0)
+
+    @property
+    def revision(self) -> int:
+        """! Return the number of changes of the text.
+        @return Change counter.
+        """
+        return self.__revision
+
+    def update(self) -> bool:
+        """! Read the file again if it has changed.
+        @return State of the update operation: @c True if successful, @c False otherwise.
+        """
+        self.__next = time() + self.__update_delay
+        try:
+            stat = os.stat(self.__path)
+            if (stat.st_mtime_ns, stat.st_size) == self.__stat:
+                return True
+            with open(self.__path, encoding="utf-8") as file:
+                text = file.read().strip()
+        except (OSError, ValueError) as error:
+            logging.error("[%s] %s", self.__class__.__name__, error)
+            return False
+
+        self.__stat = (stat.st_mtime_ns, stat.st_size)
+        if text != self.text:
+            self.text = text
+            self.__revision += 1
+        return True
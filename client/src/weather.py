@@ -1,13 +1,17 @@
 #!/usr/bin/env python3
 """! Obtain weather information script."""
-from time import sleep
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+import json
 import logging
+import os
 import numpy as np
 import requests
+from src.provider_hub import Provider
 
 
-class Weather(Thread):
+# pylint: disable=too-many-instance-attributes
+class Weather(Provider):
     """! Fetches weather data from OpenWeatherMap API, when provided with a valid key.
 
     @pre This script requires one to have an account with OpenWeatherMap and provide the API key so
@@ -17,33 +21,60 @@ class Weather(Thread):
     API allows up to 60 calls/minute and 1 million calls/month, on the free plan. With a 5 minute
     interval these thresholds are never reached.
 
-    @note There are two separate calls: one for the weather and another for the air quality.
+    The instances are shared and updated in the background by the provider hub, the constructor
+    never waits for the API. The connections are kept open between updates and every call has a
+    timeout. When a call fails the last valid data is kept.
 
+    When a cache file is provided the last valid data is saved to it and loaded at start up, so the
+    animation shows it immediately. The data is only fetched again once the cache is older than its
+    time to live, restarts do not call the API more often than the update rate.
+
+    @note There are two separate calls: one for the weather and another for the air quality. Once
+    the coordinates of the location are known both calls are made concurrently.
+
+    @sa #client::src::provider_hub::ProviderHub
     @sa https://openweathermap.org
     @sa https://openweathermap.org/api/air-pollution
     """
 
-    __weather = []
-    __air_pollution = []
+    ## OpenWeatherMap API base URL.
+    URL = "https://api.openweathermap.org/data/2.5"
+    ## Connection and read timeouts of the API calls, in seconds.
+    TIMEOUT = (3.05, 10.0)
 
+    __weather = {}
+    __air_pollution = {}
+    __revision = 0
+    __fetched = float("-inf")
+
+    # pylint: disable=too-many-arguments
     def __init__(
         self,
         key: str,
         location: str,
         update_delay: int = 5 * 60,
+        cache: str = None,
+        url: str = URL,
     ):
         """! Constructor.
         @param key The OpenWeatherMap API key.
         @param location Location name, e.g. @c Tokyo.
-        @param update_delay Time between update requests, in seconds.
+        @param update_delay Time between update requests, in seconds, also the time to live of the
+        cached data.
+        @param cache Path to the cache file, or @c None to disable the cache.
+        @param url API base URL.
         """
-        super().__init__(target=self.__run, kwargs={"delay": update_delay}, daemon=True)
-
         self.__key = key
         self.__location = location
+        self.__cache = cache
+        self.__url = url
+        self.__update_delay = update_delay
+        self.__session = requests.Session()
+        self.__executor = ThreadPoolExecutor(max_workers=2)
 
-        if self.update():
-            self.start()
+        self.__load()
+        # Cached data is only fetched again once it has expired.
+        self.__next = self.__fetched + update_delay
 
         logging.debug("[%s] %s", self.__class__.__name__, self)
 
@@ -53,55 +84,122 @@ class Weather(Thread):
         """
         return f"{self.__weather}, {self.__air_pollution}"
 
-    def __run(self, **kwargs):
-        while True:
-            sleep(kwargs["delay"])
-            self.update()  # pragma: no cover
-
-    def update(self) -> bool:
-        """! Update weather and air pollution data.
-        @return State of the update operation: @c True if successful, @c False
-        otherwise.
+    @property
+    def delay(self) -> float:
+        """! Return the time until the next update.
+        @return Delay in seconds.
         """
-        success = True
-        url = (
-            "https://api.openweathermap.org/data/2.5/weather?q="
-            f"{self.__location}&units=metric&appid={self.__key}"
-        )
+        return max(self.__next - time(), 0)
+
+    def stop(self):
+        """! Close the connections."""
+        self.__executor.shutdown(wait=False)
+        self.__session.close()
+
+    def __get(self, endpoint: str, params: dict) -> dict:
+        # Return the JSON response, or None if the call failed.
         try:
-            req = requests.get(url)
-        except requests.exceptions.SSLError as error:  # pragma: no cover
-            success = False
+            req = self.__session.get(
+                f"{self.__url}/{endpoint}",
+                params={**params, "units": "metric", "appid": self.__key},
+                timeout=self.TIMEOUT,
+            )
+            data = req.json()
+        except (requests.exceptions.RequestException, ValueError) as error:
             logging.error("[%s] %s", self.__class__.__name__, error)
+            return None
 
-        self.__weather = req.json()
+        if not isinstance(data, dict):
+            logging.error("[%s] Unexpected response.", self.__class__.__name__)
+            return None
         if not req.ok:
-            success = False
             logging.warning(
-                "[%s] %s", self.__class__.__name__, self.__weather["message"]
+                "[%s] %s", self.__class__.__name__, data.get("message", req.reason)
             )
+            return None
+        return data
 
-        latitude = self.__weather["coord"]["lat"] if "coord" in self.__weather else 0
-        longitude = self.__weather["coord"]["lon"] if "coord" in self.__weather else 0
-
-        url = (
-            "https://api.openweathermap.org/data/2.5/air_pollution?lat="
-            f"{latitude}&lon={longitude}&units=metric&appid={self.__key}"
+    def update(self) -> bool:
+        """! Update weather and air pollution data.
+        @return State of the update operation: @c True if successful, @c False
+        otherwise.
+        """
+        self.__next = time() + self.__update_delay
+        coordinates = self.__weather.get("coord")
+        weather = self.__executor.submit(self.__get, "weather", {"q": self.__location})
+        if coordinates is None:
+            # The first call provides the coordinates of the location.
+            coordinates = (weather.result() or {}).get("coord")
+        air_pollution = (
+            self.__executor.submit(
+                self.__get,
+                "air_pollution",
+                {"lat": coordinates["lat"], "lon": coordinates["lon"]},
+            )
+            if coordinates is not None
+            else None
         )
+
+        weather = weather.result()
+        air_pollution = air_pollution.result() if air_pollution is not None else None
+        if weather is not None:
+            self.__weather = weather
+        if air_pollution is not None:
+            self.__air_pollution = air_pollution
+        if weather is None and air_pollution is None:
+            return False
+
+        self.__revision += 1
+        if weather is not None and air_pollution is not None:
+            self.__fetched = time()
+            self.__save()
+            return True
+        return False
+
+    def __load(self):
+        # Serve the cached data of the same location, however old it is.
+        if self.__cache is None:
+            return
         try:
-            req = requests.get(url)
-        except requests.exceptions.SSLError as error:  # pragma: no cover
-            success = False
+            with open(self.__cache, encoding="utf-8") as file:
+                cache = json.load(file)
+            if not isinstance(cache, dict) or cache.get("location") != self.__location:
+                return
+            weather, air_pollution = cache["weather"], cache["air_pollution"]
+            fetched = float(cache["time"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        if not isinstance(weather, dict) or not isinstance(air_pollution, dict):
+            return
+        self.__weather = weather
+        self.__air_pollution = air_pollution
+        self.__fetched = fetched
+        self.__revision += 1
+
+    def __save(self):
+        # Write to a temporary file first, so a crash never leaves a partial cache.
+        if self.__cache is None:
+            return
+        cache = {
+            "location": self.__location,
+            "time": self.__fetched,
+            "weather": self.__weather,
+            "air_pollution": self.__air_pollution,
+        }
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.__cache)), exist_ok=True)
+            with open(f"{self.__cache}.tmp", "w", encoding="utf-8") as file:
+                json.dump(cache, file)
+            os.replace(f"{self.__cache}.tmp", self.__cache)
+        except OSError as error:
             logging.error("[%s] %s", self.__class__.__name__, error)
 
-        self.__air_pollution = req.json()
-        if not req.ok:
-            success = False
-            logging.warning(
-                "[%s] %s", self.__class__.__name__, self.__air_pollution["message"]
-            )
-
-        return success
+    @property
+    def revision(self) -> int:
+        """! Return the number of updates of the weather data, used to detect changes.
+        @return Update counter.
+        """
+        return self.__revision
 
     @property
     def temperature(self) -> float:
@@ -1,10 +1,52 @@
 #!/usr/bin/env python3
 """! Test all animations."""
-from os import getenv
+# pylint: disable=too-many-lines
+from os import getenv, path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import monotonic, sleep
+import json
 import subprocess
+import timeit
+from typing import Callable
+import tracemalloc
 import logging
+import threading
+import pendulum
+import pytest
+import cv2 as cv
+import numpy as np
+from PIL import ImageFont, ImageDraw, Image
+from src.animate import Animate
 from src.localtime import Localtime
-from animation.word_clock import English, Japanese
+from src.clock import Clock
+from src.glyph_atlas import GlyphAtlas
+from src.text import Text, LayoutCache
+from src.font_registry import FontRegistry
+from src.weather import Weather
+from src.provider_hub import Provider, ProviderHub
+from src.bit_life import BitLife
+from src.cellular_automaton import CellularAutomaton
+from src.ripple import Ripple
+from src.particles import Particles
+from src.frame_cache import FrameCache
+from src.post_process import PostProcess
+from src.display import Display
+from animation.word_clock import English, Japanese, WordClock
+from animation.marquee import Marquee
+from animation.game_of_life import GameOfLifeColor, GameOfLifeFast
+from animation.rgb import (
+    GrowingTree,
+    HilbertCurve,
+    HilbertCurveGenerator,
+    Mandelbrot,
+    MandelbrotZoom,
+)
+from animation.analog_clock import AnalogClock
+from animation.automaton import Automaton
+from animation.fire import Fire
+from animation.matrix import Matrix
+from animation.qr_code import QRCode
+from animation.compositor import Compositor
 
 
 def test_analog_clock():
@@ -14,6 +56,41 @@ def test_analog_clock():
     )
 
 
+def test_analog_clock_hands():
+    """! Test the cached analog clock hands against drawing them directly."""
+    for shape, steps in [((32, 32, 3), 3600), ((16, 40, 3), 360)]:
+        center = (shape[1] // 2, shape[0] // 2)
+        hand_size = max(shape[0:2]) * 100
+        for _ in range(50):
+            fractions = np.random.randint(steps, size=3) / steps
+            expected = np.zeros(shape, dtype=np.uint8)
+            for channel, fraction in enumerate(fractions):
+                angle = fraction * 2 * np.pi - np.pi / 2
+                end = (
+                    int(hand_size * np.cos(angle) + center[0]),
+                    int(hand_size * np.sin(angle) + center[1]),
+                )
+                hand = cv.line(
+                    np.zeros(shape, dtype=np.uint8),
+                    center,
+                    end,
+                    color=(0xFF, 0xFF, 0xFF),
+                    lineType=cv.LINE_AA,
+                )
+                expected[:, :, channel] = hand[:, :, channel]
+            cv.line(expected, center, center, color=(0, 0, 0), thickness=3)
+            for _ in range(2):
+                clock = AnalogClock(shape, timezone="UTC", steps=steps)
+                assert np.array_equal(clock.render(fractions), expected)
+
+    # Only the masks of the shown steps are allocated.
+    tracemalloc.start()
+    AnalogClock((128, 128, 3), timezone="UTC").frame()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < 3 * 128 * 128 * 8
+
+
 def test_openweathermap_invalid():
     """! Test calling OpenWeatherMap API with invalid key."""
     subprocess.run(
@@ -54,6 +131,189 @@ def test_openweathermap_valid():
     )
 
 
+class WeatherStub(BaseHTTPRequestHandler):
+    """! Local OpenWeatherMap API stub, answering after a delay."""
+
+    delay = 0.5
+    requests = []
+    responses = {
+        "/weather": (
+            200,
+            {
+                "coord": {"lat": 35.7, "lon": 139.7},
+                "main": {"temp": 21.5, "humidity": 40},
+            },
+        ),
+        "/air_pollution": (200, {"list": [{"main": {"aqi": 2}}]}),
+    }
+
+    # pylint: disable=invalid-name
+    def do_GET(self):
+        """! Answer a GET request with the stub response of the endpoint."""
+        endpoint = self.path.split("?")[0]
+        WeatherStub.requests.append((endpoint, monotonic()))
+        sleep(WeatherStub.delay)
+        status, data = WeatherStub.responses[endpoint]
+        self.send_response(status)
+        self.end_headers()
+        self.wfile.write(json.dumps(data).encode())
+
+    def log_message(self, *args: list):
+        """! Silence the request logs."""
+
+
+def wait_revision(provider: Provider, revision: int):
+    """! Wait until the provider data has been updated, for at most 5 seconds."""
+    deadline = monotonic() + 5
+    while provider.revision < revision and monotonic() < deadline:
+        sleep(0.01)
+    assert provider.revision >= revision
+
+
+def test_weather_cache(tmp_path):
+    """! Test fetching the weather data in the background, and caching it."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WeatherStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    cache = str(tmp_path / "weather.json")
+    responses = dict(WeatherStub.responses)
+    try:
+        # The data is fetched in the background.
+        start = monotonic()
+        subscription = ProviderHub.subscribe(
+            Weather, key="key", location="Tokyo", cache=cache, url=url
+        )
+        weather = subscription.provider
+        assert monotonic() - start < WeatherStub.delay
+        assert np.isnan(weather.temperature) and weather.aqi_text == "N/A"
+        wait_revision(weather, 1)
+        assert (weather.temperature, weather.humidity, weather.aqi) == (21.5, 40, 2)
+        subscription.cancel()
+        assert path.isfile(cache)
+
+        # Fresh cached data is served immediately, without calling the API.
+        WeatherStub.requests.clear()
+        weather = Weather("key", "Tokyo", 3600, cache, url)
+        assert (weather.temperature, weather.aqi) == (21.5, 2)
+        assert weather.delay > 3500
+
+        # With known coordinates both calls are concurrent. Failed calls keep the last valid data.
+        weather.update()
+        assert len(WeatherStub.requests) == 2
+        assert (
+            abs(WeatherStub.requests[0][1] - WeatherStub.requests[1][1])
+            < WeatherStub.delay
+        )
+        WeatherStub.responses["/air_pollution"] = (401, {"message": "Invalid API key."})
+        assert not weather.update()
+        assert (weather.temperature, weather.aqi) == (21.5, 2)
+        WeatherStub.responses["/air_pollution"] = (
+            200,
+            {"list": [{"main": {"aqi": 3}}]},
+        )
+        weather.stop()
+
+        # Stale cached data is served, then revalidated. A different location ignores the cache.
+        weather = Weather("key", "Tokyo", 0.1, cache, url)
+        assert weather.aqi == 2
+        sleep(0.1)
+        assert weather.delay == 0
+        assert weather.update() and weather.aqi == 3
+        weather.stop()
+        weather = Weather("key", "Paris", 3600, cache, "http://127.0.0.1:1")
+        assert np.isnan(weather.temperature)
+        assert not weather.update()
+        weather.stop()
+
+        # Invalid cache files and responses are ignored.
+        for content in [
+            "[]",
+            '{"location": "Tokyo"}',
+            '{"location": "Tokyo", "weather": {}, "air_pollution": {}, "time": []}',
+            '{"location": "Tokyo", "weather": [], "air_pollution": {}, "time": 0}',
+        ]:
+            with open(cache, "w", encoding="utf-8") as file:
+                file.write(content)
+            weather = Weather("key", "Tokyo", 3600, cache, url)
+            assert np.isnan(weather.temperature) and weather.revision == 0
+            weather.stop()
+        WeatherStub.responses["/weather"] = (200, [])
+        weather = Weather("key", "Tokyo", 3600, None, url)
+        assert not weather.update()
+        weather.stop()
+    finally:
+        WeatherStub.responses = responses
+        server.shutdown()
+
+
+class CounterProvider(Provider):
+    """! Provider counting its updates, failing every other update when asked to."""
+
+    instances = 0
+
+    def __init__(self, name: str, flaky: bool = False):
+        """! Constructor.
+        @param name Counter name.
+        @param flaky Fail every other update.
+        """
+        CounterProvider.instances += 1
+        self.name = name
+        self.flaky = flaky
+        self.count = 0
+        self.stopped = False
+
+    @property
+    def delay(self) -> float:
+        """! Update every 10 ms."""
+        return 0.01
+
+    @property
+    def revision(self) -> int:
+        """! Return the update counter."""
+        return self.count // 2 if self.flaky else self.count
+
+    def update(self) -> bool:
+        """! Count the update."""
+        self.count += 1
+        if self.flaky and self.count % 2:
+            raise RuntimeError("Flaky update.")
+        return True
+
+    def stop(self):
+        """! Mark the provider stopped."""
+        self.stopped = True
+
+
+def test_provider_hub():
+    """! Test sharing providers between subscribers."""
+    pushed = []
+    first = ProviderHub.subscribe(CounterProvider, pushed.append, name="a")
+    second = ProviderHub.subscribe(CounterProvider, name="a")
+    other = ProviderHub.subscribe(CounterProvider, name="b", flaky=True)
+    assert first.provider is second.provider
+    assert first.feed in ProviderHub.feeds() and other.feed in ProviderHub.feeds()
+    assert CounterProvider.instances == 2
+
+    wait_revision(first.provider, 3)
+    wait_revision(other.provider, 3)
+    assert pushed[0] is first.provider
+    assert first.feed.errors == 0 and first.feed.updates >= 3
+    assert other.feed.errors >= 3 and other.feed.updates >= 3
+    assert first.feed.age < 1 and first.feed.latency < 1
+
+    # The provider is stopped after its last subscription.
+    first.cancel()
+    assert not first.provider.stopped
+    second.cancel()
+    other.cancel()
+    assert first.provider.stopped and other.provider.stopped
+    assert not ProviderHub.feeds()
+    # The refresh threads are stopped before the providers.
+    count = first.provider.count
+    sleep(0.05)
+    assert first.provider.count == count
+
+
 def test_fire_16():
     """! Test fire animation with a 16-pixel high matrix."""
     subprocess.run(["client/main.py", "fire.Fire", "-y", "16", "save", "2"], check=True)
@@ -66,6 +326,46 @@ def test_fire():
     )
 
 
+def test_fire_palettes():
+    """! Test fire palettes, and that drawing a frame does not allocate arrays."""
+    for palette in Fire.PALETTES:
+        animation = Fire((16, 24, 3), palette=palette)
+        for _ in range(20):
+            screen = next(animation.draw())
+        colors = {tuple(color) for color in Fire.palette(palette)}
+        assert {tuple(color) for color in screen.reshape(-1, 3)} <= colors
+        assert len(np.unique(screen.reshape(-1, 3), axis=0)) > 8
+        assert screen.flags.c_contiguous
+
+    tracemalloc.start()
+    for _ in range(10):
+        next(animation.draw())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < 16 * 24 * 8
+
+
+def test_fire_benchmark():
+    """! Measure the fire against the previous version, allocating arrays on every frame.
+    The timings are only logged, as they depend on the load of the machine. That drawing a frame
+    does not allocate is tested by test_fire_palettes.
+    """
+
+    def draw(fire: np.ndarray) -> np.ndarray:
+        fire[-1, :] = np.random.randint(0xFF >> 1, 0xFF, size=fire.shape[1])
+        decay = np.random.randint(fire.shape[0] / 1.2, size=fire.shape)
+        fire[:-1] = np.clip(fire[1:] - decay[1:], 0, 0xFF)
+        return cv.applyColorMap(fire, cv.COLORMAP_HOT)[:, :, ::-1]
+
+    animation = Fire((32, 32, 3))
+    fire = np.zeros((32, 32), dtype=np.uint8)
+    timings = [
+        min(timeit.repeat(function, number=100, repeat=5))
+        for function in [lambda: next(animation.draw()), lambda: draw(fire)]
+    ]
+    logging.info("Fire %.0fus, previous version %.0fus", *np.array(timings) * 1e4)
+
+
 def test_game_of_life_color():
     """! Test game of life (color) animation."""
     subprocess.run(
@@ -89,6 +389,178 @@ def test_game_of_life_fast():
     )
 
 
+def test_game_of_life_benchmark():
+    """! Test the color game of life against the per-cell version, and measure it against the
+    fast one. The timings are only logged, as they depend on the load of the machine.
+    """
+
+    def draw(screen: np.ndarray) -> tuple:
+        # The per-cell version, returning the next screen and the mutated cells.
+        new_status = np.zeros_like(screen)
+        mutated = np.zeros(screen.shape[0:2], dtype=bool)
+        for roll_y in range(0, screen.shape[0]):
+            rolled_y = np.roll(screen, -roll_y + 1, axis=0)
+            for roll_x in range(0, screen.shape[1]):
+                neighbours = np.roll(rolled_y, -roll_x + 1, axis=1)[0:3, 0:3]
+                neighbours[1, 1, :] = 0
+                neighbours_count = np.sum(np.any(neighbours, axis=-1))
+                if np.any(screen[roll_y, roll_x]):
+                    if 2 <= neighbours_count <= 3:
+                        new_status[roll_y, roll_x] = screen[roll_y, roll_x]
+                elif neighbours_count == 3:
+                    parents = neighbours[np.any(neighbours > 0, axis=-1)]
+                    mutated[roll_y, roll_x] = np.std(parents, axis=0).max() < 1
+                    new_status[roll_y, roll_x] = parents.mean(axis=0, dtype=np.uint8)
+        return new_status, mutated
+
+    animation = GameOfLifeColor((32, 32, 3))
+    screen = next(animation.draw()).copy()
+    for _ in range(5):
+        expected, mutated = draw(screen)
+        screen = next(animation.draw()).copy()
+        # The mutated cells take random colors.
+        assert np.array_equal(screen[~mutated], expected[~mutated])
+
+    timings = [
+        min(timeit.repeat(lambda a=animation: next(a.draw()), number=100, repeat=5))
+        for animation in [GameOfLifeColor((32, 32, 3)), GameOfLifeFast((32, 32, 3))]
+    ]
+    logging.info("Game of life color %.0fus, fast %.0fus", *np.array(timings) * 1e4)
+
+
+def test_game_of_life_packed():
+    """! Test game of life (packed) animation."""
+    subprocess.run(
+        [
+            "client/main.py",
+            "game_of_life.GameOfLifePacked",
+            "-r",
+            "10000",
+            "save",
+            "100",
+        ],
+        check=True,
+    )
+
+
+def test_bit_life():
+    """! Test the bit-packed game of life against a reference, and its stall detection."""
+    for shape in [(32, 32), (7, 100), (5, 64), (3, 1)]:
+        life = BitLife(shape)
+        cells = life.cells()
+        for _ in range(20):
+            neighbours = sum(
+                np.roll(cells, (roll_y, roll_x), axis=(0, 1)).astype(int)
+                for roll_y in [-1, 0, 1]
+                for roll_x in [-1, 0, 1]
+                if roll_y or roll_x
+            )
+            cells = (neighbours == 3) | cells & (neighbours == 2)
+            if life.step():
+                break
+            assert np.array_equal(life.cells(), cells)
+
+    # A blinker is detected after one period.
+    cells = np.zeros((32, 32), dtype=bool)
+    cells[5, 5:8] = True
+    life = BitLife((32, 32))
+    life.seed(cells)
+    assert not life.step() and life.step() and life.reseeds == 1
+
+    # A glider crossing the word boundaries comes back after 4 times the board width.
+    cells = np.zeros((8, 72), dtype=bool)
+    cells[0, 1] = cells[1, 2] = True
+    cells[2, 0:3] = True
+    life = BitLife((8, 72), history=1000)
+    life.seed(cells)
+    generations = 0
+    while not life.step():
+        generations += 1
+    assert generations + 1 == 4 * 72
+
+
+def test_automaton():
+    """! Test cellular automata animations."""
+    for animation in ["Automaton", "BriansBrain", "Wireworld"]:
+        subprocess.run(
+            [
+                "client/main.py",
+                f"automaton.{animation}",
+                "--rule",
+                "B36/S23",
+                "-r",
+                "10000",
+                "save",
+                "100",
+            ],
+            check=True,
+        )
+
+
+def test_automaton_reseed():
+    """! Test reseeding a cellular automaton animation when its board stops changing."""
+    # All the cells survive and none is born: the board is static from the start.
+    animation = Automaton((32, 32, 3), rule="B/S012345678")
+    frames = [next(animation.draw()).copy() for _ in range(3)]
+    assert not np.array_equal(frames[0], frames[1])
+    assert not np.array_equal(frames[1], frames[2])
+
+    # pylint: disable=too-few-public-methods
+    class Blinkers(Automaton):
+        """! Automaton seeded with blinkers on the first seed, counting the seeds."""
+
+        seeds = 0
+
+        def seed(self):
+            self.seeds += 1
+            if self.seeds > 1:
+                super().seed()
+                return
+            states = np.zeros((32, 32), dtype=np.uint8)
+            for offset in [-1, 0, 1]:
+                states[4 + offset : 28 : 6, 4:28:6] = 1
+            self._automaton.seed(states)
+
+    # The blinkers oscillate with a period of 2: both phases are shown, then the board is seeded
+    # again.
+    animation = Blinkers((32, 32, 3))
+    frames = [next(animation.draw()).copy() for _ in range(3)]
+    assert np.count_nonzero(np.any(frames[0], axis=-1)) == 16 * 3
+    assert np.count_nonzero(np.any(frames[1], axis=-1)) == 16 * 3
+    assert animation.seeds == 2
+    assert not np.array_equal(frames[0], frames[2])
+
+
+def test_cellular_automaton():
+    """! Test the cellular automaton rules."""
+    life = BitLife((16, 20))
+    automaton = CellularAutomaton(CellularAutomaton.LIFE, (16, 20))
+    automaton.seed(life.cells())
+    for states in automaton.step(10):
+        life.step()
+        assert np.array_equal(states.astype(bool), life.cells())
+
+    # Brian's Brain: firing cells are refractory, then ready, and two firing cells give birth.
+    automaton = CellularAutomaton(CellularAutomaton.BRIANS_BRAIN, (6, 6))
+    states = np.zeros((6, 6), dtype=np.uint8)
+    states[2, 2:4] = 1
+    automaton.seed(states)
+    generations = automaton.step(2)
+    assert np.array_equal(
+        generations[0][1:4, 1:5], [[0, 1, 1, 0], [0, 2, 2, 0], [0, 1, 1, 0]]
+    )
+    assert generations[1][2, 2] == 0
+    assert automaton.color(generations).shape == (2, 6, 6, 3)
+
+    # Wireworld: an electron runs along a wire.
+    automaton = CellularAutomaton(CellularAutomaton.WIREWORLD, (3, 8))
+    states = np.zeros((3, 8), dtype=np.uint8)
+    states[1, 1:7] = CellularAutomaton.CONDUCTOR
+    states[1, 1:3] = [CellularAutomaton.TAIL, CellularAutomaton.HEAD]
+    automaton.seed(states)
+    assert np.array_equal(automaton.step(3)[-1][1], [0, 3, 3, 3, 2, 1, 3, 0])
+
+
 def test_water():
     """! Test water animation."""
     subprocess.run(
@@ -96,6 +568,47 @@ def test_water():
     )
 
 
+def test_ripple():
+    """! Test the ripple engine against a reference, its color saturation and its allocations."""
+    ripple = Ripple((20, 37))
+    ripple.drop([[5, 6], [10, 30]])
+    water = np.zeros((2, 20, 37))
+    water[0, [5, 10], [6, 30]] = 20.0
+    for _ in range(30):
+        ripple.step()
+        water[1, 1:-1, 1:-1] = (
+            (
+                water[0, :-2, :-2]
+                + water[0, 2:, :-2]
+                + water[0, :-2, 2:]
+                + water[0, 2:, 2:]
+            )
+            / 2
+            - water[1, 1:-1, 1:-1]
+        ) * 0.9
+        water = water[::-1]
+        assert np.allclose(ripple.surface, water[0], atol=1e-3)
+
+    # Heights out of the palette range are saturated instead of wrapping around.
+    ripple = Ripple((3, 3))
+    ripple.drop([1, 1], height=-1000.0)
+    assert np.array_equal(ripple.color()[1, 1], ripple.palette[0])
+
+    # A step only allocates small temporary buffers, whatever the size of the surface.
+    ripple = Ripple((256, 512))
+    screen = np.zeros((256, 512, 3), dtype=np.uint8)
+    ripple.drop(count=64)
+    ripple.step()
+    ripple.color(out=screen)
+    tracemalloc.start()
+    for _ in range(10):
+        ripple.step()
+        ripple.color(out=screen)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < 256 * 512
+
+
 def test_word_clock_english():
     """! Test word clock (English) animation."""
     localtime = Localtime(update_rate=0)
@@ -130,6 +643,41 @@ def test_word_clock_japanese():
     subprocess.run(["client/main.py", "word_clock.Japanese", "save", "1"], check=True)
 
 
+def test_word_clock_frame_cache():
+    """! Test the word clock frames precomputation, memory budget and eviction."""
+    frames = FrameCache(budget=10 * 32 * 32 * 3)
+    WordClock.frames, frames_default = frames, WordClock.frames
+    try:
+        localtime = Localtime(timezone="GMT")
+        word_clock = English((32, 32, 3), timezone="GMT", precompute=True)
+        word_clock.precomputation.join(5)
+        assert not word_clock.precomputation.is_alive()
+        # The precomputation stops at the budget, from the current minute on.
+        assert frames.nbytes == frames.budget and frames.misses == 0
+
+        # The minute may change while drawing, the next minutes are cached as well.
+        texts = [word_clock.get_time(localtime)]
+        screen = next(word_clock.draw())
+        texts.append(word_clock.get_time(localtime))
+        assert (frames.hits, frames.misses) == (1, 0)
+        expected = []
+        for text in texts:
+            expected.append(np.zeros((32, 32, 3), dtype=np.uint8))
+            Text("client/font/small_5x3.ttf", 8).write(expected[-1], text)
+        assert any(np.array_equal(screen, frame) for frame in expected)
+
+        # The least recently used frame is evicted first.
+        frames.clear()
+        for text in ["a", "b", "c"]:
+            frames.get((text,), lambda: np.zeros((32, 32, 3), dtype=np.uint8))
+        frames.get(("a",), lambda: None)
+        frames.put(("x",), np.zeros((32, 32 * 8, 3), dtype=np.uint8))
+        assert ("a",) in frames and ("b",) not in frames and ("c",) in frames
+        assert frames.nbytes == 10 * 32 * 32 * 3
+    finally:
+        WordClock.frames = frames_default
+
+
 def test_qr_code():
     """! Test QR code animation."""
     subprocess.run(
@@ -137,6 +685,47 @@ def test_qr_code():
     )
 
 
+def wait_frame(animation: Animate, changed: Callable[[np.ndarray], bool]) -> np.ndarray:
+    """! Wait until the frame of the animation has changed, for at most 5 seconds."""
+    deadline = monotonic() + 5
+    while not changed(animation.frame()) and monotonic() < deadline:
+        sleep(0.01)
+    assert changed(animation.frame())
+    return animation.frame()
+
+
+def test_qr_code_text_file(tmp_path):
+    """! Test updating the QR code from a text file, and the error correction levels."""
+    assert len(QRCode.encode("WIFI:S:guest;P:1234;;", "L")) < len(
+        QRCode.encode("WIFI:S:guest;P:1234;;", "H")
+    )
+
+    text_file = tmp_path / "guest.txt"
+    text_file.write_text("WIFI:S:guest;P:first;;\n")
+    animation = QRCode((32, 32, 3), text_file=str(text_file), error_correction="Q")
+    expected = np.zeros((32, 32, 3), dtype=np.uint8)
+    modules = QRCode.encode("WIFI:S:guest;P:first;;", "Q")
+    size = len(modules)
+    offset = (32 - size) // 2
+    expected[offset : offset + size, offset : offset + size][modules] = 0xFF
+    wait_frame(animation, lambda frame: np.array_equal(frame, expected))
+
+    # Another animation on the running text file shows the current text right away.
+    assert np.array_equal(
+        QRCode((32, 32, 3), text_file=str(text_file), error_correction="Q").frame(),
+        expected,
+    )
+
+    # A new text is shown without restarting, a text too long is ignored.
+    text_file.write_text("WIFI:S:guest;P:second;;")
+    screen = wait_frame(animation, lambda frame: not np.array_equal(frame, expected))
+    for text in ["x" * 1000, "x" * 10000]:
+        text_file.write_text(text)
+        sleep(1.5)
+        assert np.array_equal(animation.frame(), screen)
+        assert not animation.changed()
+
+
 def test_growing_tree():
     """! Test the growing tree animation."""
     subprocess.run(
@@ -144,6 +733,62 @@ def test_growing_tree():
     )
 
 
+def test_growing_tree_maze(monkeypatch):
+    """! Test the growing tree policies, on screens too large for a recursive traversal."""
+    for policy in GrowingTree.POLICIES:
+        animation = GrowingTree((64, 160, 3), policy=policy)
+        # Every cell but the first one is carved by a step.
+        steps = 0
+        while animation.step():
+            steps += 1
+        assert steps == 64 * 160 - 1
+
+    # When the mixed policy selects the newest cell, the maze grows next to the newest cell with
+    # unvisited neighbours, as a depth-first traversal, even after removing random cells.
+    calls = []
+    monkeypatch.setattr(
+        np.random,
+        "random",
+        lambda: 1.0 if calls.append(None) or len(calls) % 4 else 0.0,
+    )
+    animation = GrowingTree((16, 24, 3), policy="mixed")
+    steps = []
+    screen = np.zeros((16, 24), dtype=bool)
+    for _ in range(16 * 24 - 1):
+        first = len(calls)
+        previous, screen = screen, np.any(next(animation.draw()), axis=-1)
+        # The step only selected the newest cells.
+        newest = all((call + 1) % 4 for call in range(first, len(calls)))
+        steps.append((tuple(np.argwhere(screen & ~previous)[0]), newest))
+    # The first cell has the black color at the start of the Hilbert curve.
+    visited = ~screen
+    carved = [tuple(np.argwhere(visited)[0])]
+    for cell, newest in steps:
+        if newest:
+            parent = next(
+                (pos_y, pos_x)
+                for pos_y, pos_x in reversed(carved)
+                if any(
+                    0 <= pos_y + d_y < 16
+                    and 0 <= pos_x + d_x < 24
+                    and not visited[pos_y + d_y, pos_x + d_x]
+                    for d_y, d_x in [(-1, 0), (1, 0), (0, -1), (0, 1)]
+                )
+            )
+            assert abs(cell[0] - parent[0]) + abs(cell[1] - parent[1]) == 1
+        visited[cell] = True
+        carved.append(cell)
+
+    # The last frame shows the complete maze, the next one starts again.
+    animation = GrowingTree((8, 12, 3), cells_per_frame=5)
+    for _ in range(-(-(8 * 12 - 1) // 5)):
+        screen = next(animation.draw()).copy()
+    assert not animation.step()
+    assert np.count_nonzero(np.any(next(animation.draw()), axis=-1)) <= 1
+    # The first cell has the black color at the start of the Hilbert curve.
+    assert np.count_nonzero(np.any(screen, axis=-1)) == 8 * 12 - 1
+
+
 def test_mandelbrot():
     """! Test Mandelbrot animation."""
     subprocess.run(
@@ -151,6 +796,44 @@ def test_mandelbrot():
     )
 
 
+def test_mandelbrot_zoom():
+    """! Test Mandelbrot deep zoom animation."""
+    subprocess.run(
+        ["client/main.py", "rgb.MandelbrotZoom", "-r", "10000", "save", "48"],
+        check=True,
+    )
+
+
+def test_mandelbrot_zoom_keyframes():
+    """! Test reusing the samples of the previous Mandelbrot zoom keyframe, and the depth."""
+    for shape in [(32, 32, 3), (16, 40, 3)]:
+        animation = MandelbrotZoom(shape)
+        keyframe = animation.render(0)
+        for level in range(1, 4):
+            keyframe = animation.render(level, keyframe)
+            assert np.array_equal(keyframe, animation.render(level))
+        # The 64-bit floating point precision allows a bit more than 40 zoom levels.
+        assert 38 < animation.depth < 46
+
+
+def test_mandelbrot_incremental():
+    """! Test the incremental Mandelbrot iterations against a computation from scratch."""
+    animation = Mandelbrot((24, 20, 3))
+    for _ in range(40):
+        screen = next(animation.draw())
+
+    grid = np.add.outer(1j * np.linspace(-1.5, 1.5, 24), np.linspace(-2, 1, 20))
+    iterations = np.zeros(grid.shape, dtype=np.uint16)
+    z_grid = np.zeros_like(grid)
+    todo = np.ones(grid.shape, dtype=bool)
+    for iteration in range(40):
+        z_grid[todo] = z_grid[todo] ** 2 + grid[todo]
+        escaped = todo & (z_grid.real**2 + z_grid.imag**2 > 4)
+        iterations[escaped] = iteration
+        todo &= ~escaped
+    assert np.array_equal(screen, HilbertCurveGenerator(3, 3).get(iterations) << 5)
+
+
 def test_hilbert():
     """! Test Hilbert curve animation."""
     subprocess.run(
@@ -159,6 +842,34 @@ def test_hilbert():
     )
 
 
+def test_hilbert_shapes():
+    """! Test Hilbert curve animation on screens which are not squares of a power of two."""
+    for shape in [(32, 64, 3), (64, 32, 3), (20, 24, 3)]:
+        animation = HilbertCurve(shape, hilbert_cache="")
+        for _ in range(shape[0] * shape[1]):
+            screen = next(animation.draw())
+        # Every 512th pixel has the black color at the start of the Hilbert curve.
+        assert np.count_nonzero(np.any(screen, axis=-1)) == shape[0] * shape[1] - len(
+            range(0, shape[0] * shape[1], 512)
+        )
+
+
+def test_hilbert_cache(tmp_path, monkeypatch):
+    """! Test the shared Hilbert curve tables and their disk cache."""
+    # Start without shared tables, the tables of the other tests are restored afterwards.
+    monkeypatch.setattr(HilbertCurveGenerator, "_HilbertCurveGenerator__tables", {})
+    table = HilbertCurveGenerator.table(2, 4, cache=str(tmp_path))
+    assert table is HilbertCurveGenerator.table(2, 4)
+    assert not table.flags.writeable
+    assert np.array_equal(np.load(tmp_path / "hilbert_2_4.npy"), table)
+
+    # The points of a 2:1 screen form a continuous curve.
+    for shape in [(8, 16), (16, 8)]:
+        points = HilbertCurveGenerator.table(2, 4, shape=shape)
+        assert len(points) == 8 * 16 and np.all(points < shape)
+        assert np.all(np.abs(np.diff(points.astype(int), axis=0)).sum(axis=1) == 1)
+
+
 def test_snow():
     """! Test snow animation."""
     subprocess.run(
@@ -166,6 +877,43 @@ def test_snow():
     )
 
 
+def test_particles():
+    """! Test the particle layers, wind, rasterization and accumulation."""
+    particles = Particles((24, 40), 500, wind=0.5)
+    particles.y[:] = np.random.uniform(0, 20, 500)
+    x_start, y_start = particles.x.copy(), particles.y.copy()
+    particles.step()
+    depth = (particles.layer + 1) / 3
+    assert np.allclose(particles.y - y_start, particles.velocity)
+    assert np.allclose((particles.x - x_start) % 40, 0.5 * depth)
+    # Far layers are slower and dimmer.
+    assert np.all(particles.velocity[particles.layer == 0] < 0.5)
+    assert np.all(particles.brightness[particles.layer == 0] < 0x80)
+
+    # Particles on the same pixel add up, and saturate.
+    image = particles.rasterize()
+    rows, columns = particles.y.astype(int), particles.x.astype(int)
+    expected = np.zeros((24, 40))
+    np.add.at(expected, (rows, columns), particles.brightness)
+    assert np.array_equal(image, np.minimum(expected, 0xFF).astype(np.uint8))
+    screen = np.zeros((24, 40, 3), dtype=np.uint8)
+    assert np.array_equal(particles.rasterize(out=screen)[..., 2], image)
+
+    # The pile grows up to a quarter of the height, then melts.
+    particles = Particles((16, 8), 100, accumulation=1.0)
+    heights = []
+    for _ in range(2000):
+        particles.step()
+        heights.append(particles.ground.max())
+    peak = int(np.argmax(heights))
+    assert heights[peak] >= 4 and min(heights[peak:]) == 0
+
+    # The full pixels of the pile are drawn.
+    particles = Particles((16, 8), 1)
+    particles.ground[:] = 2.5
+    assert np.all(particles.rasterize()[-2:] == Particles.GROUND_BRIGHTNESS)
+
+
 def test_matrix():
     """! Test the Matrix rain animation."""
     subprocess.run(
@@ -181,3 +929,347 @@ def test_matrix():
         ],
         check=True,
     )
+
+
+def test_matrix_columns():
+    """! Test the Matrix rain covers the whole width of a wide screen, with the trail colors."""
+    for _ in range(2):
+        animation = Matrix((32, 128, 3), text="MATRIX")
+        drawn = np.zeros(128, dtype=bool)
+        for _ in range(200):
+            screen = next(animation.draw())
+            drawn |= np.any(screen, axis=(0, 2))
+            # The head is white, the trail is green.
+            green = screen[..., 0] == 0
+            assert np.all(screen[..., 2][green] == 0)
+            assert np.all(screen[..., 0][~green] == screen[..., 1][~green])
+        # Every column of characters has been drawn.
+        assert np.all(drawn.reshape(-1, 4).any(axis=1))
+
+
+def test_glyph_atlas():
+    """! Test the glyph atlas renders text identically to PIL."""
+    for fontpath, text in [
+        ("client/font/small_5x3.ttf", "It is 12:34 AQI Mod.\nWed 3rd"),
+        ("client/font/misaki_mincho.ttf", "今は午後十二時半です"),
+    ]:
+        font = ImageFont.truetype(fontpath, 8)
+        atlas = GlyphAtlas(font)
+        screen = np.random.randint(0xFF, size=(32, 32, 3), dtype=np.uint8)
+        for offset in [(0, 0), (3, -1), (-5, 28), (30, 10)]:
+            screen_pil = Image.fromarray(screen)
+            image_draw = ImageDraw.Draw(screen_pil)
+            image_draw.text(offset, text, font=font, fill=(0x20, 0xFF, 0x80))
+            atlas.render(screen, text, color=(0x20, 0xFF, 0x80), offset=offset)
+            assert np.array_equal(screen, np.array(screen_pil))
+            assert atlas.textsize(text) == image_draw.textsize(text, font=font)
+
+
+def test_text_layout_cache():
+    """! Test the text layout cache counters and eviction."""
+    layouts = LayoutCache(size=2)
+    text = Text("client/font/small_5x3.ttf", 8)
+    screen = np.zeros((32, 32, 3), dtype=np.uint8)
+    Text.layouts, layouts_default = layouts, Text.layouts
+    try:
+        text.write(screen, "It is twenty five past eleven")
+        reference = screen.copy()
+        screen[:] = 0
+        text.write(screen, "It is twenty five past eleven")
+        assert np.array_equal(screen, reference)
+        assert (layouts.hits, layouts.misses) == (1, 1)
+
+        text.write(screen, "It is midday")
+        text.write(screen, "It is midnight")
+        text.write(screen, "It is twenty five past eleven")
+        assert (layouts.hits, layouts.misses) == (1, 4)
+    finally:
+        Text.layouts = layouts_default
+
+
+def test_font_registry():
+    """! Test the font registry shares fonts and resolves bundled font names."""
+    text = FontRegistry.get("small_5x3.ttf", 8)
+    assert FontRegistry.get("client/font/small_5x3.ttf", 8) is text
+    assert FontRegistry.get("small_5x3.ttf", 16) is not text
+    assert FontRegistry.path("misaki_mincho.ttf") == path.join(
+        FontRegistry.DIRECTORY, "misaki_mincho.ttf"
+    )
+
+
+def test_redraw_dependencies():
+    """! Test animations are only redrawn when their dependencies change."""
+
+    # pylint: disable=too-few-public-methods
+    class Counter(Animate):
+        """! Animation counting the drawn frames."""
+
+        count = 0
+
+        def draw(self):
+            self.count += 1
+            yield self._screen
+
+    localtime = Localtime(update_rate=0)
+    localtime.set_time(0)
+    animation = Counter((32, 32, 3))
+    animation.redraw_on(Animate.REDRAW_MINUTE, localtime)
+    for stamp in range(0, 180, 10):
+        localtime.set_time(stamp)
+        animation.frame()
+    assert animation.count == 3
+
+    animation = Counter((32, 32, 3))
+    animation.redraw_on(Animate.REDRAW_STATIC)
+    for _ in range(10):
+        animation.frame()
+    assert animation.count == 1
+
+
+def test_compositor():
+    """! Test the layered compositor animation."""
+    subprocess.run(
+        [
+            "client/main.py",
+            "compositor.Compositor",
+            "--layers",
+            "fire.Fire;analog_clock.AnalogClock,mode=max",
+            "-r",
+            "10000",
+            "save",
+            "100",
+        ],
+        check=True,
+    )
+
+
+def test_compositor_blend():
+    """! Test the blend modes of the compositor and redrawing only the changed layers."""
+
+    # pylint: disable=too-few-public-methods
+    class Solid(Animate):
+        """! Animation drawing a solid color, counting the drawn frames."""
+
+        def __init__(self, shape: tuple, color: tuple, static: bool = True):
+            super().__init__(shape)
+            self._screen[:] = color
+            self.count = 0
+            if static:
+                self.redraw_on(Animate.REDRAW_STATIC)
+
+        def draw(self):
+            self.count += 1
+            yield self._screen
+
+    shape = (8, 8, 3)
+    for mode, opacity, expected in [
+        ("alpha", 1.0, (200, 0, 40)),
+        ("alpha", 0.5, (150, 50, 70)),
+        ("add", 1.0, (255, 100, 140)),
+        ("add", 0.5, (200, 100, 120)),
+        ("max", 1.0, (200, 100, 100)),
+        ("max", 0.5, (100, 100, 100)),
+        ("mask", 1.0, (200, 0, 40)),
+        ("mask", 0.5, (150, 50, 70)),
+    ]:
+        background = Compositor.Layer(Solid(shape, (100, 100, 100)))
+        layer = Compositor.Layer(Solid((4, 4, 3), (200, 0, 40)), mode, opacity, (6, -2))
+        screen = Compositor(shape, layers=[background, layer]).frame()
+        # The layer is clipped to the 2x2 pixels in the top right corner.
+        assert np.array_equal(screen[0:2, 6:8], np.broadcast_to(expected, (2, 2, 3)))
+        screen[0:2, 6:8] = 100
+        assert np.all(screen == 100)
+
+    # Black pixels are transparent in the mask mode only.
+    layers = [
+        Compositor.Layer(Solid(shape, (100, 100, 100))),
+        Compositor.Layer(Solid(shape, (0, 0, 0)), "mask"),
+    ]
+    assert np.all(Compositor(shape, layers=layers).frame() == 100)
+
+    # Static layers are drawn once, the others on every frame.
+    static = Solid(shape, (10, 20, 30))
+    dynamic = Solid((4, 4, 3), (1, 1, 1), static=False)
+    compositor = Compositor(shape, layers=[Compositor.Layer(static)])
+    compositor.frame()
+    assert not compositor.changed()
+    compositor.add(Compositor.Layer(dynamic, "add", position=(2, 2)))
+    assert compositor.changed()
+    for _ in range(10):
+        screen = compositor.frame()
+    assert static.count == 1
+    assert dynamic.count == 11
+    assert np.array_equal(screen[3, 3], (11, 21, 31))
+    assert np.array_equal(screen[0, 0], (10, 20, 30))
+
+    # Unknown options and opacities out of range are rejected.
+    for layers in ["fire.Fire,opactiy=0.5", "fire.Fire,opacity=1.5", "fire.Fire,max"]:
+        with pytest.raises(AssertionError):
+            Compositor(shape, layers=layers)
+    compositor = Compositor(
+        shape, layers="fire.Fire;fire.Fire,mode=add,opacity=0.5,x=4"
+    )
+    assert compositor.frame().shape == shape
+
+
+def test_post_process(tmp_path):
+    """! Test the post-processing of the frames against the separate steps."""
+    subprocess.run(
+        [
+            "client/main.py",
+            "marquee.Marquee",
+            "--text",
+            "test",
+            "-y",
+            "16",
+            "--rotation",
+            "90",
+            "--gamma",
+            "2.2",
+            "--dither",
+            "save",
+            "10",
+            "-d",
+            str(tmp_path),
+        ],
+        check=True,
+    )
+    assert path.isfile(tmp_path / "marquee.Marquee.gif")
+
+    screen = np.random.randint(0x100, size=(16, 32, 3), dtype=np.uint8)
+    assert np.array_equal(PostProcess((16, 32, 3)).apply(screen), screen)
+    for rotation in PostProcess.ROTATIONS:
+        for axis, flip in enumerate(PostProcess.FLIPS):
+            reference = np.rot90(screen, -rotation // 90)
+            if flip:
+                reference = np.flip(reference, axis=axis % 2)
+            post_process = PostProcess(reference.shape, rotation=rotation, flip=flip)
+            assert post_process.shape == screen.shape
+            assert np.array_equal(post_process.apply(screen), reference)
+
+    levels = np.arange(0x100, dtype=np.uint8)[:, None, None].repeat(3, axis=-1)
+    corrected = PostProcess(levels.shape, gamma=2.2, brightness=0.5).apply(levels)
+    reference = np.rint(0xFF * 0.5 * (levels / 0xFF) ** 2.2)
+    assert np.array_equal(corrected, reference)
+
+    # The dithered pixels average to the value, on the 3 bits shown by the display.
+    post_process = PostProcess((32, 32, 3), dither=True)
+    for value in range(0x100):
+        dithered = post_process.apply(np.full((32, 32, 3), value, dtype=np.uint8))
+        assert np.all(dithered & 0x1F == 0)
+        assert abs(np.mean(dithered >> 5) - value * 7 / 0xFF) < 1 / 16
+
+    tracemalloc.start()
+    for _ in range(10):
+        post_process.apply(dithered)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < 32 * 32 * 3
+
+
+def test_post_process_benchmark():
+    """! Measure the overhead of the post-processing, against packing the frames only.
+    The timings are only logged, as they depend on the load of the machine.
+    """
+
+    def separate(screen: np.ndarray) -> np.ndarray:
+        # The same steps as separate passes on every frame.
+        levels = 0xFF * 0.5 * (screen / 0xFF) ** 2.2
+        levels = np.flip(np.rot90(levels, -1), axis=1)
+        bayer = np.tile(PostProcess.BAYER, (8, 8))[..., None]
+        quantized = np.floor(levels * 7 / 0xFF + (bayer + 0.5) / 16)
+        return np.clip(quantized, 0, 7).astype(np.uint8) << 5
+
+    post_process = PostProcess(
+        (32, 32, 3),
+        gamma=2.2,
+        brightness=0.5,
+        rotation=90,
+        flip="horizontal",
+        dither=True,
+    )
+    screen = np.random.randint(0x100, size=(32, 32, 3), dtype=np.uint8)
+    assert np.array_equal(post_process.apply(screen), separate(screen))
+    timings = [
+        min(timeit.repeat(function, number=100, repeat=5))
+        for function in [
+            lambda: Display.pack(screen),
+            lambda: Display.pack(post_process.apply(screen)),
+            lambda: Display.pack(separate(screen)),
+        ]
+    ]
+    logging.info(
+        "Pack %.0fus, with post-processing %.0fus, with separate passes %.0fus",
+        *np.array(timings) * 1e4,
+    )
+
+
+def test_marquee():
+    """! Test the scrolling text animation."""
+    subprocess.run(
+        [
+            "client/main.py",
+            "marquee.Marquee",
+            "--text",
+            "今は午後十二時半です",
+            "--font",
+            "misaki_mincho.ttf",
+            "-r",
+            "10000",
+            "save",
+            "100",
+        ],
+        check=True,
+    )
+
+
+def test_marquee_text_update():
+    """! Test updating the scrolling text renders the same strip as a new animation."""
+    marquee = Marquee((32, 32, 3), text="AQI Good")
+    for frames, text in enumerate(["AQI Good 25C", "AQI Fair", "今は", "AQI Good"]):
+        marquee.set_text(text)
+        reference = Marquee((32, 32, 3), text=text)
+        for _ in range(frames * 100):
+            next(reference.draw())
+        for _ in range(100):
+            assert np.array_equal(next(marquee.draw()), next(reference.draw()))
+
+
+def test_localtime_transitions():
+    """! Test the local time across daylight saving time transitions, without threads."""
+    threads = threading.active_count()
+    localtime = Localtime(timezone="Europe/Paris", update_rate=0)
+    for stamp in range(1711846800 - 3600, 1729990800 + 3600, 1800):
+        localtime.set_time(stamp)
+        reference = pendulum.from_timestamp(stamp, tz="Europe/Paris")
+        assert (localtime.day, localtime.hour, localtime.minute) == (
+            reference.day,
+            reference.hour,
+            reference.minute,
+        )
+        assert localtime.weekday == reference.weekday()
+    assert Clock.get("Europe/Paris") is Clock.get("Europe/Paris")
+    assert threading.active_count() == threads
+
+
+def test_localtime_subscribe():
+    """! Test the time boundary subscriptions."""
+    clock = Clock.get("Asia/Kolkata")
+    # 2024-03-31 12:34:56 in Kolkata, UTC+05:30.
+    assert clock.next_boundary(1711868696.5, Clock.SECOND) == 1711868697
+    assert clock.next_boundary(1711868696.5, Clock.MINUTE) == 1711868700
+    assert clock.next_boundary(1711868696.5, Clock.HOUR) == 1711870200
+    # The daylight saving time transition is a boundary.
+    assert Clock.get("Europe/Paris").next_boundary(1711846700, Clock.DAY) == 1711846800
+
+    fired = threading.Event()
+    seconds = []
+
+    def callback(localtime: Localtime):
+        seconds.append((localtime.second, localtime.millisecond))
+        fired.set()
+
+    subscription = Localtime(timezone="GMT").subscribe(Localtime.SECOND, callback)
+    assert fired.wait(3)
+    subscription.cancel()
+    assert seconds[0][1] == 0